@@ -0,0 +1,276 @@
+import glob
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from game_session import DIFFICULTIES
+
+# Columns of every chunk; strings are per-chunk codes into the keys/games tables
+COLUMNS = ("at", "game", "key", "difficulty", "correct", "response_time")
+DTYPES = {
+    "at": np.float64,
+    "game": np.int32,
+    "key": np.int32,
+    "difficulty": np.int8,
+    "correct": np.bool_,
+    "response_time": np.float32,
+}
+
+# Response-time histogram edges in seconds
+RESPONSE_BINS = (0, 1, 2, 3, 5, 7, 10, np.inf)
+
+
+# Append-only log of answered questions for offline analysis. Answers are
+# buffered in fixed-size column arrays and written out as one compressed
+# .npz chunk per chunk_size events (and on flush), so a directory of chunks
+# from any number of machines can be aggregated without a database.
+# Words are stored as "category\tword" keys, coded per chunk. Chunks are
+# saved with write (write_chunk's arguments); the game passes one that hands
+# them to its writer thread.
+class EventLog:
+    def __init__(self, directory, chunk_size=4096, source=None, write=None):
+        self.directory = directory
+        self.chunk_size = chunk_size
+        self.source = source if source is not None else platform.node()
+        self.write = write if write is not None else write_chunk
+        self.chunks = 0
+        self.reset()
+
+    def reset(self):
+        self.columns = {name: np.zeros(self.chunk_size, dtype=dtype) for name, dtype in DTYPES.items()}
+        self.keys = {}
+        self.games = {}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # answer is the dict from a session's ("answer", ...) event
+    def record(self, answer, at=None):
+        i = self.count
+        columns = self.columns
+        columns["at"][i] = time.time() if at is None else at
+        columns["game"][i] = self.games.setdefault(answer["game_id"] or "", len(self.games))
+        key = f"{answer['category']}\t{answer['word']}"
+        columns["key"][i] = self.keys.setdefault(key, len(self.keys))
+        columns["difficulty"][i] = DIFFICULTIES.index(answer["difficulty"])
+        columns["correct"][i] = answer["correct"]
+        columns["response_time"][i] = answer["response_time"]
+        self.count += 1
+        if self.count == self.chunk_size:
+            self.flush()
+
+    # Write the buffered events as a new chunk; returns its path, or None
+    def flush(self):
+        if self.count == 0:
+            return None
+        name = f"events-{int(time.time() * 1000)}-{os.getpid()}-{self.chunks:05d}.npz"
+        path = os.path.join(self.directory, name)
+        columns = {name: column[:self.count] for name, column in self.columns.items()}
+        # reset() gives the log new buffers, so a deferred write keeps these
+        self.write(path, columns, list(self.keys), list(self.games), self.source)
+        self.chunks += 1
+        self.reset()
+        return path
+
+    close = flush
+
+
+# Write one chunk atomically; columns hold per-chunk codes into keys and games
+def write_chunk(path, columns, keys, games, source):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            keys=np.array(keys, dtype=str),
+            games=np.array(games, dtype=str),
+            source=np.array(source),
+            **{name: np.asarray(columns[name], dtype=DTYPES[name]) for name in COLUMNS},
+        )
+    os.replace(tmp_path, path)
+
+
+# Chunk files under the given files and directories, oldest first
+def chunk_paths(paths):
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(glob.glob(os.path.join(path, "**", "events-*.npz"), recursive=True))
+        else:
+            found.append(path)
+    return sorted(found, key=os.path.basename)
+
+
+# All events of the chunks as flat arrays. Per-chunk codes are remapped to
+# indexes into the returned sorted keys/games tables in one vectorized pass.
+def load_events(paths):
+    parts = {name: [] for name in COLUMNS}
+    key_tables, game_tables, sources = [], [], {}
+    for path in chunk_paths(paths):
+        with np.load(path) as data:
+            for name in COLUMNS:
+                parts[name].append(data[name])
+            key_tables.append(data["keys"])
+            game_tables.append(data["games"])
+            source = str(data["source"])
+            sources[source] = sources.get(source, 0) + len(data["at"])
+
+    if not key_tables:
+        events = {name: np.zeros(0, dtype=dtype) for name, dtype in DTYPES.items()}
+        return events, np.zeros(0, dtype=str), np.zeros(0, dtype=str), sources
+
+    events = {name: np.concatenate(parts[name]) for name in COLUMNS}
+    events["key"], keys = remap(parts["key"], key_tables)
+    events["game"], games = remap(parts["game"], game_tables)
+    return events, keys, games, sources
+
+
+# Turn per-chunk codes into indexes into one sorted table of unique strings
+def remap(code_parts, tables):
+    offsets = np.cumsum([0] + [len(table) for table in tables[:-1]])
+    codes = np.concatenate([part.astype(np.int64) + offset for part, offset in zip(code_parts, offsets)])
+    unique, inverse = np.unique(np.concatenate(tables), return_inverse=True)
+    return inverse[codes].astype(np.int32), unique
+
+
+# Values at fractions qs of each group's sorted values; groups is an int array
+def group_percentiles(values, groups, group_count, qs):
+    order = np.lexsort((values, groups))
+    values = values[order]
+    counts = np.bincount(groups, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    result = np.full((group_count, len(qs)), np.nan)
+    has = counts > 0
+    for j, q in enumerate(qs):
+        result[has, j] = values[starts[has] + np.floor(q * (counts[has] - 1)).astype(np.int64)]
+    return result
+
+
+# Runs of consecutive correct answers within each game, in time order.
+# Returns (run lengths, longest run per game).
+def streaks(events, game_count):
+    order = np.lexsort((events["at"], events["game"]))
+    correct = events["correct"][order]
+    game = events["game"][order]
+    if len(correct) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(game_count, dtype=np.int64)
+    boundary = np.ones(len(correct), dtype=bool)
+    boundary[1:] = ~correct[:-1] | (game[1:] != game[:-1])
+    starts = correct & boundary
+    run = np.cumsum(starts) - 1
+    lengths = np.bincount(run[correct], minlength=int(starts.sum()))
+    longest = np.zeros(game_count, dtype=np.int64)
+    np.maximum.at(longest, game[starts], lengths)
+    return lengths, longest
+
+
+def summarize(paths, top=10, min_attempts=3):
+    events, keys, games, sources = load_events(paths)
+    total = len(events["at"])
+    correct = events["correct"]
+    rt = events["response_time"].astype(np.float64)
+
+    # Per word
+    word_n = np.bincount(events["key"], minlength=len(keys))
+    word_ok = np.bincount(events["key"], weights=correct, minlength=len(keys))
+    split = np.char.partition(keys, "\t") if len(keys) else np.zeros((0, 3), dtype=str)
+    categories, key_category = np.unique(split[:, 0], return_inverse=True)
+    words = split[:, 2]
+
+    # Per category
+    event_category = key_category[events["key"]]
+    cat_n = np.bincount(event_category, minlength=len(categories))
+    cat_ok = np.bincount(event_category, weights=correct, minlength=len(categories))
+    cat_rt = group_percentiles(rt, event_category, len(categories), (0.5, 0.9))
+
+    # Hardest words: lowest accuracy among words asked often enough
+    asked = np.flatnonzero(word_n >= min_attempts)
+    accuracy = word_ok[asked] / word_n[asked]
+    hardest = asked[np.lexsort((-word_n[asked], accuracy))][:top]
+
+    lengths, longest = streaks(events, len(games))
+    histogram, _ = np.histogram(rt, bins=RESPONSE_BINS)
+
+    return {
+        "events": total,
+        "games": len(games),
+        "sources": sources,
+        "accuracy": float(correct.mean()) if total else None,
+        "response_time": {
+            "p50": float(np.percentile(rt, 50)) if total else None,
+            "p90": float(np.percentile(rt, 90)) if total else None,
+            "histogram": {f"{lo:g}-{hi:g}s": int(n) for lo, hi, n in zip(RESPONSE_BINS, RESPONSE_BINS[1:], histogram)},
+        },
+        "categories": [
+            {
+                "category": str(categories[i]),
+                "answers": int(cat_n[i]),
+                "accuracy": float(cat_ok[i] / cat_n[i]),
+                "rt_p50": float(cat_rt[i, 0]),
+                "rt_p90": float(cat_rt[i, 1]),
+            }
+            for i in np.argsort(cat_ok / np.maximum(cat_n, 1)) if cat_n[i]
+        ],
+        "hardest_words": [
+            {
+                "category": str(categories[key_category[i]]),
+                "word": str(words[i]),
+                "answers": int(word_n[i]),
+                "accuracy": float(word_ok[i] / word_n[i]),
+            }
+            for i in hardest
+        ],
+        "streaks": {
+            "runs": len(lengths),
+            "mean_length": float(lengths.mean()) if len(lengths) else 0.0,
+            "longest": int(longest.max()) if len(longest) else 0,
+            "mean_longest_per_game": float(longest.mean()) if len(longest) else 0.0,
+            "length_counts": {int(n): int(c) for n, c in enumerate(np.bincount(lengths)) if c},
+        },
+    }
+
+
+def print_summary(summary):
+    print(f"{summary['events']} answers in {summary['games']} games"
+          + (f", accuracy {summary['accuracy']:.1%}" if summary["accuracy"] is not None else ""))
+    for source, count in sorted(summary["sources"].items()):
+        print(f"  {source}: {count} answers")
+    if not summary["events"]:
+        return
+    rt = summary["response_time"]
+    print(f"\nResponse time: p50 {rt['p50']:.2f}s, p90 {rt['p90']:.2f}s")
+    for label, count in rt["histogram"].items():
+        print(f"  {label:>8} {count}")
+    print(f"\n{'category':<20}{'answers':>9}{'accuracy':>10}{'p50 s':>8}{'p90 s':>8}")
+    for row in summary["categories"]:
+        print(f"{row['category']:<20}{row['answers']:>9}{row['accuracy']:>10.1%}{row['rt_p50']:>8.2f}{row['rt_p90']:>8.2f}")
+    print(f"\n{'hardest words':<20}{'category':<20}{'answers':>9}{'accuracy':>10}")
+    for row in summary["hardest_words"]:
+        print(f"{row['word']:<20}{row['category']:<20}{row['answers']:>9}{row['accuracy']:>10.1%}")
+    s = summary["streaks"]
+    print(f"\nStreaks: {s['runs']} runs, mean length {s['mean_length']:.2f}, "
+          f"longest {s['longest']}, mean best per game {s['mean_longest_per_game']:.2f}")
+
+
+def main(argv):
+    if len(argv) >= 2 and argv[0] in ("summary", "json"):
+        summary = summarize(argv[1:])
+        if argv[0] == "json":
+            print(json.dumps(summary, indent=2))
+        else:
+            print_summary(summary)
+    else:
+        print("usage: python analytics.py summary PATH [PATH ...]\n"
+              "       python analytics.py json PATH [PATH ...]\n"
+              "PATH is an events-*.npz chunk or a directory of them")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,267 @@
+import argparse
+import collections
+import json
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from sound_synth import SAMPLE_RATE, to_stereo
+
+DEFAULT_BUNDLE = os.environ.get(
+    "ENGLISH_GAME_BUNDLE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "game.bundle"),
+)
+
+# File layout: MAGIC, every entry's zlib-compressed data back to back, then a
+# JSON index and a footer pointing at it (like speech_bank.py). The index maps
+# sound names (effect names and sound_store spec keys) to [offset, size] of
+# mono int16 PCM, and category -> word -> [offset, size, format] of raw
+# image pixels. Its sections list the sounds the menu needs ("menu") and
+# each category needs, in the order a loader should take them, and its
+# sound_key is sound_cache.bank_key of every sound's spec, so a bundle built
+# before the game's sounds or words changed isn't used.
+MAGIC = b"EGBUNDL1"
+FOOTER = struct.Struct("<QI8s")
+BUNDLE_VERSION = 2
+MENU = "menu"
+
+
+def bundle_header():
+    from sound_cache import BANK_VERSION
+
+    return {"version": BUNDLE_VERSION, "sound_version": BANK_VERSION, "sample_rate": SAMPLE_RATE}
+
+
+# Read-only view of a bundle file. Only the index is held in memory; entries
+# are read and decoded when asked for. Reads may come from the image loader's
+# worker threads, so the file position is guarded by a lock.
+class AssetBundle:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            if self.file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: not an asset bundle")
+            self.file.seek(-FOOTER.size, os.SEEK_END)
+            index_offset, index_size, magic = FOOTER.unpack(self.file.read(FOOTER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path}: truncated asset bundle")
+            self.file.seek(index_offset)
+            index = json.loads(self.file.read(index_size))
+        except (OSError, struct.error, ValueError):
+            self.file.close()
+            raise
+        self.header = {key: index.get(key) for key in ("version", "sound_version", "sample_rate")}
+        if self.header != bundle_header():
+            self.file.close()
+            raise ValueError(f"{path}: built by another version of the game")
+        self.sound_key = index["sound_key"]
+        self.image_size = tuple(index["image_size"])
+        self.sounds = index["sounds"]
+        self.images = index["images"]
+        self.sections = index["sections"]
+        self.lock = threading.Lock()
+
+    def read(self, offset, size):
+        with self.lock:
+            self.file.seek(offset)
+            data = self.file.read(size)
+        return zlib.decompress(data)
+
+    # (samples, 2) int16 buffer of a sound, or None when the bundle lacks it
+    def sound(self, name):
+        entry = self.sounds.get(name)
+        if entry is None:
+            return None
+        return to_stereo(np.frombuffer(self.read(*entry), dtype="<i2"))
+
+    # Unconverted surface of a word's image, or None when the bundle lacks it
+    def image(self, category, word):
+        import pygame
+
+        entry = self.images.get(category, {}).get(word)
+        if entry is None:
+            return None
+        offset, size, pixel_format = entry
+        return pygame.image.frombuffer(self.read(offset, size), self.image_size, pixel_format)
+
+    def close(self):
+        self.file.close()
+
+
+# The bundle at path, or None when there is none, it can't be read, or it was
+# built for a different file layout, synthesizer or set of sounds (sound_key)
+def open_bundle(path=DEFAULT_BUNDLE, sound_key=None):
+    if not os.path.exists(path):
+        return None
+    try:
+        bundle = AssetBundle(path)
+    except (OSError, struct.error, ValueError, KeyError) as e:
+        print(f"Could not open asset bundle: {e}")
+        return None
+    if sound_key is not None and bundle.sound_key != sound_key:
+        print(f"Ignoring out of date asset bundle {path}: rebuild it with asset_bundle.py")
+        bundle.close()
+        return None
+    return bundle
+
+
+# Decodes a bundle's sounds a few at a time, section by section: the menu's,
+# then those of the categories in first, then everyone else's. prioritize()
+# moves a category to the front when the player heads for it.
+class BundleLoader:
+    def __init__(self, bundle, first=()):
+        self.bundle = bundle
+        self.queue = collections.OrderedDict()
+        for section in [MENU, *first, *bundle.sections]:
+            if section in bundle.sections and section not in self.queue:
+                self.queue[section] = collections.deque(bundle.sections[section])
+        self.loaded = set()
+
+    def __len__(self):
+        return sum(len(names) for names in self.queue.values())
+
+    def prioritize(self, section):
+        if section in self.queue:
+            self.queue.move_to_end(section, last=False)
+
+    # Decode sounds until budget seconds have passed (at least one).
+    # Returns [(name, buffer)] for the sounds decoded.
+    def step(self, budget):
+        deadline = time.perf_counter() + budget
+        decoded = []
+        while self.queue:
+            section, names = next(iter(self.queue.items()))
+            if not names:
+                del self.queue[section]
+                continue
+            name = names.popleft()
+            # Sections share sounds; each is only decoded once
+            if name in self.loaded:
+                continue
+            self.loaded.add(name)
+            decoded.append((name, self.bundle.sound(name)))
+            if time.perf_counter() >= deadline:
+                break
+        return decoded
+
+
+# Write a bundle. effects maps names to mono PCM, sections maps section names
+# to {sound name: mono PCM}, and images yields (category, word, surface).
+def write_bundle(path, effects, sections, images, image_size, sound_key, progress=None):
+    import pygame
+
+    sounds = {}
+    image_entries = {}
+    index_sections = {MENU: list(effects)}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+
+            def add_sound(name, mono):
+                if name not in sounds:
+                    data = zlib.compress(np.ascontiguousarray(mono, dtype="<i2").tobytes(), 6)
+                    sounds[name] = [f.tell(), len(data)]
+                    f.write(data)
+
+            for name, mono in effects.items():
+                add_sound(name, mono)
+            for section, section_sounds in sections.items():
+                index_sections[section] = list(section_sounds)
+                for name, mono in section_sounds.items():
+                    add_sound(name, mono)
+            for done, (category, word, surface) in enumerate(images, 1):
+                pixel_format = "RGBA" if surface.get_flags() & pygame.SRCALPHA else "RGB"
+                data = zlib.compress(pygame.image.tobytes(surface, pixel_format), 6)
+                image_entries.setdefault(category, {})[word] = [f.tell(), len(data), pixel_format]
+                f.write(data)
+                if progress is not None:
+                    progress(done)
+
+            index = dict(bundle_header(), sound_key=sound_key, image_size=list(image_size), sounds=sounds,
+                         images=image_entries, sections=index_sections)
+            index = json.dumps(index, separators=(",", ":")).encode("utf-8")
+            index_offset = f.tell()
+            f.write(index)
+            f.write(FOOTER.pack(index_offset, len(index), MAGIC))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return len(sounds), sum(len(words) for words in image_entries.values())
+
+
+# Pre-render what english_game would make at startup: its sound effects, each
+# category's word sounds, and the artwork of every word that has some, decoded
+# and scaled to size. Placeholders are left out: drawing one is cheaper than
+# decompressing it.
+def build_bundle(vocabulary, path=DEFAULT_BUNDLE, asset_dir=None, progress=None):
+    import english_game as game
+    from asset_loader import image_path, load_image
+    from sound_cache import bank_key
+    from sound_store import spec_key
+    from sound_synth import render
+
+    game.vocabulary = vocabulary
+    size = game.word_image_rect().size
+    word_specs = game.word_specs()
+    effects = {name: render(spec) for name, spec in game.effect_specs().items()}
+    rendered = {}
+    sections = {}
+    for category in vocabulary.categories():
+        section = sections[category] = {}
+        for word in vocabulary.words(category):
+            key = spec_key(word_specs[word])
+            if key not in rendered:
+                rendered[key] = render(word_specs[word])
+            section[key] = rendered[key]
+
+    def images():
+        if asset_dir is None:
+            return
+        for category in vocabulary.categories():
+            for word in vocabulary.words(category):
+                image = load_image(image_path(asset_dir, category, word), size)
+                if image is not None:
+                    yield category, word, image
+
+    return write_bundle(path, effects, sections, images(), size, bank_key(game.sound_specs()), progress)
+
+
+def main(argv):
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    from asset_loader import DEFAULT_ASSET_DIR
+    from vocabulary import load_vocabulary
+
+    parser = argparse.ArgumentParser(description="Pre-render the game's images and sounds into one bundle")
+    parser.add_argument("--vocab", default=os.environ.get("ENGLISH_GAME_VOCAB"), help="a .vocab file")
+    parser.add_argument("--images", default=DEFAULT_ASSET_DIR, help="artwork directory (category/word.png)")
+    parser.add_argument("--out", default=DEFAULT_BUNDLE, help="bundle to write")
+    args = parser.parse_args(argv)
+
+    vocabulary = load_vocabulary(args.vocab)
+    total = sum(len(vocabulary.words(category)) for category in vocabulary.categories())
+    step = max(1, total // 20)
+
+    def progress(done):
+        if done % step == 0:
+            print(f"  scaled {done} images", flush=True)
+
+    started = time.perf_counter()
+    asset_dir = args.images if os.path.isdir(args.images) else None
+    sounds, images = build_bundle(vocabulary, args.out, asset_dir, progress)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(args.out)
+    print(f"Wrote {args.out}: {sounds} sounds, {images} images in {elapsed:.1f}s, {size / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
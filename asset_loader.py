@@ -0,0 +1,181 @@
+import collections
+import itertools
+import os
+import queue
+import sys
+import threading
+
+import pygame
+
+DEFAULT_ASSET_DIR = os.environ.get(
+    "ENGLISH_GAME_ASSETS",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "images"),
+)
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+# Request priorities: the word on screen first, then prefetches
+NOW = 0
+PREFETCH = 1
+
+
+# Artwork for (category, word), stored as ROOT/category/word.png
+def image_path(root, category, word):
+    return os.path.join(root, category, f"{word}.png")
+
+
+# Decode and scale one image; None when there is no usable file.
+# Runs on a worker thread, so no display-format conversion here.
+def load_image(path, size):
+    try:
+        image = pygame.image.load(path)
+    except (pygame.error, OSError):
+        return None
+    if image.get_size() != size:
+        if image.get_bitsize() in (24, 32):
+            image = pygame.transform.smoothscale(image, size)
+        else:
+            image = pygame.transform.scale(image, size)
+    return image
+
+
+# Word images decoded and scaled on worker threads, converted to the display
+# format on the main thread a few per frame (poll), and kept in an LRU
+# bounded by bytes. get() never waits: until a word's artwork is ready (or
+# when it has none) it returns the surface from placeholder(category, word).
+# Without threads (pygbag) poll loads one image per frame itself. source,
+# if given, is tried before the PNG files: source(category, word) returns an
+# unconverted image of the right size, or None.
+class ImageCache:
+    def __init__(self, root, placeholder, size=(150, 150), workers=4, budget_bytes=DEFAULT_BUDGET_BYTES,
+                 source=None):
+        self.root = root
+        self.source = source
+        self.placeholder = placeholder
+        self.size = size
+        self.budget_bytes = budget_bytes
+        self.surfaces = collections.OrderedDict()
+        self.bytes = 0
+        # Keys whose surface is final: loaded artwork or a placeholder for a missing file
+        self.final = set()
+        self.missing = set()
+        self.pending = {}
+        self.requests = queue.PriorityQueue()
+        self.results = queue.Queue()
+        self.order = itertools.count()
+        self.threads = []
+        self.enabled = source is not None or os.path.isdir(root)
+
+        if self.enabled and sys.platform != "emscripten":
+            for i in range(workers):
+                thread = threading.Thread(target=self.work, name=f"image-loader-{i}", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def work(self):
+        while True:
+            priority, _, key = self.requests.get()
+            if key is None:
+                return
+            if self.stale(key, priority):
+                continue
+            self.results.put((key, self.load(key)))
+
+    # A request superseded by the same key queued again at a higher priority
+    # (a prefetched word that came on screen); that entry loads it instead
+    def stale(self, key, priority):
+        return self.pending.get(key) != priority
+
+    def load(self, key):
+        if self.source is not None:
+            image = self.source(*key)
+            if image is not None:
+                return image
+        return load_image(image_path(self.root, *key), self.size)
+
+    # Queue loads for words that aren't cached or already on their way
+    def request(self, category, words, priority=NOW):
+        if not self.enabled:
+            return
+        for word in words:
+            key = (category, word)
+            if key in self.final or key in self.missing:
+                continue
+            queued = self.pending.get(key)
+            if queued is not None and queued <= priority:
+                continue
+            self.pending[key] = priority
+            self.requests.put((priority, next(self.order), key))
+
+    def prefetch(self, category, words):
+        self.request(category, words, PREFETCH)
+
+    def get(self, category, word):
+        key = (category, word)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        if self.enabled and key not in self.missing:
+            self.request(category, [word])
+        else:
+            self.final.add(key)
+        surface = self.placeholder(category, word)
+        self.store(key, surface)
+        return surface
+
+    def store(self, key, surface):
+        old = self.surfaces.pop(key, None)
+        if old is not None:
+            self.bytes -= surface_bytes(old)
+        self.surfaces[key] = surface
+        self.bytes += surface_bytes(surface)
+        while self.bytes > self.budget_bytes and len(self.surfaces) > 1:
+            evicted, old = self.surfaces.popitem(last=False)
+            self.bytes -= surface_bytes(old)
+            self.final.discard(evicted)
+
+    # Main thread, once per frame: convert up to limit finished loads.
+    # Returns the keys whose surface changed.
+    def poll(self, limit=8):
+        if self.enabled and not self.threads:
+            self.load_next()
+        changed = []
+        while len(changed) < limit:
+            try:
+                key, image = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if self.pending.pop(key, None) is None:
+                continue
+            if image is None:
+                self.missing.add(key)
+                self.final.add(key)
+                continue
+            image = image.convert_alpha() if image.get_flags() & pygame.SRCALPHA else image.convert()
+            self.store(key, image)
+            self.final.add(key)
+            changed.append(key)
+        return changed
+
+    def load_next(self):
+        while True:
+            try:
+                priority, _, key = self.requests.get_nowait()
+            except queue.Empty:
+                return
+            if not self.stale(key, priority):
+                self.results.put((key, self.load(key)))
+                return
+
+    def close(self):
+        for _ in self.threads:
+            self.requests.put((-1, -1, None))
+        self.threads = []
+
+
+def surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
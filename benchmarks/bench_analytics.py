@@ -0,0 +1,78 @@
+# Aggregation benchmark for analytics.py: writes synthetic classroom chunks
+# (default 2 million answers) and times `summarize` over them.
+#
+#   python benchmarks/bench_analytics.py
+#   python benchmarks/bench_analytics.py --events 5000000 --keep /tmp/events
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from analytics import summarize, write_chunk
+
+
+# One classroom's worth of chunks: games of 10 answers on random words, with
+# per-word difficulty so the accuracy tables have something to show
+def write_classroom(directory, source, events, chunk_size, rng, categories=30, words=200):
+    keys = [f"category{c}\tword{c}_{w}" for c in range(categories) for w in range(words)]
+    ease = rng.uniform(0.3, 0.95, len(keys))
+    written = 0
+    chunk = 0
+    while written < events:
+        n = min(chunk_size, events - written)
+        # Like EventLog, a chunk's key table only holds the words it uses
+        used, key = np.unique(rng.integers(0, len(keys), n), return_inverse=True)
+        game = np.arange(n) // 10
+        games = [f"{source}-{chunk}-{g}" for g in range(game[-1] + 1)]
+        columns = {
+            "at": 1.7e9 + written + np.arange(n, dtype=np.float64),
+            "game": game,
+            "key": key,
+            "difficulty": rng.integers(0, 3, n),
+            "correct": rng.random(n) < ease[used][key],
+            "response_time": rng.gamma(2.0, 1.2, n),
+        }
+        write_chunk(os.path.join(directory, source, f"events-{chunk:08d}.npz"), columns,
+                    [keys[i] for i in used], games, source)
+        written += n
+        chunk += 1
+    return chunk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analytics.py aggregation")
+    parser.add_argument("--events", type=int, default=2_000_000)
+    parser.add_argument("--classrooms", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--keep", help="write the chunks here and keep them")
+    args = parser.parse_args()
+
+    directory = args.keep or tempfile.mkdtemp(prefix="english_game_events_")
+    rng = np.random.default_rng(1)
+    try:
+        start = time.perf_counter()
+        chunks = 0
+        per_room = args.events // args.classrooms
+        for room in range(args.classrooms):
+            chunks += write_classroom(directory, f"room{room:02d}", per_room, args.chunk_size, rng)
+        print(f"wrote {per_room * args.classrooms} events in {chunks} chunks in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        summary = summarize([directory])
+        elapsed = time.perf_counter() - start
+        print(f"summarized {summary['events']} events, {summary['games']} games in {elapsed:.2f}s "
+              f"({summary['events'] / elapsed / 1e6:.1f}M events/s)")
+    finally:
+        if not args.keep:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
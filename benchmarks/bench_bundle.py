@@ -0,0 +1,85 @@
+# Startup asset costs with and without a prebuilt asset bundle: synthesizing
+# the sounds with an empty cache (every page load in the browser) against
+# opening the bundle and decoding the menu's and the first category's sounds,
+# and decoding and scaling a word's PNG artwork against reading it from the
+# bundle.
+#
+#   python benchmarks/bench_bundle.py --images assets/images
+#   python benchmarks/bench_bundle.py --vocab big.vocab
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    import english_game as game
+    from asset_bundle import MENU, BundleLoader, build_bundle, open_bundle
+    from asset_loader import DEFAULT_ASSET_DIR, image_path, load_image
+    from vocabulary import load_vocabulary
+    from sound_cache import bank_key, load_sound_bank
+
+    parser = argparse.ArgumentParser(description="Benchmark startup with and without an asset bundle")
+    parser.add_argument("--vocab", help="a .vocab file (default: the built-in words)")
+    parser.add_argument("--images", default=DEFAULT_ASSET_DIR, help="artwork directory (category/word.png)")
+    parser.add_argument("--count", type=int, default=200, help="images to time each way")
+    args = parser.parse_args()
+
+    game.init_display()
+    asset_dir = args.images if os.path.isdir(args.images) else None
+    vocabulary = load_vocabulary(args.vocab)
+    game.vocabulary = vocabulary
+    category = vocabulary.categories()[0]
+    result = {"words": sum(len(vocabulary.words(c)) for c in vocabulary.categories())}
+
+    with tempfile.TemporaryDirectory() as directory:
+        specs = game.sound_specs()
+        result["synthesize_sounds_ms"] = round(timed(lambda: load_sound_bank(specs, directory))[0] * 1000, 2)
+
+        path = os.path.join(directory, "game.bundle")
+        result["build_s"] = round(timed(lambda: build_bundle(vocabulary, path, asset_dir))[0], 2)
+        result["bundle_mb"] = round(os.path.getsize(path) / 1e6, 2)
+
+        elapsed, bundle = timed(lambda: open_bundle(path, bank_key(specs)))
+        result["open_ms"] = round(elapsed * 1000, 2)
+        loader = BundleLoader(bundle, [category])
+        for section in (MENU, category):
+            pending = len(bundle.sections[section])
+            start = time.perf_counter()
+            while loader.queue and next(iter(loader.queue)) == section:
+                loader.step(0)
+            result[f"{'menu' if section == MENU else 'category'}_sounds_ms"] = round(
+                (time.perf_counter() - start) * 1000, 2)
+            result[f"{'menu' if section == MENU else 'category'}_sound_count"] = pending
+
+        keys = [(c, w) for c in bundle.images for w in bundle.images[c]][:args.count]
+        if keys:
+            size = bundle.image_size
+            elapsed, _ = timed(lambda: [load_image(image_path(asset_dir, *key), size).convert() for key in keys])
+            result["png_image_us"] = round(elapsed / len(keys) * 1e6, 1)
+            elapsed, _ = timed(lambda: [bundle.image(*key).convert() for key in keys])
+            result["bundle_image_us"] = round(elapsed / len(keys) * 1e6, 1)
+        # Words without artwork still get placeholders, drawn as they are needed
+        some = [(c, w) for c in vocabulary.categories() for w in vocabulary.words(c)][:args.count]
+        elapsed, _ = timed(lambda: [game.create_placeholder_image(*key) for key in some])
+        result["placeholder_us"] = round(elapsed / len(some) * 1e6, 1)
+        bundle.close()
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
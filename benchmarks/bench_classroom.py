@@ -0,0 +1,144 @@
+# Load generator for classroom_server.py: starts a server process, connects
+# hundreds of simulated students that answer every question after a short
+# think time, and reports answer throughput and per-answer latency (from
+# sending an answer to receiving its result). Every answer comes after a
+# think time, so the server has to report a nonzero response time for it.
+#
+#   python benchmarks/bench_classroom.py
+#   python benchmarks/bench_classroom.py --clients 800 --duration 30
+#   python benchmarks/bench_classroom.py --connect 127.0.0.1:8765   # running server
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def student(host, port, index, deadline, latencies, stats, rng, think):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    def send(message):
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+
+    send({"type": "hello", "name": f"student{index}", "difficulty": rng.choice(["Easy", "Normal", "Hard"])})
+    sent_at = None
+    try:
+        while time.perf_counter() < deadline:
+            try:
+                line = await asyncio.wait_for(reader.readline(), deadline - time.perf_counter())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                stats["disconnects"] += 1
+                break
+            message = json.loads(line)
+            kind = message["type"]
+            if kind == "welcome":
+                send({"type": "category", "category": rng.choice(message["categories"])})
+                send({"type": "start"})
+            elif kind == "question":
+                await asyncio.sleep(rng.uniform(*think))
+                answer = message["word"] if rng.random() < 0.7 else rng.choice(message["options"])
+                sent_at = time.perf_counter()
+                send({"type": "answer", "word": answer})
+            elif kind == "result":
+                if sent_at is not None:
+                    latencies.append(time.perf_counter() - sent_at)
+                    sent_at = None
+                    if not message["response_time"] > 0:
+                        stats["zero_response_times"] += 1
+                else:
+                    stats["timeouts"] += 1
+            elif kind == "game_over":
+                stats["games"] += 1
+                send({"type": "start"})
+            elif kind == "error":
+                stats["errors"] += 1
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, duration, think, seed):
+    rng = random.Random(seed)
+    latencies = []
+    stats = {"games": 0, "timeouts": 0, "errors": 0, "disconnects": 0, "zero_response_times": 0}
+    start = time.perf_counter()
+    deadline = start + duration
+    tasks = [
+        asyncio.create_task(student(host, port, i, deadline, latencies, stats, random.Random(rng.random()), think))
+        for i in range(clients)
+    ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    failed = [r for r in results if isinstance(r, Exception)]
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "clients": clients,
+        "failed_clients": len(failed),
+        "answers": len(latencies),
+        "answers_per_s": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p95": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+        **stats,
+    }
+
+
+def start_server():
+    proc = subprocess.Popen([sys.executable, os.path.join(ROOT, "classroom_server.py"), "--port", "0"],
+                            cwd=ROOT, stdout=subprocess.PIPE, text=True,
+                            env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1"))
+    for line in proc.stdout:
+        if line.startswith("Classroom server on "):
+            host, _, port = line.split()[-1].rpartition(":")
+            return proc, host, int(port)
+    raise RuntimeError("classroom server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test classroom_server.py")
+    parser.add_argument("--clients", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--think", type=float, nargs=2, default=(0.1, 1.0), metavar=("MIN", "MAX"),
+                        help="seconds a student takes to answer")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--connect", metavar="HOST:PORT", help="use a running server")
+    args = parser.parse_args()
+
+    proc = None
+    if args.connect:
+        host, _, port = args.connect.rpartition(":")
+        port = int(port)
+    else:
+        proc, host, port = start_server()
+    try:
+        result = asyncio.run(run_load(host, port, args.clients, args.duration, tuple(args.think), args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+    print(json.dumps(result, indent=2))
+    if result["zero_response_times"]:
+        print(f"{result['zero_response_times']} answers came back with no response time", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+# Frame-time benchmark: runs english_game.main() headlessly under SDL's dummy
+# video/audio drivers with scripted input and reports per-frame timings.
+#
+#   python benchmarks/bench_frames.py                       # all scenarios
+#   python benchmarks/bench_frames.py round hard_timer      # a subset
+#   python benchmarks/bench_frames.py --output base.json
+#   python benchmarks/bench_frames.py --compare base.json   # diff against a run
+#   python benchmarks/bench_frames.py session.rec.npz       # replay a recording
+#
+# Every scenario runs in its own process so startup time and peak RSS are
+# measured from a cold import.
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEED = 1234
+
+# Screen positions of the buttons the scripts press (see english_game.py)
+START_BUTTON = (600, 380)
+BACK_BUTTON = (110, 75)
+DIFFICULTY_BUTTON = (1090, 195)
+
+
+# Scripted input: each scenario returns a frame_hook for main()
+def menu_idle(game, frames=600):
+    import pygame
+
+    def hook(frame):
+        if frame == 1:
+            click(pygame, BACK_BUTTON)
+        # Sweep the mouse across the category buttons now and then
+        if frame % 20 == 0:
+            move(pygame, (100 + (frame * 7) % 800, 180))
+        return frame < frames
+    return hook
+
+
+def full_round(game, frames=5000):
+    import pygame
+    session = game.session
+    # The script's own RNG: draws from the game's would not be in a recording
+    # of this run, so replaying it would pick different words
+    rng = random.Random(SEED)
+
+    def hook(frame):
+        if frame == 1:
+            click(pygame, BACK_BUTTON)
+        elif frame == 3:
+            click(pygame, START_BUTTON)
+        elif session.active and session.awaiting_answer and frame % 15 == 0:
+            # Answer right most of the time so both feedback paths run
+            word = session.current_word if rng.random() < 0.8 else session.options[0]
+            for button in game.option_buttons:
+                if button.text == word:
+                    click(pygame, button.rect.center)
+                    break
+        return frame < frames and (frame < 5 or session.active)
+    return hook
+
+
+def hard_timer(game, frames=1500):
+    import pygame
+
+    def hook(frame):
+        if frame == 1:
+            click(pygame, BACK_BUTTON)
+        elif frame == 2:
+            click(pygame, DIFFICULTY_BUTTON)
+        elif frame == 3:
+            click(pygame, START_BUTTON)
+        return frame < frames
+    return hook
+
+
+def particle_burst(game, frames=600, burst=2000):
+    import pygame
+
+    def hook(frame):
+        if frame == 1:
+            click(pygame, BACK_BUTTON)
+        elif frame == 3:
+            click(pygame, START_BUTTON)
+        elif frame % 30 == 0:
+            game.particles.emit(game.WIDTH // 2, 345, burst)
+        return frame < frames
+    return hook
+
+
+SCENARIOS = {
+    "menu_idle": menu_idle,
+    "round": full_round,
+    "hard_timer": hard_timer,
+    "particle_burst": particle_burst,
+}
+
+
+def move(pygame, pos):
+    pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(0, 0), buttons=(0, 0, 0)))
+
+
+def click(pygame, pos):
+    move(pygame, pos)
+    pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1))
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def peak_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes elsewhere
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+# Child process: import the game, run one scenario, print a JSON result line
+def run_scenario(name):
+    import asyncio
+    import random
+
+    random.seed(SEED)
+    sys.path.insert(0, ROOT)
+    start = time.perf_counter()
+    import english_game as game
+    import_time = time.perf_counter() - start
+
+    # The game opens its window and session lazily in main(); do it up front
+    # (still inside the startup measurement) so scenarios can hold on to them
+    game.init_display()
+    game.init_game()
+    game.session.rng = random.Random(SEED)
+    # A recording (ENGLISH_GAME_RECORD) replays its own input and timing
+    replay = name if name.endswith(".npz") else None
+    script = (lambda frame: True) if replay else SCENARIOS[name](game)
+    stamps = []
+    exit_code = 0
+
+    def hook(frame):
+        stamps.append(time.perf_counter())
+        return script(frame)
+
+    try:
+        asyncio.run(game.main(fps=0, frame_hook=hook, fixed_dt=1 / 60, idle=False, replay=replay))
+    except SystemExit as e:
+        exit_code = e.code
+
+    frame_times = sorted((b - a) * 1000 for a, b in zip(stamps, stamps[1:]))
+    total = stamps[-1] - stamps[0] if len(stamps) > 1 else 0.0
+    result = {
+        "frames": len(frame_times),
+        "import_s": round(import_time, 4),
+        # First frame_hook call happens once the first frame starts; the second
+        # marks the first frame as drawn and presented
+        "startup_s": round((stamps[1] if len(stamps) > 1 else stamps[0]) - start, 4),
+        # The game's own measurement, from the top of english_game to the first present
+        "first_frame_s": round(game.first_frame_time or 0.0, 4),
+        "frame_ms": {
+            "p50": round(percentile(frame_times, 0.50), 3),
+            "p95": round(percentile(frame_times, 0.95), 3),
+            "p99": round(percentile(frame_times, 0.99), 3),
+            "max": round(frame_times[-1], 3) if frame_times else 0.0,
+        },
+        "fps": round(len(frame_times) / total, 1) if total else 0.0,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+    if replay:
+        result["replay_matched"] = not exit_code
+    print(json.dumps(result))
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_all(names):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    results = {}
+    for name in names:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--scenario", name],
+                              cwd=ROOT, env=env, capture_output=True, text=True)
+        lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+        if proc.returncode != 0 or not lines:
+            print(f"{name}: failed\n{proc.stderr}", file=sys.stderr)
+            results[name] = {"error": proc.stderr.strip().splitlines()[-1:] or ["no output"]}
+            continue
+        results[name] = json.loads(lines[-1])
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": results,
+    }
+
+
+def print_table(report, baseline=None):
+    print(f"{'scenario':<16}{'frames':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'fps':>9}{'start s':>9}{'rss MB':>9}")
+    for name, result in report["scenarios"].items():
+        label = os.path.basename(name)
+        if "error" in result:
+            print(f"{label:<16}  error: {result['error'][0]}")
+            continue
+        ms = result["frame_ms"]
+        rss = (result["peak_rss_kb"] or 0) / 1024
+        print(f"{label:<16}{result['frames']:>8}{ms['p50']:>9.3f}{ms['p95']:>9.3f}{ms['p99']:>9.3f}"
+              f"{result['fps']:>9.1f}{result['startup_s']:>9.3f}{rss:>9.1f}")
+        old = (baseline or {}).get("scenarios", {}).get(name)
+        if old and "error" not in old:
+            def delta(new, before):
+                return f"{(new - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"{'  vs baseline':<16}{'':>8}{delta(ms['p50'], old['frame_ms']['p50']):>9}"
+                  f"{delta(ms['p95'], old['frame_ms']['p95']):>9}{delta(ms['p99'], old['frame_ms']['p99']):>9}"
+                  f"{delta(result['fps'], old['fps']):>9}{delta(result['startup_s'], old['startup_s']):>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless frame-time benchmark for english_game.main()")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios or .npz recordings to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--compare", help="JSON report from an earlier run to compare against")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        run_scenario(args.scenario)
+        return
+
+    names = [os.path.abspath(name) if name.endswith(".npz") else name for name in args.scenarios]
+    unknown = [name for name in names if name not in SCENARIOS and not os.path.isfile(name)]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    report = run_all(names or list(SCENARIOS))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_table(report, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
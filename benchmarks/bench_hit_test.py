@@ -0,0 +1,87 @@
+# Mouse hit-testing against widget count: the old per-event pass over every
+# widget (hover check plus click check on each) against one HitGrid lookup,
+# per mouse event, and the cost of re-bucketing the grid when the screen's
+# widgets change. Widgets are laid out as 160x60 tiles the way the category
+# buttons are, wrapping into as many rows as it takes.
+#
+#   python benchmarks/bench_hit_test.py
+#   python benchmarks/bench_hit_test.py --sizes 10 1000 --events 20000
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from hit_grid import HitGrid
+
+WIDTH, HEIGHT = 1200, 800
+
+
+class Widget:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 160, 60)
+        self.is_hovered = False
+
+
+def tiles(count):
+    per_row = (WIDTH - 100) // 200
+    return [Widget(100 + (i % per_row) * 200, 150 + (i // per_row) * 80) for i in range(count)]
+
+
+def linear(widgets, pos):
+    found = None
+    for widget in widgets:
+        widget.is_hovered = widget.rect.collidepoint(pos)
+        if widget.rect.collidepoint(pos):
+            found = widget
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mouse hit-testing")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = []
+    for size in args.sizes:
+        widgets = tiles(size)
+        bottom = max(widget.rect.bottom for widget in widgets)
+        points = [(rng.randrange(WIDTH), rng.randrange(bottom)) for _ in range(args.events)]
+
+        grid = HitGrid()
+        start = time.perf_counter()
+        grid.update(widgets)
+        update = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for pos in points:
+            linear(widgets, pos)
+        linear_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for pos in points:
+            grid.update(widgets)
+            grid.at(pos)
+        grid_time = time.perf_counter() - start
+
+        results.append({
+            "widgets": size,
+            "linear_us": round(linear_time / len(points) * 1e6, 2),
+            "grid_us": round(grid_time / len(points) * 1e6, 2),
+            "grid_rebuild_ms": round(update * 1000, 3),
+            "same_hits": all(linear(widgets, pos) is grid.at(pos) for pos in points),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
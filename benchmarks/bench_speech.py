@@ -0,0 +1,72 @@
+# Speech bank build and playback costs: a full build serially and across a
+# process pool, an incremental rebuild after a few texts change, the bank's
+# size against raw PCM, and the per-block decode cost paid while playing.
+#
+#   python benchmarks/bench_speech.py
+#   python benchmarks/bench_speech.py --vocab big.vocab --limit 2000 --jobs 8
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from speech_bank import SpeechBank, build_speech_bank, vocabulary_texts
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    from vocabulary import load_vocabulary
+
+    parser = argparse.ArgumentParser(description="Benchmark speech bank builds and decoding")
+    parser.add_argument("--vocab", help="a .vocab file (default: the built-in words)")
+    parser.add_argument("--limit", type=int, default=0, help="only the first N texts")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    texts = list(dict.fromkeys(vocabulary_texts(load_vocabulary(args.vocab))))
+    if args.limit:
+        texts = texts[:args.limit]
+    result = {"texts": len(texts), "jobs": args.jobs}
+
+    with tempfile.TemporaryDirectory() as directory:
+        serial_path = os.path.join(directory, "serial.bank")
+        pool_path = os.path.join(directory, "pool.bank")
+        result["serial_build_s"] = round(timed(lambda: build_speech_bank(texts, serial_path, jobs=1))[0], 3)
+        result["pool_build_s"] = round(timed(lambda: build_speech_bank(texts, pool_path, jobs=args.jobs))[0], 3)
+        with open(serial_path, "rb") as a, open(pool_path, "rb") as b:
+            result["pool_output_identical"] = a.read() == b.read()
+
+        # Change one text in twenty and rebuild in place
+        changed = [text + " Again." if i % 20 == 0 else text for i, text in enumerate(texts)]
+        elapsed, (reused, synthesized) = timed(lambda: build_speech_bank(changed, pool_path, jobs=args.jobs))
+        result["incremental"] = {"seconds": round(elapsed, 3), "reused": reused, "synthesized": synthesized}
+
+        bank = SpeechBank(pool_path)
+        frames = sum(entry[1] for entry in bank.entries.values())
+        result["audio_s"] = round(frames / bank.sample_rate, 1)
+        result["bank_mb"] = round(os.path.getsize(pool_path) / 1e6, 2)
+        result["raw_int16_mb"] = round(frames * 2 / 1e6, 2)
+        # What holding every text as 44.1 kHz stereo Sounds would take
+        result["in_memory_sounds_mb"] = round(frames * (44100 // bank.sample_rate) * 4 / 1e6, 2)
+
+        blocks = 0
+        start = time.perf_counter()
+        for text in bank.entries:
+            for _ in bank.blocks(text):
+                blocks += 1
+        result["decode_us_per_block"] = round((time.perf_counter() - start) / max(1, blocks) * 1e6, 1)
+        bank.close()
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Micro-benchmark: per-sample loop synthesis vs. sound_synth's whole-array version.
+# Run from the repository root with: python benchmarks/bench_synth.py
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sound_synth import SAMPLE_RATE, chirp, tone, to_pcm, to_stereo
+
+SAMPLES = int(SAMPLE_RATE * 0.5)
+
+# Same vocabulary shape as the game: one tone per word at 300 + len(word) * 50 Hz
+WORDS = [
+    "cat", "dog", "lion", "fish", "bird", "elephant", "monkey",
+    "apple", "banana", "orange", "grape", "mango", "strawberry",
+    "red", "blue", "green", "yellow", "purple", "pink",
+    "circle", "square", "triangle", "star", "heart", "rectangle",
+]
+
+
+# The original generate_sounds() loops, kept here as the reference output
+def loop_buffer(samples, freq_at):
+    buffer = np.zeros((samples, 2), dtype=np.int16)
+    for i in range(samples):
+        freq = freq_at(i)
+        value = int(32767 * math.sin(2.0 * math.pi * freq * i / SAMPLE_RATE))
+        buffer[i][0] = value
+        buffer[i][1] = value
+    return buffer
+
+
+def loop_bank(words):
+    bank = {
+        "correct": loop_buffer(SAMPLES, lambda i: 440 + (i / SAMPLES) * 440),
+        "wrong": loop_buffer(SAMPLES, lambda i: 880 - (i / SAMPLES) * 440),
+        "click": loop_buffer(SAMPLES // 3, lambda i: 330),
+    }
+    for word in words:
+        freq = 300 + len(word) * 50
+        bank[word] = loop_buffer(SAMPLES, lambda i: freq)
+    return bank
+
+
+def vectorized_bank(words):
+    bank = {
+        "correct": to_stereo(to_pcm(chirp(440, 880, SAMPLES))),
+        "wrong": to_stereo(to_pcm(chirp(880, 440, SAMPLES))),
+        "click": to_stereo(to_pcm(tone(330, SAMPLES // 3))),
+    }
+    for word in words:
+        bank[word] = to_stereo(to_pcm(tone(300 + len(word) * 50, SAMPLES)))
+    return bank
+
+
+def best_of(func, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    loop_time, reference = best_of(lambda: loop_bank(WORDS), repeat)
+    vector_time, candidate = best_of(lambda: vectorized_bank(WORDS), repeat)
+
+    mismatched = [name for name in reference if not np.array_equal(reference[name], candidate[name])]
+    if mismatched:
+        print(f"Output differs from the per-sample loop for: {', '.join(mismatched)}")
+        sys.exit(1)
+
+    print(f"Sounds synthesized: {len(reference)} ({SAMPLES} samples each)")
+    print(f"Per-sample loop:    {loop_time * 1000:8.2f} ms")
+    print(f"Vectorized:         {vector_time * 1000:8.2f} ms")
+    print(f"Speedup:            {loop_time / vector_time:8.1f}x (output bit-identical)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Typed-answer lookups against category size: building a category's
+# WordIndex, prefix suggestions, suggestions for a mistyped word and the
+# near-miss check, per call. The words are made up from common English
+# syllables unless a word list (one word per line) is given.
+#
+#   python benchmarks/bench_word_index.py
+#   python benchmarks/bench_word_index.py --words /usr/share/dict/words --sizes 1000 20000
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from word_index import WordIndex
+
+SYLLABLES = ["ba", "ca", "de", "fi", "go", "hu", "la", "me", "ni", "po", "ra", "se", "ti", "vo",
+             "wa", "ze", "st", "tr", "ch", "sh", "an", "er", "in", "on", "el", "ar"]
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def made_up_words(count, rng):
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return sorted(words)
+
+
+def mistype(word, rng):
+    letters = list(word)
+    letters[rng.randrange(1, len(letters))] = rng.choice(LETTERS)
+    return "".join(letters)
+
+
+def per_call_us(func, items):
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    return round((time.perf_counter() - start) / len(items) * 1e6, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark typed-answer lookups")
+    parser.add_argument("--words", help="word list, one per line")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.words:
+        with open(args.words, encoding="utf-8") as f:
+            pool = sorted({line.strip().lower() for line in f if line.strip().isalpha()})
+    else:
+        pool = made_up_words(max(args.sizes), rng)
+
+    results = []
+    for size in args.sizes:
+        words = rng.sample(pool, min(size, len(pool)))
+        start = time.perf_counter()
+        index = WordIndex(words)
+        build = time.perf_counter() - start
+
+        answers = [rng.choice(words) for _ in range(args.queries)]
+        prefixes = [word[:rng.randint(1, len(word))] for word in answers]
+        typos = [mistype(word, rng) for word in answers]
+        results.append({
+            "words": len(words),
+            "build_ms": round(build * 1000, 1),
+            "suggest_prefix_us": per_call_us(index.suggest, prefixes),
+            "suggest_typo_us": per_call_us(index.suggest, typos),
+            "accepts_us": per_call_us(lambda pair: index.accepts(*pair), list(zip(answers, typos))),
+            "typo_suggests_answer": round(sum(a in index.suggest(t) for a, t in zip(answers, typos)) / len(answers), 3),
+        })
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
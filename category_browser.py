@@ -0,0 +1,35 @@
+# Which categories are on screen: the names are split into pages of
+# per_page and only the current page gets buttons, so the menu costs the
+# same with five categories or five thousand.
+class CategoryPages:
+    def __init__(self, names, per_page):
+        self.names = names
+        self.per_page = per_page
+        self.positions = {name: i for i, name in enumerate(names)}
+        self.page = 0
+
+    def __len__(self):
+        return len(self.names)
+
+    def page_count(self):
+        return max(1, -(-len(self.names) // self.per_page))
+
+    def visible(self):
+        start = self.page * self.per_page
+        return self.names[start:start + self.per_page]
+
+    # Move by step pages; returns True if the page changed
+    def turn(self, step):
+        page = min(max(self.page + step, 0), self.page_count() - 1)
+        if page == self.page:
+            return False
+        self.page = page
+        return True
+
+    # Go to the page holding name
+    def show(self, name):
+        position = self.positions.get(name)
+        if position is None or position // self.per_page == self.page:
+            return False
+        self.page = position // self.per_page
+        return True
@@ -0,0 +1,167 @@
+import argparse
+import asyncio
+import json
+
+import pygame
+
+import english_game as ui
+from classroom_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+# Thin client for classroom_server.py: it only draws what the server sends
+# and sends back clicks. Uses the local game's window, fonts and buttons.
+class ClassroomClient:
+    def __init__(self, reader, writer, name):
+        self.reader = reader
+        self.writer = writer
+        self.name = name
+        self.connected = True
+        self.category = ""
+        self.difficulty = ""
+        self.category_buttons = []
+        self.option_buttons = []
+        self.word = ""
+        self.definition = None
+        self.time_limit = None
+        self.asked_at = 0.0
+        self.feedback = ""
+        self.score = 0
+        self.attempts = 0
+        self.streak = 0
+        self.playing = False
+        self.game_over = None
+
+    def send(self, message):
+        self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+
+    async def receive(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                self.connected = False
+                return
+            self.handle(json.loads(line))
+
+    def handle(self, message):
+        kind = message["type"]
+        if kind == "welcome":
+            self.category = message["category"]
+            self.difficulty = message["difficulty"]
+            self.category_buttons = [
+                ui.Button(100 + i * 200, 150, 160, 60, category)
+                for i, category in enumerate(message["categories"])
+            ]
+        elif kind == "question":
+            self.playing = True
+            self.game_over = None
+            self.word = message["word"]
+            self.definition = message["definition"]
+            self.time_limit = message["time_limit"]
+            self.asked_at = pygame.time.get_ticks() / 1000
+            self.feedback = ""
+            self.option_buttons = [
+                ui.Button(200 + (i % 2) * 300, 350 + (i // 2) * 100, 250, 80, option)
+                for i, option in enumerate(message["options"])
+            ]
+        elif kind == "result":
+            self.feedback = message["feedback"]
+            self.score = message["score"]
+            self.attempts = message["attempts"]
+            self.streak = message["streak"]
+            self.time_limit = None
+        elif kind == "game_over":
+            self.playing = False
+            self.game_over = message
+        elif kind == "error":
+            print(f"Server: {message['message']}")
+
+    def click(self, pos):
+        if not self.playing:
+            for button in self.category_buttons:
+                if button.rect.collidepoint(pos):
+                    self.category = button.text
+                    self.send({"type": "category", "category": button.text})
+            if ui.start_button.rect.collidepoint(pos):
+                self.send({"type": "start"})
+        else:
+            for button in self.option_buttons:
+                if button.rect.collidepoint(pos):
+                    self.send({"type": "answer", "word": button.text})
+
+    def draw(self, screen, mouse_pos):
+        screen.fill(ui.BACKGROUND)
+        if not self.connected:
+            text = ui.render_text(ui.normal_font, "Disconnected from the classroom server", ui.TEXT_COLOR)
+            screen.blit(text, (ui.WIDTH // 2 - text.get_width() // 2, ui.HEIGHT // 2))
+        elif self.playing:
+            # The word is shown as text, like the local game's placeholder images
+            word_surf = ui.render_text(ui.title_font, self.word, ui.TEXT_COLOR)
+            screen.blit(word_surf, (ui.WIDTH // 2 - word_surf.get_width() // 2, 230))
+            if self.definition:
+                definition_surf = ui.render_text(ui.instruction_font, self.definition, ui.INSTRUCTION_COLOR)
+                screen.blit(definition_surf, (ui.WIDTH // 2 - definition_surf.get_width() // 2, 300))
+            for button in self.option_buttons:
+                button.check_hover(mouse_pos)
+                button.draw(screen)
+            score_surf = ui.render_text(ui.normal_font, f"Score: {self.score}/{self.attempts}", ui.TEXT_COLOR)
+            screen.blit(score_surf, (ui.WIDTH - 200, 50))
+            if self.streak > 1:
+                streak_surf = ui.render_text(ui.normal_font, f"Streak: {self.streak}!", (255, 100, 100))
+                screen.blit(streak_surf, (ui.WIDTH - 200, 90))
+            if self.time_limit is not None:
+                left = max(0, self.time_limit - (pygame.time.get_ticks() / 1000 - self.asked_at))
+                timer_surf = ui.render_text(ui.instruction_font, f"Time: {int(left + 0.999)}s", ui.TEXT_COLOR)
+                screen.blit(timer_surf, (ui.WIDTH // 2 - timer_surf.get_width() // 2, 120))
+            if self.feedback:
+                feedback_surf = ui.render_text(ui.normal_font, self.feedback, ui.TEXT_COLOR)
+                screen.blit(feedback_surf, (ui.WIDTH // 2 - feedback_surf.get_width() // 2, 540))
+        else:
+            title = ui.render_text(ui.title_font, f"Classroom: {self.name}", ui.TEXT_COLOR)
+            screen.blit(title, (ui.WIDTH // 2 - title.get_width() // 2, 50))
+            for button in self.category_buttons:
+                button.check_hover(mouse_pos)
+                button.draw(screen)
+            category_surf = ui.render_text(ui.normal_font, f"Category: {self.category}", ui.TEXT_COLOR)
+            screen.blit(category_surf, (ui.WIDTH // 2 - category_surf.get_width() // 2, 230))
+            if self.game_over is not None:
+                result = f"Game Over! Score: {self.game_over['score']}/{self.game_over['max_attempts']}"
+                result_surf = ui.render_text(ui.normal_font, result, ui.TEXT_COLOR)
+                screen.blit(result_surf, (ui.WIDTH // 2 - result_surf.get_width() // 2, ui.HEIGHT // 2 - 100))
+            ui.start_button.check_hover(mouse_pos)
+            ui.start_button.draw(screen)
+
+
+async def main(host=DEFAULT_HOST, port=DEFAULT_PORT, name="student", fps=60):
+    ui.init_display()
+    pygame.display.set_caption(f"Fun English Learning Game - {name}")
+    reader, writer = await asyncio.open_connection(host, port)
+    client = ClassroomClient(reader, writer, name)
+    receiver = asyncio.create_task(client.receive())
+    client.send({"type": "hello", "name": name})
+
+    clock = pygame.time.Clock()
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                client.click(event.pos)
+        client.draw(ui.screen, pygame.mouse.get_pos())
+        pygame.display.flip()
+        await client.writer.drain()
+        clock.tick(fps)
+        await asyncio.sleep(0)
+
+    receiver.cancel()
+    writer.close()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Join a classroom_server.py game")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--name", default="student")
+    args = parser.parse_args()
+    asyncio.run(main(args.host, args.port, args.name))
@@ -0,0 +1,269 @@
+import argparse
+import asyncio
+import functools
+import json
+import os
+import sys
+import time
+
+from game_session import DIFFICULTIES, GameSession
+from vocabulary import load_vocabulary
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# How often open questions and pending next words are checked, in seconds
+TICK = 0.05
+# Longest accepted message line
+MAX_LINE = 64 * 1024
+# Message fields that have to be strings when present
+STRING_FIELDS = ("type", "name", "category", "difficulty", "word")
+
+
+# Classroom mode: many independent quiz rounds served over TCP on one asyncio
+# loop. Each connection gets its own GameSession (the same rules as the local
+# game) and the messages are JSON objects, one per line.
+#
+#   client -> server
+#     {"type": "hello", "name": ..., "category": ..., "difficulty": ...}
+#     {"type": "start"}
+#     {"type": "answer", "word": ...}
+#     {"type": "category", "category": ...}    {"type": "difficulty", "difficulty": ...}
+#   server -> client
+#     {"type": "welcome", "categories": [...], "category": ..., "difficulty": ..., "max_attempts": ...}
+#     {"type": "question", "word": ..., "options": [...], "definition": ..., "time_limit": ...}
+#     {"type": "result", "correct": ..., "word": ..., "feedback": ..., "score": ..., "attempts": ...,
+#      "streak": ..., "response_time": ...}
+#     {"type": "game_over", "score": ..., "max_attempts": ..., "high_score": ...}
+#     {"type": "error", "message": ...}
+#
+# Answers are handled as soon as they arrive; a single ticker task advances
+# every session's clock (response times are measured on it) and sends what
+# hard-mode timeouts and the pause between words produce.
+class ClassroomServer:
+    def __init__(self, vocabulary, max_attempts=10, store=None, event_log=None):
+        self.vocabulary = vocabulary
+        self.max_attempts = max_attempts
+        self.store = store
+        self.event_log = event_log
+        # Shared by every session so each category's index is built once
+        self.distractor_indexes = {}
+        self.players = set()
+        self.answers = 0
+        self.server = None
+        self.ticker = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle, host, port, limit=MAX_LINE)
+        self.ticker = asyncio.create_task(self.tick_all())
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+        # Stop the ticker and every connection's handler, and wait for them
+        tasks = [player.task for player in self.players if player.task is not None]
+        if self.ticker is not None:
+            tasks.append(self.ticker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.server is not None:
+            await self.server.wait_closed()
+
+    def port(self):
+        return self.server.sockets[0].getsockname()[1]
+
+    async def handle(self, reader, writer):
+        player = Player(GameSession(self.vocabulary, max_attempts=self.max_attempts,
+                                    distractor_indexes=self.distractor_indexes), writer)
+        player.task = asyncio.current_task()
+        self.players.add(player)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                    kind = message["type"]
+                except (ValueError, KeyError, TypeError):
+                    player.send({"type": "error", "message": "expected a JSON object with a type"})
+                    continue
+                wrong = [name for name in STRING_FIELDS
+                         if message.get(name) is not None and not isinstance(message[name], str)]
+                if wrong:
+                    player.send({"type": "error", "message": f"{wrong[0]} must be a string"})
+                    continue
+                self.dispatch(player, kind, message)
+                self.flush_events(player)
+                await player.drain()
+        except asyncio.CancelledError:
+            # close() shutting the server down; end quietly, since the stream
+            # machinery reports a handler that ends cancelled as an error
+            pass
+        finally:
+            self.players.discard(player)
+            writer.close()
+
+    def dispatch(self, player, kind, message):
+        session = player.session
+        if kind == "hello":
+            player.name = str(message.get("name", ""))
+            self.choose(player, message)
+            player.send({
+                "type": "welcome",
+                "categories": self.vocabulary.categories(),
+                "category": session.category,
+                "difficulty": session.difficulty,
+                "max_attempts": session.max_attempts,
+            })
+        elif kind == "start":
+            session.start()
+        elif kind == "answer":
+            session.check_answer(message.get("word"))
+        elif kind in ("category", "difficulty"):
+            self.choose(player, message)
+        else:
+            player.send({"type": "error", "message": f"unknown message type {kind!r}"})
+
+    def choose(self, player, message):
+        category = message.get("category")
+        if category is not None:
+            if category in self.vocabulary:
+                player.session.set_category(category)
+            else:
+                player.send({"type": "error", "message": f"unknown category {category!r}"})
+        difficulty = message.get("difficulty")
+        if difficulty is not None:
+            if difficulty in DIFFICULTIES:
+                player.session.difficulty = difficulty
+            else:
+                player.send({"type": "error", "message": f"unknown difficulty {difficulty!r}"})
+
+    # Turn the session's queued events into messages for its player
+    def flush_events(self, player):
+        session = player.session
+        for kind, value in session.drain_events():
+            if kind == "question":
+                player.send({
+                    "type": "question",
+                    "word": value,
+                    "options": session.options,
+                    "definition": session.definition(),
+                    "time_limit": session.time_left if session.timer_active else None,
+                })
+            elif kind == "answer":
+                self.answers += 1
+                if self.store is not None:
+                    self.store.record_answer(value)
+                if self.event_log is not None:
+                    self.event_log.record(value)
+                player.send({
+                    "type": "result",
+                    "correct": value["correct"],
+                    "word": value["word"],
+                    "feedback": session.feedback,
+                    "score": session.score,
+                    "attempts": session.attempts,
+                    "streak": session.streak,
+                    "response_time": value["response_time"],
+                })
+            elif kind == "game_over":
+                if self.store is not None:
+                    self.store.record_game(session)
+                player.send({
+                    "type": "game_over",
+                    "score": value,
+                    "max_attempts": session.max_attempts,
+                    "high_score": session.high_score,
+                })
+
+    async def tick_all(self):
+        loop = asyncio.get_running_loop()
+        last = loop.time()
+        while True:
+            await asyncio.sleep(TICK)
+            now = loop.time()
+            dt, last = now - last, now
+            for player in list(self.players):
+                # Every clock keeps running, even while a question without a
+                # timer waits for its answer; only busy sessions have events
+                session = player.session
+                busy = session.busy()
+                session.tick(dt)
+                if busy:
+                    self.flush_events(player)
+
+
+class Player:
+    def __init__(self, session, writer):
+        self.session = session
+        self.writer = writer
+        self.name = ""
+        # The connection's handler task
+        self.task = None
+
+    def send(self, message):
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+
+    async def drain(self):
+        try:
+            await self.writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def serve(args):
+    store = event_log = None
+    if args.db:
+        from progress_store import ProgressStore
+        store = ProgressStore(args.db)
+    if args.analytics:
+        from analytics import EventLog, write_chunk
+        # Write chunks on the store's writer thread, off the event loop
+        write = None
+        if store is not None:
+            write = functools.partial(store.call, write_chunk)
+        event_log = EventLog(args.analytics, source=args.source, write=write)
+
+    server = ClassroomServer(load_vocabulary(args.vocab), max_attempts=args.max_attempts,
+                             store=store, event_log=event_log)
+    await server.start(args.host, args.port)
+    print(f"Classroom server on {args.host}:{server.port()}", flush=True)
+    started = time.perf_counter()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        elapsed = time.perf_counter() - started
+        print(f"{server.answers} answers in {elapsed:.0f}s")
+        if event_log is not None:
+            event_log.flush()
+        if store is not None:
+            store.close()
+            if store.error is not None:
+                print(f"Could not save answers: {store.error}")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Serve quiz rounds to classroom clients")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--vocab", default=os.environ.get("ENGLISH_GAME_VOCAB"), help="a .vocab file to serve")
+    parser.add_argument("--max-attempts", type=int, default=10)
+    parser.add_argument("--db", help="log answers and games to this SQLite database")
+    parser.add_argument("--analytics", help="log answers as analytics chunks in this directory")
+    parser.add_argument("--source", help="classroom name recorded in analytics chunks")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
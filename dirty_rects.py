@@ -0,0 +1,80 @@
+import pygame
+
+_MISSING = object()
+
+
+# Collects the screen regions that changed this frame and presents only those.
+# A full redraw and flip is used after invalidate() (e.g. screen transitions).
+class DirtyRegions:
+    def __init__(self, screen_rect):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.rects = []
+        self.full_redraw = True
+        self.values = {}
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def add(self, rect):
+        if rect is None:
+            return
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.rects.append(rect)
+
+    # True when value differs from what was seen under this name last time
+    def changed(self, name, value):
+        if self.values.get(name, _MISSING) == value:
+            return False
+        self.values[name] = value
+        return True
+
+    # Mark rect dirty whenever the value it displays changes
+    def watch(self, name, value, rect):
+        if self.changed(name, value):
+            self.add(rect)
+
+    # Grow the dirty area to cover every shape it touches. Rounded rects are not
+    # drawn identically when the clip cuts through them, so never cut them.
+    def cover(self, shapes):
+        for shape in shapes:
+            if shape.collidelist(self.rects) != -1:
+                self.add(shape)
+
+    # Fold overlapping rects together so no area is redrawn twice. A rect only
+    # joins the result once it overlaps none of it; a union can reach rects it
+    # didn't touch before, so it goes back to be checked again.
+    def merged(self):
+        pending = list(self.rects)
+        result = []
+        while pending:
+            rect = pending.pop()
+            index = rect.collidelist(result)
+            if index == -1:
+                result.append(rect)
+            else:
+                pending.append(rect.union(result.pop(index)))
+        return result
+
+    # Redraw the dirty area into surface; returns the rects to push, or None
+    # when the whole screen has to be flipped
+    def redraw(self, surface, draw):
+        if self.full_redraw:
+            draw()
+            rects = None
+        else:
+            rects = self.merged()
+            for rect in rects:
+                surface.set_clip(rect)
+                draw()
+            surface.set_clip(None)
+        self.rects = []
+        self.full_redraw = False
+        return rects
+
+    # Push what redraw() produced to the display
+    def push(self, rects):
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
@@ -0,0 +1,114 @@
+import random
+from collections import defaultdict
+
+
+# Levenshtein distance between two short words
+def edit_distance(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def common_prefix(a, b):
+    n = 0
+    for ca, cb in zip(a, b):
+        if ca != cb:
+            break
+        n += 1
+    return n
+
+
+# Lower is more confusable: close spelling, shared start/end, similar length
+def similarity_cost(a, b):
+    return (edit_distance(a, b) * 2
+            - common_prefix(a, b)
+            - common_prefix(a[::-1], b[::-1])
+            + abs(len(a) - len(b)))
+
+
+# Cheap pre-filter on shared start/end and length, before edit distance
+def rough_cost(a, b):
+    return abs(len(a) - len(b)) - common_prefix(a, b) - common_prefix(a[::-1], b[::-1])
+
+
+# Wrong-answer sampler for one category, built once. Uniform draws are
+# k-without-replacement in O(k). "Hard" draws come from a word's list of
+# most similar words; the length/prefix/suffix buckets those lists are
+# drawn from are built up front and each list is ranked the first time
+# its word is asked for, so no question costs more than one bounded ranking.
+class DistractorIndex:
+    def __init__(self, words, neighbors=8, max_candidates=24, seed=0):
+        self.words = list(words)
+        self.positions = {word: i for i, word in enumerate(self.words)}
+        self.neighbor_count = neighbors
+        self.max_candidates = max_candidates
+        self.neighbors = {}
+
+        # Oversized buckets are thinned to a fixed, deterministic sample
+        sampler = random.Random(seed)
+        buckets = defaultdict(list)
+        for i, word in enumerate(self.words):
+            for key in self.bucket_keys(word):
+                buckets[key].append(i)
+        self.buckets = {
+            key: members if len(members) <= max_candidates * 4 else sampler.sample(members, max_candidates * 4)
+            for key, members in buckets.items()
+        }
+
+    @staticmethod
+    def bucket_keys(word):
+        return (("len", len(word)), ("pre", word[:2]), ("suf", word[-2:]))
+
+    # Most confusable words for the word at position, ranked once and memoized
+    def neighbors_of(self, position):
+        ranked = self.neighbors.get(position)
+        if ranked is not None:
+            return ranked
+        word = self.words[position]
+        candidates = set()
+        for key in (("pre", word[:2]), ("suf", word[-2:]), ("len", len(word)),
+                    ("len", len(word) - 1), ("len", len(word) + 1)):
+            candidates.update(self.buckets.get(key, ()))
+        candidates.discard(position)
+        shortlist = sorted(candidates, key=lambda j: (rough_cost(word, self.words[j]), j))[:self.max_candidates]
+        ranked = sorted(shortlist, key=lambda j: (similarity_cost(word, self.words[j]), j))[:self.neighbor_count]
+        self.neighbors[position] = ranked
+        return ranked
+
+    def __len__(self):
+        return len(self.words)
+
+    # k distinct words other than answer, drawn uniformly
+    def sample(self, answer, k, rng=random):
+        n = len(self.words)
+        k = min(k, n - 1)
+        skip = self.positions.get(answer)
+        if skip is None:
+            return [self.words[i] for i in rng.sample(range(n), min(k, n))]
+        # Draw from n - 1 slots and step over the answer's position
+        return [self.words[i + (i >= skip)] for i in rng.sample(range(n - 1), k)]
+
+    # k distinct words other than answer, preferring ones similar to it
+    def sample_hard(self, answer, k, rng=random):
+        position = self.positions.get(answer)
+        if position is None:
+            return self.sample(answer, k, rng)
+        similar = self.neighbors_of(position)
+        chosen = [self.words[i] for i in rng.sample(similar, min(k, len(similar)))]
+        if len(chosen) < k:
+            # Top up with uniform picks, skipping words already chosen
+            taken = set(chosen)
+            taken.add(answer)
+            for word in self.sample(answer, min(len(self.words) - 1, k + len(chosen)), rng):
+                if len(chosen) >= k:
+                    break
+                if word not in taken:
+                    chosen.append(word)
+                    taken.add(word)
+        return chosen
@@ -1,18 +1,54 @@
 import asyncio
+import time
+
+# Start of the time-to-first-frame measurement
+IMPORT_STARTED = time.perf_counter()
+
 import pygame
 import sys
 import random
 import math
-import numpy as np
+import os
+import zlib
+
+from category_browser import CategoryPages
+from dirty_rects import DirtyRegions
+from game_clock import GameClock
+from game_session import QUESTION_TIME, GameSession
+from hit_grid import HitGrid
+from particles import ParticleSystem
+from profiler import FrameProfiler
+from render_cache import DefinitionLayoutCache, LayerCache, TextCache
+from scheduler import make_selector
+from vocabulary import load_vocabulary
+
+# Importing this module does no pygame initialization. main() opens the
+# window and draws the first menu frame straight away; audio, particle
+# sprites and word images are set up over the next few frames.
 
-# Initialize pygame
-pygame.init()
-pygame.mixer.init()
+# Idle mode: when nothing is animating, sleep until input arrives instead of
+# redrawing an unchanged screen. Browsers (pygbag) can't block the main thread.
+IDLE_MODE = os.environ.get("ENGLISH_GAME_IDLE", "1") != "0" and sys.platform != "emscripten"
+IDLE_TIMEOUT_MS = 500
+
+# Record this run's input to a file, or replay one (see replay.py).
+# ENGLISH_GAME_REPLAY_SPEED=realtime replays at the recorded pace instead of
+# as fast as possible.
+RECORD_PATH = os.environ.get("ENGLISH_GAME_RECORD")
+REPLAY_PATH = os.environ.get("ENGLISH_GAME_REPLAY")
+REPLAY_REALTIME = os.environ.get("ENGLISH_GAME_REPLAY_SPEED") == "realtime"
+
+# Warn when the first frame takes longer than this (seconds since import)
+STARTUP_BUDGET = float(os.environ.get("ENGLISH_GAME_STARTUP_BUDGET", "0.25"))
+first_frame_time = None
 
 # Screen dimensions
 WIDTH, HEIGHT = 1200, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Fun English Learning Game")
+screen = None
+
+# Repaint only changed regions instead of flipping the whole screen each frame
+DIRTY_RECTS = os.environ.get("ENGLISH_GAME_DIRTY_RECTS", "1") != "0"
+dirty_regions = DirtyRegions(pygame.Rect(0, 0, WIDTH, HEIGHT))
 
 # Colors
 BACKGROUND = (230, 240, 255)
@@ -26,193 +62,238 @@ AUDIO_ON_COLOR = (100, 200, 100)
 AUDIO_OFF_COLOR = (200, 100, 100)
 PROGRESS_COLOR = (100, 180, 255)
 
-# Fonts
-title_font = pygame.font.SysFont("Arial", 48, bold=True)
-normal_font = pygame.font.SysFont("Arial", 32)
-button_font = pygame.font.SysFont("Arial", 28)
-instruction_font = pygame.font.SysFont("Arial", 20)
-
-# Categories and words with definitions
-categories = {
-    "Animals": {
-        "words": ["cat", "dog", "lion", "fish", "bird", "elephant", "monkey"],
-        "definitions": {
-            "cat": "A small domesticated carnivorous mammal with soft fur.",
-            "dog": "A domesticated carnivorous mammal that typically has a long snout.",
-            "lion": "A large, powerful cat that lives in parts of Africa and India.",
-            "fish": "A limbless cold-blooded vertebrate animal with gills and fins.",
-            "bird": "A warm-blooded egg-laying vertebrate with feathers and wings.",
-            "elephant": "A very large plant-eating mammal with a prehensile trunk.",
-            "monkey": "A primate, often with a long tail, typically living in trees."
-        }
-    },
-    "Fruits": {
-        "words": ["apple", "banana", "orange", "grape", "mango", "strawberry"],
-        "definitions": {
-            "apple": "A round fruit with red, green, or yellow skin and crisp flesh.",
-            "banana": "A long curved fruit with a yellow skin and soft sweet flesh.",
-            "orange": "A round juicy citrus fruit with a tough bright reddish-yellow rind.",
-            "grape": "A small round fruit that grows in clusters on a vine.",
-            "mango": "A tropical fruit with smooth yellow or red skin and sweet yellow flesh.",
-            "strawberry": "A sweet soft red fruit with a seed-studded surface."
-        }
-    },
-    "Colors": {
-        "words": ["red", "blue", "green", "yellow", "purple", "pink"],
-        "definitions": {
-            "red": "The color of blood, rubies, or strawberries.",
-            "blue": "The color of the sky or the sea on a sunny day.",
-            "green": "The color of grass, leaves, or emeralds.",
-            "yellow": "The color of lemons, butter, or ripe corn.",
-            "purple": "A color intermediate between red and blue.",
-            "pink": "A pale red color, named after the flower of the same name."
-        }
-    },
-    "Shapes": {
-        "words": ["circle", "square", "triangle", "star", "heart", "rectangle"],
-        "definitions": {
-            "circle": "A round plane figure whose boundary consists of points equidistant from the center.",
-            "square": "A plane figure with four equal straight sides and four right angles.",
-            "triangle": "A plane figure with three straight sides and three angles.",
-            "star": "A shape that represents a star, typically having five or more points.",
-            "heart": "A shape representing the human heart, often symbolizing love.",
-            "rectangle": "A plane figure with four straight sides and four right angles."
-        }
-    }
-}
+# Fonts (loaded by init_display)
+title_font = None
+normal_font = None
+button_font = None
+instruction_font = None
 
-# Game state
-current_category = "Animals"
-current_word = ""
-score = 0
-attempts = 0
-max_attempts = 10
-game_active = False
-feedback = ""
-feedback_time = 0
+# Rendered text is reused across frames instead of rasterized every time
+text_cache = TextCache(max_entries=256)
+render_text = text_cache.render
+
+# Definitions are wrapped at this width and rendered once per word
+DEFINITION_WIDTH = 600
+# Each screen's static content, pre-rendered (see draw_scene)
+scene_layers = LayerCache((WIDTH, HEIGHT), BACKGROUND)
+definition_cache = DefinitionLayoutCache(INSTRUCTION_COLOR, line_height=25)
+
+# Per-phase frame timing: F3 toggles the overlay. Setting
+# ENGLISH_GAME_PROFILE_TRACE to a .csv or .json path records every frame
+# and writes the trace there on exit.
+PROFILE_TRACE = os.environ.get("ENGLISH_GAME_PROFILE_TRACE")
+profiler = FrameProfiler(history=240, record=bool(PROFILE_TRACE))
+profiler_overlay = None
+
+# Word list: an external vocabulary file if ENGLISH_GAME_VOCAB points at one,
+# otherwise the built-in categories (see vocabulary.py)
+VOCAB_PATH = os.environ.get("ENGLISH_GAME_VOCAB")
+vocabulary = None
+
+# How the next word is picked: "srs" (spaced repetition, progress kept
+# between runs) or "random"
+WORD_SELECTOR = os.environ.get("ENGLISH_GAME_SELECTOR", "srs")
+
+# Game state lives in the session; the rest is UI state
+session = None
 show_instructions = True
 audio_enabled = True
 show_definition = False
-streak = 0
-high_score = 0
-difficulty = "Normal"
-timer_active = False
-time_left = 0
-particles = []
-word_images = {}
-
-# Create colored placeholder images
-def create_placeholder_images():
-    images = {}
-    color_map = {
-        "Animals": (200, 150, 100),
-        "Fruits": (255, 200, 150),
-        "Colors": (200, 200, 255),
-        "Shapes": (200, 255, 200)
-    }
+particles = ParticleSystem(capacity=4096)
+sounds = {}
+word_sounds = {}
+# Spoken words and definitions from the prebuilt bank (speech_bank.py), if any
+speech = None
+# Answer and score log (opened during startup; None without it)
+progress = None
+# Set ENGLISH_GAME_ANALYTICS to a directory to also log answers as columnar
+# chunks for analytics.py
+ANALYTICS_DIR = os.environ.get("ENGLISH_GAME_ANALYTICS")
+event_log = None
+# Word artwork (or placeholders), loaded in the background once started up
+image_cache = None
+# Words of a category to start loading when its button is hovered
+PREFETCH_WORDS = 64
+# Pre-rendered images and sounds (asset_bundle.py), if one was built. Its
+# sounds are decoded a few milliseconds per frame: the menu's first, then the
+# current category's, then the rest; images load through image_cache.
+bundle = None
+bundle_loader = None
+bundle_sounds = {}
+# Effects the bundle has that weren't decoded yet when init_audio ran
+bundle_effects_pending = set()
+BUNDLE_STEP_BUDGET = 0.004
+
+# Base image colors for the built-in categories
+CATEGORY_COLORS = {
+    "Animals": (200, 150, 100),
+    "Fruits": (255, 200, 150),
+    "Colors": (200, 200, 255),
+    "Shapes": (200, 255, 200)
+}
+
+# Stable pastel color for categories from external word packs
+def category_color(category):
+    if category in CATEGORY_COLORS:
+        return CATEGORY_COLORS[category]
+    crc = zlib.crc32(category.encode("utf-8"))
+    return (130 + crc % 120, 130 + (crc >> 8) % 120, 130 + (crc >> 16) % 120)
+
+# Create colored placeholder images for one category's words
+def create_placeholder_image(category, word):
+    base_color = category_color(category)
+    img = pygame.Surface((150, 150)).convert()
+    # Create a slightly varied color for each word, the same every time so a
+    # placeholder redrawn after leaving the image cache looks the same
+    crc = zlib.crc32(f"{category}/{word}".encode("utf-8"))
+    color = tuple(
+        max(50, min(255, base + (crc >> shift) % 61 - 30))
+        for base, shift in zip(base_color, (0, 8, 16))
+    )
+    img.fill(color)
     
-    for category, data in categories.items():
-        base_color = color_map[category]
-        for word in data["words"]:
-            img = pygame.Surface((150, 150))
-            # Create a slightly varied color for each word
-            color = (
-                max(50, min(255, base_color[0] + random.randint(-30, 30))),
-                max(50, min(255, base_color[1] + random.randint(-30, 30))),
-                max(50, min(255, base_color[2] + random.randint(-30, 30)))
-            )
-            img.fill(color)
-            
-            # Add text to the image
-            font = pygame.font.SysFont("Arial", 20)
-            text = font.render(word, True, (0, 0, 0))
-            text_rect = text.get_rect(center=(75, 75))
-            img.blit(text, text_rect)
-            
-            images[word] = img
+    # Add text to the image
+    text = instruction_font.render(word, True, (0, 0, 0))
+    text_rect = text.get_rect(center=(75, 75))
+    img.blit(text, text_rect)
     
-    return images
+    return img
 
-# Generate simple sound effects
-def generate_sounds():
-    sounds = {}
+# Start loading PNG artwork (ENGLISH_GAME_ASSETS/<category>/<word>.png)
+def init_images():
+    global image_cache
+    from asset_loader import DEFAULT_ASSET_DIR, ImageCache
+    
+    # Artwork from the bundle, already scaled; PNGs added since it was built
+    # still load from the asset directory
+    source = bundle.image if bundle is not None else None
+    image_cache = ImageCache(DEFAULT_ASSET_DIR, create_placeholder_image, source=source)
+    prefetch_category(session.category)
+    # A game started before now shows the empty frame in place of the image
+    dirty_regions.add(word_image_rect())
+
+def prefetch_category(category):
+    if bundle_loader is not None:
+        bundle_loader.prioritize(category)
+    if image_cache is not None:
+        image_cache.prefetch(category, vocabulary.words(category)[:PREFETCH_WORDS])
+
+# The current word's image, or None before the image cache is up
+def word_image(word):
+    if image_cache is None:
+        return None
+    return image_cache.get(session.category, word)
+
+def word_image_rect():
+    return pygame.Rect(WIDTH // 2 - 75, 270, 150, 150)
+
+# Upper bound on memory held by decoded word sounds
+WORD_SOUND_BUDGET = 4 * 1024 * 1024
+
+# Describe the game's sound effects
+def effect_specs():
+    from sound_synth import SAMPLE_RATE
     
-    # Correct sound (rising tone)
-    sample_rate = 44100
     duration = 0.5
-    samples = int(sample_rate * duration)
-    
-    # Generate correct sound (rising pitch)
-    correct_buffer = np.zeros((samples, 2), dtype=np.int16)
-    for i in range(samples):
-        freq = 440 + (i / samples) * 440
-        value = int(32767 * math.sin(2.0 * math.pi * freq * i / sample_rate))
-        correct_buffer[i][0] = value
-        correct_buffer[i][1] = value
-    sounds["correct"] = pygame.sndarray.make_sound(correct_buffer)
-    
-    # Wrong sound (falling pitch)
-    wrong_buffer = np.zeros((samples, 2), dtype=np.int16)
-    for i in range(samples):
-        freq = 880 - (i / samples) * 440
-        value = int(32767 * math.sin(2.0 * math.pi * freq * i / sample_rate))
-        wrong_buffer[i][0] = value
-        wrong_buffer[i][1] = value
-    sounds["wrong"] = pygame.sndarray.make_sound(wrong_buffer)
-    
-    # Button click sound
-    click_buffer = np.zeros((samples // 3, 2), dtype=np.int16)
-    for i in range(samples // 3):
-        freq = 330
-        value = int(32767 * math.sin(2.0 * math.pi * freq * i / sample_rate))
-        click_buffer[i][0] = value
-        click_buffer[i][1] = value
-    sounds["click"] = pygame.sndarray.make_sound(click_buffer)
-    
-    # Word sounds (simple tones for each word)
-    for category, data in categories.items():
-        for word in data["words"]:
-            word_buffer = np.zeros((samples, 2), dtype=np.int16)
-            freq = 300 + len(word) * 50
-            for i in range(samples):
-                value = int(32767 * math.sin(2.0 * math.pi * freq * i / sample_rate))
-                word_buffer[i][0] = value
-                word_buffer[i][1] = value
-            sounds[word] = pygame.sndarray.make_sound(word_buffer)
+    samples = int(SAMPLE_RATE * duration)
     
-    return sounds
+    return {
+        # Correct sound (rising pitch)
+        "correct": ("chirp", 440, 880, samples),
+        # Wrong sound (falling pitch)
+        "wrong": ("chirp", 880, 440, samples),
+        # Button click sound
+        "click": ("tone", 330, samples // 3),
+    }
 
-# Create placeholder images
-word_images = create_placeholder_images()
+# Describe each word's sound (a simple tone; words of equal length share it)
+def word_specs():
+    from sound_synth import SAMPLE_RATE
+    
+    duration = 0.5
+    samples = int(SAMPLE_RATE * duration)
+    
+    specs = {}
+    for category in vocabulary.categories():
+        for word in vocabulary.words(category):
+            specs[word] = ("tone", 300 + len(word) * 50, samples)
+    
+    return specs
 
-# Try to generate sounds, but continue without them if there's an error
-try:
-    sounds = generate_sounds()
-except Exception as e:
-    print(f"Could not generate sounds: {e}")
+# Every sound the game plays: the effects and each distinct word tone, keyed
+# like the sound bank
+def sound_specs():
+    from sound_store import spec_key
+    
+    specs = effect_specs()
+    specs.update((spec_key(spec), spec) for spec in word_specs().values())
+    return specs
+
+# Turn a (samples, 2) int16 buffer into a pygame Sound
+def make_sound(stereo):
+    import numpy as np
+    
+    # make_sound needs C-contiguous data; cached banks already are
+    return pygame.sndarray.make_sound(np.ascontiguousarray(stereo))
+
+# Generate simple sound effects, reusing the on-disk bank when it is current.
+# Word sounds are only turned into Sound objects when first played.
+def generate_sounds():
+    from sound_cache import load_sound_bank
+    from sound_store import WordSoundStore
+    
+    store = WordSoundStore(word_specs(), make_sound, budget_bytes=WORD_SOUND_BUDGET)
+    specs = effect_specs()
+    if bundle is not None:
+        store.bank = bundle_sounds
+        return bundle_effect_sounds(specs), store
+    specs.update(store.unique_specs())
+    bank = load_sound_bank(specs)
+    store.bank = bank
+    
+    sounds = {name: make_sound(bank[name]) for name in effect_specs()}
+    return sounds, store
+
+# Effects from the asset bundle, with word sounds coming from bundle_sounds
+# as load_bundle_step decodes them. Effects still on their way are added when
+# they arrive; ones the bundle lacks are synthesized now, and word sounds it
+# lacks on first use.
+def bundle_effect_sounds(specs):
+    from sound_synth import render, to_stereo
+    
     sounds = {}
-    audio_enabled = False
+    for name, spec in specs.items():
+        if name in bundle_sounds:
+            sounds[name] = make_sound(bundle_sounds[name])
+        elif name in bundle.sounds:
+            bundle_effects_pending.add(name)
+        else:
+            sounds[name] = make_sound(to_stereo(render(spec)))
+    return sounds
 
-# Particle effect class
-class Particle:
-    def __init__(self, x, y, color):
-        self.x = x
-        self.y = y
-        self.color = color
-        self.size = random.randint(2, 6)
-        self.speed_x = random.uniform(-3, 3)
-        self.speed_y = random.uniform(-3, 3)
-        self.life = random.randint(20, 40)
-        
-    def update(self):
-        self.x += self.speed_x
-        self.y += self.speed_y
-        self.life -= 1
-        self.size = max(0, self.size - 0.1)
-        return self.life > 0
-        
-    def draw(self, surface):
-        pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), int(self.size))
+# Open the asset bundle, if there is one, and start streaming its sounds
+def init_bundle():
+    global bundle, bundle_loader
+    from asset_bundle import DEFAULT_BUNDLE, BundleLoader, open_bundle
+    from sound_cache import bank_key
+    
+    if not os.path.exists(DEFAULT_BUNDLE):
+        return
+    # Only a bundle of the sounds this game and word list would make
+    bundle = open_bundle(sound_key=bank_key(sound_specs()))
+    if bundle is not None:
+        bundle_loader = BundleLoader(bundle, [session.category])
+
+def load_bundle_step():
+    global bundle_loader
+    for name, stereo in bundle_loader.step(BUNDLE_STEP_BUDGET):
+        bundle_sounds[name] = stereo
+        # Effects arriving after init_audio
+        if name in bundle_effects_pending:
+            bundle_effects_pending.discard(name)
+            sounds[name] = make_sound(stereo)
+    if not len(bundle_loader):
+        bundle_loader = None
 
 # Button class
 class Button:
@@ -222,15 +303,32 @@ class Button:
         self.color = color
         self.hover_color = BUTTON_HOVER
         self.is_hovered = False
+        self.label = None
+        self.label_surf = None
+        self.drawn = None
+        
+    # Only look the label up again when the text it shows has changed
+    def label_surface(self, label):
+        if label != self.label:
+            self.label = label
+            self.label_surf = render_text(button_font, label, TEXT_COLOR)
+        return self.label_surf
         
     def draw(self, surface):
         color = self.hover_color if self.is_hovered else self.color
         pygame.draw.rect(surface, color, self.rect, border_radius=12)
         pygame.draw.rect(surface, (50, 50, 50), self.rect, 3, border_radius=12)
         
-        text_surf = button_font.render(self.text, True, TEXT_COLOR)
+        text_surf = self.label_surface(self.text)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
+        self.drawn = (self.is_hovered, self.text)
+        
+    # Area to repaint if the button looks different from when it was last drawn
+    def dirty_rect(self):
+        if self.drawn != (self.is_hovered, self.text):
+            return self.rect
+        return None
         
     def check_hover(self, pos):
         self.is_hovered = self.rect.collidepoint(pos)
@@ -252,6 +350,16 @@ class ToggleButton:
         self.on_color = on_color
         self.off_color = off_color
         self.is_hovered = False
+        self.label = None
+        self.label_surf = None
+        self.drawn = None
+        
+    # Only look the label up again when the text it shows has changed
+    def label_surface(self, label):
+        if label != self.label:
+            self.label = label
+            self.label_surf = render_text(button_font, label, TEXT_COLOR)
+        return self.label_surf
         
     def draw(self, surface):
         color = self.on_color if self.state else self.off_color
@@ -262,9 +370,16 @@ class ToggleButton:
         pygame.draw.rect(surface, (50, 50, 50), self.rect, 3, border_radius=12)
         
         status = "ON" if self.state else "OFF"
-        text_surf = button_font.render(f"{self.text}: {status}", True, TEXT_COLOR)
+        text_surf = self.label_surface(f"{self.text}: {status}")
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
+        self.drawn = (self.is_hovered, self.state, self.text)
+        
+    # Area to repaint if the button looks different from when it was last drawn
+    def dirty_rect(self):
+        if self.drawn != (self.is_hovered, self.state, self.text):
+            return self.rect
+        return None
         
     def check_hover(self, pos):
         self.is_hovered = self.rect.collidepoint(pos)
@@ -278,97 +393,339 @@ class ToggleButton:
                 return True
         return False
 
-# Create buttons
+# Text field for typed answers
+class AnswerBox:
+    def __init__(self, x, y, width, height, max_length=24):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = ""
+        self.max_length = max_length
+        self.drawn = None
+        
+    # Apply one key press; returns True when Enter submits the answer
+    def handle_key(self, event):
+        if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            return bool(self.text.strip())
+        if event.key == pygame.K_BACKSPACE:
+            self.text = self.text[:-1]
+        elif event.key == pygame.K_ESCAPE:
+            self.text = ""
+        else:
+            char = getattr(event, "unicode", "")
+            if char and char.isprintable() and len(self.text) < self.max_length:
+                self.text += char
+        return False
+        
+    def draw(self, surface):
+        pygame.draw.rect(surface, (255, 255, 255), self.rect, border_radius=12)
+        pygame.draw.rect(surface, (50, 50, 50), self.rect, 3, border_radius=12)
+        
+        if self.text:
+            text_surf = render_text(button_font, self.text + "|", TEXT_COLOR)
+        else:
+            text_surf = render_text(button_font, "Type the word...", (150, 150, 170))
+        surface.blit(text_surf, text_surf.get_rect(midleft=(self.rect.x + 15, self.rect.centery)))
+        self.drawn = self.text
+        
+    def dirty_rect(self):
+        if self.drawn != self.text:
+            return self.rect
+        return None
+
+# Create buttons (category buttons are added by init_game, one page at a time)
 category_buttons = []
-for i, category in enumerate(categories.keys()):
-    button = Button(100 + i * 200, 150, 160, 60, category)
-    category_buttons.append(button)
+category_pages = None
+# Categories per page: the old single row of five, or four between page arrows
+CATEGORY_ROW = 5
+CATEGORY_PAGE = 4
 
 start_button = Button(WIDTH // 2 - 80, HEIGHT // 2 + 50, 160, 60, "Start Game")
 instruction_button = Button(WIDTH // 2 - 80, HEIGHT // 2 + 130, 160, 60, "Instructions")
 back_button = Button(50, 50, 120, 50, "Back")
 audio_button = ToggleButton(WIDTH - 150, 50, 120, 50, "Audio", audio_enabled)
 definition_button = ToggleButton(WIDTH - 150, 110, 120, 50, "Define", False)
-difficulty_button = Button(WIDTH - 150, 170, 120, 50, f"Diff: {difficulty}")
+difficulty_button = Button(WIDTH - 150, 170, 120, 50, "Diff: Normal")
+typing_button = ToggleButton(WIDTH - 150, 230, 120, 50, "Type", False)
+prev_page_button = Button(30, 150, 50, 60, "<")
+next_page_button = Button(920, 150, 50, 60, ">")
 option_buttons = []
 
-# Function to start a new game
-def start_new_game():
-    global game_active, score, attempts, current_word, feedback, show_instructions, streak, timer_active, time_left
-    game_active = True
-    score = 0
-    attempts = 0
-    streak = 0
-    feedback = ""
-    show_instructions = False
-    timer_active = difficulty == "Hard"
-    next_word()
+# Clicks and hover go to the widget found under the mouse in this grid
+hit_grid = HitGrid()
+hovered_widget = None
 
-# Function to select the next word
-def next_word():
-    global current_word, option_buttons, feedback, time_left
-    current_word = random.choice(categories[current_category]["words"])
+# Typing mode: the answer field and the words suggested for what is typed so far
+answer_box = AnswerBox(WIDTH // 2 - 200, 360, 400, 60)
+suggestion_buttons = []
+SUGGESTION_WIDTH = 180
+
+# Open the window and load the fonts: all the first frame needs
+def init_display():
+    global screen, title_font, normal_font, button_font, instruction_font
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Fun English Learning Game")
     
-    # Play word sound if audio is enabled
-    if audio_enabled and current_word in sounds:
-        sounds[current_word].play()
+    title_font = pygame.font.SysFont("Arial", 48, bold=True)
+    normal_font = pygame.font.SysFont("Arial", 32)
+    button_font = pygame.font.SysFont("Arial", 28)
+    instruction_font = pygame.font.SysFont("Arial", 20)
+
+# Open the word list and create the session and category buttons
+def init_game():
+    global vocabulary, session, category_pages
+    vocabulary = load_vocabulary(VOCAB_PATH)
+    session = GameSession(vocabulary, difficulty="Normal", max_attempts=10,
+                          selector=make_selector(WORD_SELECTOR))
+    difficulty_button.text = f"Diff: {session.difficulty}"
     
-    # Create options (correct answer + 3 random wrong answers)
-    options = [current_word]
-    while len(options) < 4:
-        random_word = random.choice(categories[current_category]["words"])
-        if random_word not in options:
-            options.append(random_word)
+    names = vocabulary.categories()
+    category_pages = CategoryPages(names, CATEGORY_ROW if len(names) <= CATEGORY_ROW else CATEGORY_PAGE)
+    category_pages.show(session.category)
+    build_category_buttons()
+
+# Buttons for the categories on the current page only
+def build_category_buttons():
+    global category_buttons
+    category_buttons = [
+        Button(100 + i * 200, 150, 160, 60, category)
+        for i, category in enumerate(category_pages.visible())
+    ]
+
+def paged():
+    return category_pages.page_count() > 1
+
+def turn_category_page(step):
+    if category_pages.turn(step):
+        build_category_buttons()
+
+# Try to generate sounds, but continue without them if there's an error
+def init_audio():
+    global sounds, word_sounds, audio_enabled
+    try:
+        pygame.mixer.init()
+        sounds, word_sounds = generate_sounds()
+        init_speech()
+    except Exception as e:
+        print(f"Could not generate sounds: {e}")
+        sounds = {}
+        word_sounds = {}
+        audio_enabled = False
+        audio_button.state = False
+
+# Stream words from the speech bank on a channel of their own
+def init_speech():
+    global speech
+    from speech_bank import SpeechPlayer, open_speech_bank
     
-    random.shuffle(options)
+    bank = open_speech_bank()
+    if bank is not None:
+        pygame.mixer.set_reserved(1)
+        speech = SpeechPlayer(bank, make_sound, pygame.mixer.Channel(0), pygame.mixer.get_init()[0])
+
+# Open the answer logs and show the best score played so far
+def init_progress():
+    global progress, event_log
+    import sqlite3
+    from progress_store import ProgressStore
     
-    # Create buttons for options
-    option_buttons = []
-    for i, option in enumerate(options):
-        button = Button(200 + (i % 2) * 300, 350 + (i // 2) * 100, 250, 80, option)
-        option_buttons.append(button)
+    try:
+        progress = ProgressStore()
+        session.high_score = max(session.high_score, progress.best_score())
+    except (OSError, sqlite3.Error) as e:
+        print(f"Could not open progress database: {e}")
+        progress = None
     
-    # Set timer for hard difficulty
-    if timer_active:
-        time_left = 10
-
-# Function to check answer
-def check_answer(selected_word):
-    global score, attempts, feedback, feedback_time, audio_enabled, streak, particles, high_score
-    
-    attempts += 1
-    if selected_word == current_word:
-        score += 1
-        streak += 1
-        feedback = "Correct! Good job!"
-        if audio_enabled and "correct" in sounds:
-            sounds["correct"].play()
-        
-        # Create particles for correct answer
-        for _ in range(20):
-            particles.append(Particle(WIDTH // 2, 270 + 75, 
-                                    (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))))
-    else:
-        streak = 0
-        feedback = f"Oops! It's {current_word}"
-        if audio_enabled and "wrong" in sounds:
-            sounds["wrong"].play()
+    if ANALYTICS_DIR:
+        import functools
+        from analytics import EventLog, write_chunk
+        # Compressing a chunk takes long enough to drop frames, so it is
+        # written on the progress writer thread when there is one
+        write = None
+        if progress is not None:
+            write = functools.partial(progress.call, write_chunk)
+        event_log = EventLog(ANALYTICS_DIR, write=write)
+
+# Startup work that can wait until the first frame is on screen
+def startup_steps():
+    return [
+        init_bundle,
+        init_audio,
+        init_progress,
+        particles.prepare,
+        init_images,
+    ]
+
+# Whether the next frame could look different without any input
+def animating():
+    return (session.busy() or len(particles) > 0
+            or (image_cache is not None and bool(image_cache.pending))
+            or (speech is not None and speech.busy())
+            or bundle_loader is not None
+            or (profiler_overlay is not None and profiler_overlay.visible))
+
+# What a replay has to reproduce
+def game_state():
+    return {
+        "clock": session.clock,
+        "active": session.active,
+        "category": session.category,
+        "difficulty": session.difficulty,
+        "word": session.current_word,
+        "options": list(session.options),
+        "score": session.score,
+        "attempts": session.attempts,
+        "streak": session.streak,
+        "feedback": session.feedback,
+        "time_left": session.time_left,
+        "show_instructions": show_instructions,
+        "show_definition": show_definition,
+    }
+
+# Set up recording or replaying. Either way every RNG is seeded from the
+# recording and the word scheduler's clock follows the game clock, so the
+# same input gives the same words in the same order.
+def start_record_replay(record_path, replay_path, mouse_pos):
+    from replay import Recorder, Replay
     
-    feedback_time = pygame.time.get_ticks()
+    recorder = replayer = None
+    if replay_path:
+        replayer = Replay(replay_path)
+        header = replayer.header
+        check_replay_vocabulary(replay_path, header)
+        # Start from the recorded scheduler state and don't save over the real one
+        session.selector = make_selector(header["selector"], path=None)
+        session.selector.load_state(header["selector_state"] or {})
+    else:
+        header = {
+            "seed": int(os.environ.get("ENGLISH_GAME_SEED", random.SystemRandom().randrange(1 << 32))),
+            "selector": WORD_SELECTOR,
+            "selector_state": session.selector.state(),
+            "started_at": time.time(),
+            "mouse_pos": list(mouse_pos),
+            "vocab": VOCAB_PATH,
+            "vocab_digest": vocabulary.digest(),
+        }
+        recorder = Recorder(record_path, header)
     
-    if attempts < max_attempts:
-        # Wait a moment before showing next word
-        pygame.time.set_timer(pygame.USEREVENT, 1500)
+    seed = header["seed"]
+    random.seed(seed)
+    session.rng = random.Random(seed)
+    particles.reseed(seed)
+    if hasattr(session.selector, "now"):
+        started_at = header["started_at"]
+        session.selector.now = lambda: started_at + session.clock
+    return recorder, replayer, tuple(header["mouse_pos"])
+
+# Other words give other questions, so a replay with the wrong word list would
+# only report a mismatch at the first answer; stop before it starts instead.
+# Recordings made before vocab_digest was stored are checked by path.
+def check_replay_vocabulary(replay_path, header):
+    recorded = header.get("vocab")
+    if "vocab_digest" in header:
+        matches = header["vocab_digest"] == vocabulary.digest()
     else:
-        # Game over
-        pygame.time.set_timer(pygame.USEREVENT, 2000)
+        matches = recorded == VOCAB_PATH
+    if not matches:
+        using = "a different version of it" if recorded == VOCAB_PATH else VOCAB_PATH or "the built-in words"
+        raise SystemExit(f"Can't replay {replay_path}: it was recorded with {recorded or 'the built-in words'}, "
+                         f"but ENGLISH_GAME_VOCAB gives {using}")
 
-# Function to draw instructions
-def draw_instructions():
-    screen.fill(BACKGROUND)
-    
-    title_text = title_font.render("How to Play", True, TEXT_COLOR)
-    screen.blit(title_title_text, (WIDTH // 2 - title_text.get_width() // 2, 50))
+# Create the profiler overlay on first use
+def toggle_profiler_overlay():
+    global profiler_overlay
+    if profiler_overlay is None:
+        from profiler import ProfilerOverlay
+        profiler_overlay = ProfilerOverlay(profiler, pygame.font.SysFont("Arial", 14), topleft=(10, 10))
+    profiler_overlay.toggle()
+    dirty_regions.invalidate()
+
+# Function to start a new game
+def start_new_game():
+    global show_instructions
+    show_instructions = False
+    prefetch_category(session.category)
+    session.start()
+    apply_session_events()
+    prewarm_definitions()
+
+# Lay out the current category's definitions over the next frames that run,
+# the first question's options first
+def prewarm_definitions():
+    definitions = (session.definition(word) for word in [*session.options, *session.words()])
+    definition_cache.prewarm((text for text in definitions if text), instruction_font, DEFINITION_WIDTH)
+
+# Create buttons for the current question's options
+def build_option_buttons():
+    global option_buttons
+    option_buttons = []
+    for i, option in enumerate(session.options):
+        button = Button(200 + (i % 2) * 300, 350 + (i // 2) * 100, 250, 80, option)
+        option_buttons.append(button)
+
+# Offer words that match the typed answer so far
+def update_suggestions():
+    global suggestion_buttons
+    words = session.suggest(answer_box.text) if session.typing and session.awaiting_answer else []
+    if words == [button.text for button in suggestion_buttons]:
+        return
+    x = WIDTH // 2 - (len(words) * (SUGGESTION_WIDTH + 10) - 10) // 2
+    suggestion_buttons = [
+        Button(x + i * (SUGGESTION_WIDTH + 10), 440, SUGGESTION_WIDTH, 44, word)
+        for i, word in enumerate(words)
+    ]
+
+# Screen area the suggestion buttons can cover
+def suggestions_rect():
+    width = 4 * (SUGGESTION_WIDTH + 10)
+    return pygame.Rect(WIDTH // 2 - width // 2, 440, width, 44)
+
+# Turn what happened in the session into sounds, buttons and particles
+def apply_session_events():
+    events = session.drain_events()
+    for kind, value in events:
+        if kind == "question":
+            # Say the word (and its definition when shown) if audio is enabled,
+            # falling back to the word's tone without a speech bank
+            if audio_enabled and speech is not None and value in speech:
+                speech.play(value, session.definition() if show_definition else None)
+            elif audio_enabled and value in word_sounds:
+                word_sounds.play(value)
+            build_option_buttons()
+            answer_box.text = ""
+        elif kind == "correct":
+            if audio_enabled and "correct" in sounds:
+                sounds["correct"].play()
+            # Create particles for correct answer
+            particles.emit(WIDTH // 2, 270 + 75, 20)
+        elif kind == "wrong":
+            if audio_enabled and "wrong" in sounds:
+                sounds["wrong"].play()
+        elif kind == "answer":
+            if progress is not None:
+                progress.record_answer(value)
+            if event_log is not None:
+                event_log.record(value)
+        elif kind == "game_over":
+            if progress is not None:
+                progress.record_game(session)
+            save_progress()
+    if events:
+        update_suggestions()
+
+# Keep the word scheduler's state for the next run
+def save_progress():
+    try:
+        session.selector.save()
+        if event_log is not None:
+            event_log.flush()
+    except OSError as e:
+        print(f"Could not save progress: {e}")
+
+# Function to draw instructions (the static text; the back button is drawn on top)
+def draw_instructions(surface):
+    title_text = render_text(title_font, "How to Play", TEXT_COLOR)
+    surface.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 50))
     
     instructions = [
         "1. Select a category from the top",
@@ -382,18 +739,17 @@ def draw_instructions():
         "   - Easy: No timer, easier words",
         "   - Normal: No timer, all words",
         "   - Hard: 10-second timer per question",
-        "9. Have fun learning English!"
+        "9. Turn on Type to spell the answers yourself",
+        "10. Have fun learning English!"
     ]
     
     for i, instruction in enumerate(instructions):
-        text = instruction_font.render(instruction, True, INSTRUCTION_COLOR)
-        screen.blit(text, (WIDTH // 2 - text.get_width() // 2, 150 + i * 30))
-    
-    back_button.draw(screen)
+        text = render_text(instruction_font, instruction, INSTRUCTION_COLOR)
+        surface.blit(text, (WIDTH // 2 - text.get_width() // 2, 150 + i * 30))
 
 # Function to draw progress bar
 def draw_progress_bar():
-    if max_attempts == 0:
+    if session.max_attempts == 0:
         return
         
     bar_width = 500
@@ -405,20 +761,21 @@ def draw_progress_bar():
     pygame.draw.rect(screen, (200, 200, 200), (x, y, bar_width, bar_height), border_radius=10)
     
     # Draw progress
-    progress_width = (attempts / max_attempts) * bar_width
+    progress_width = (session.attempts / session.max_attempts) * bar_width
     pygame.draw.rect(screen, PROGRESS_COLOR, (x, y, progress_width, bar_height), border_radius=10)
     
     # Draw border
     pygame.draw.rect(screen, (50, 50, 50), (x, y, bar_width, bar_height), 2, border_radius=10)
     
     # Draw text
-    progress_text = instruction_font.render(f"{attempts}/{max_attempts}", True, TEXT_COLOR)
+    progress_text = render_text(instruction_font, f"{session.attempts}/{session.max_attempts}", TEXT_COLOR)
     screen.blit(progress_text, (x + bar_width + 10, y - 2))
 
 # Function to draw timer
 def draw_timer():
-    if not timer_active or not game_active:
+    if not session.timer_active or not session.active:
         return
+    time_left = session.time_left
         
     timer_width = 200
     timer_height = 20
@@ -429,7 +786,7 @@ def draw_timer():
     pygame.draw.rect(screen, (200, 200, 200), (x, y, timer_width, timer_height), border_radius=10)
     
     # Draw timer
-    timer_progress = (time_left / 10) * timer_width
+    timer_progress = (time_left / QUESTION_TIME) * timer_width
     color = (
         max(0, min(255, 255 - (time_left * 25))),
         min(255, time_left * 25),
@@ -441,210 +798,446 @@ def draw_timer():
     pygame.draw.rect(screen, (50, 50, 50), (x, y, timer_width, timer_height), 2, border_radius=10)
     
     # Draw text
-    timer_text = instruction_font.render(f"Time: {time_left}s", True, TEXT_COLOR)
+    # Whole seconds, so the label only changes once per second
+    timer_text = render_text(instruction_font, f"Time: {math.ceil(time_left)}s", TEXT_COLOR)
     screen.blit(timer_text, (x + timer_width // 2 - timer_text.get_width() // 2, y + 25))
 
-# Main game loop
-async def main():
-    global game_active, score, attempts, current_word, feedback, feedback_time
-    global show_instructions, audio_enabled, show_definition, streak, high_score
-    global difficulty, timer_active, time_left, particles
+# Screen area covered by the timer bar and its label
+def timer_rect():
+    return pygame.Rect((WIDTH - 200) // 2, 240, 200, 45 + instruction_font.get_linesize())
+
+# Screen area covered by the progress bar and its label
+def progress_rect():
+    return pygame.Rect((WIDTH - 500) // 2, HEIGHT - 42, 580, max(24, 4 + instruction_font.get_linesize()))
+
+# Widgets that are drawn on the current screen
+def visible_widgets():
+    widgets = []
+    if show_instructions:
+        widgets.append(back_button)
+    elif session.active and session.typing:
+        widgets.append(answer_box)
+        widgets.extend(suggestion_buttons)
+    elif session.active:
+        widgets.extend(option_buttons)
+    else:
+        widgets.extend(category_buttons)
+        if paged():
+            widgets.extend([prev_page_button, next_page_button])
+        widgets.extend([start_button, instruction_button])
+    # In drawing order, so the last widget at a point is the one on top
+    widgets.extend([audio_button, definition_button, difficulty_button, typing_button])
+    return widgets
+
+# Re-bucket the clickable widgets when the screen's widgets changed
+def refresh_hit_grid():
+    global hovered_widget
+    if hit_grid.update([widget for widget in visible_widgets() if widget is not answer_box]):
+        if hovered_widget is not None:
+            hovered_widget.is_hovered = False
+        hovered_widget = None
+
+# Highlight the widget under the mouse, and only that one
+def update_hover(pos):
+    global hovered_widget
+    widget = hit_grid.at(pos)
+    if widget is hovered_widget:
+        return
+    if hovered_widget is not None:
+        hovered_widget.is_hovered = False
+    if widget is not None:
+        widget.is_hovered = True
+        # Likely the next category: start loading its artwork now
+        if widget in category_buttons:
+            prefetch_category(widget.text)
+    hovered_widget = widget
+
+# Act on a click on widget
+def click_widget(widget):
+    global show_instructions, audio_enabled, show_definition
+    if widget is start_button:
+        start_new_game()
+    elif widget is instruction_button:
+        show_instructions = True
+    elif widget is back_button:
+        show_instructions = False
+    elif widget is audio_button:
+        audio_enabled = audio_button.state
+        if not audio_enabled and speech is not None:
+            speech.stop()
+    elif widget is definition_button:
+        show_definition = definition_button.state
+    elif widget is difficulty_button:
+        difficulty_button.text = f"Diff: {session.cycle_difficulty()}"
+    elif widget is typing_button:
+        session.typing = typing_button.state
+        answer_box.text = ""
+        update_suggestions()
+    elif widget is prev_page_button or widget is next_page_button:
+        turn_category_page(-1 if widget is prev_page_button else 1)
+    elif widget in suggestion_buttons:
+        # A suggestion fills in the answer; Enter still submits it
+        answer_box.text = widget.text
+        update_suggestions()
+    elif widget in option_buttons:
+        session.check_answer(widget.text)
+    elif widget in category_buttons:
+        prefetch_category(widget.text)
+        session.set_category(widget.text)
+
+# Work out which parts of the screen changed since the last frame
+def collect_dirty_regions():
+    # Anything that changes the layout of the screen gets a full redraw
+    scene = (show_instructions, session.active, session.current_word, session.category,
+             show_definition, session.high_score, id(option_buttons), session.typing, category_pages.page)
+    if dirty_regions.changed("scene", scene):
+        dirty_regions.invalidate()
+    
+    widgets = visible_widgets()
+    for widget in widgets:
+        dirty_regions.add(widget.dirty_rect())
+    
+    # Particles move every frame: repaint where they were and where they are
+    rect = particles.bounds()
+    previous = dirty_regions.values.get("particles")
+    dirty_regions.add(previous)
+    dirty_regions.add(rect)
+    dirty_regions.values["particles"] = rect
+    
+    if profiler_overlay is not None and profiler_overlay.visible:
+        dirty_regions.add(profiler_overlay.rect)
+    
+    shapes = [widget.rect for widget in widgets]
+    if session.active and not show_instructions:
+        dirty_regions.watch("timer", (session.timer_active, session.time_left), timer_rect())
+        dirty_regions.watch("progress", session.attempts, progress_rect())
+        dirty_regions.watch("score", (session.score, session.attempts, session.streak),
+                            pygame.Rect(WIDTH - 200, 50, 200, 80))
+        dirty_regions.watch("feedback", (session.feedback, session.feedback_visible()),
+                            pygame.Rect(0, 500, WIDTH, normal_font.get_linesize()))
+        if session.typing:
+            dirty_regions.watch("suggestions", [button.text for button in suggestion_buttons], suggestions_rect())
+        shapes.extend([timer_rect(), progress_rect()])
+    
+    dirty_regions.cover(shapes)
+
+# Static part of the game screen: the word's image and its definition
+def draw_question(surface):
+    current_word = session.current_word
+    
+    # Draw the current word's image with a border
+    image_rect = word_image_rect()
+    pygame.draw.rect(surface, (100, 100, 100), image_rect, 2)
+    
+    image = word_image(current_word)
+    if image is not None:
+        surface.blit(image, (WIDTH // 2 - 75, 270))
+    else:
+        # Fallback if image didn't load
+        placeholder = pygame.Surface((150, 150))
+        placeholder.fill((200, 200, 200))
+        surface.blit(placeholder, (WIDTH // 2 - 75, 270))
+        
+        # Add text to the placeholder
+        text = render_text(normal_font, current_word, (0, 0, 0))
+        text_rect = text.get_rect(center=(WIDTH // 2, 270 + 75))
+        surface.blit(text, text_rect)
+    
+    # Draw word definition if enabled
+    definition = session.definition()
+    if show_definition and definition:
+        block = definition_cache.get(definition, instruction_font, DEFINITION_WIDTH)
+        surface.blit(block, (WIDTH // 2 - block.get_width() // 2, 270 + 170))
+
+# Static part of the menu: title, chosen category, high score, last result
+def draw_menu(surface):
+    # Draw title
+    title_text = render_text(title_font, "Fun English Learning", TEXT_COLOR)
+    surface.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 50))
+    
+    if paged():
+        page_text = render_text(instruction_font, f"Page {category_pages.page + 1} of {category_pages.page_count()}",
+                                INSTRUCTION_COLOR)
+        surface.blit(page_text, (WIDTH // 2 - page_text.get_width() // 2, 118))
+    
+    # Draw current category
+    category_text = render_text(normal_font, f"Category: {session.category}", TEXT_COLOR)
+    surface.blit(category_text, (WIDTH // 2 - category_text.get_width() // 2, 230))
+    
+    # Draw high score
+    high_score_text = render_text(normal_font, f"High Score: {session.high_score}", TEXT_COLOR)
+    surface.blit(high_score_text, (WIDTH // 2 - high_score_text.get_width() // 2, HEIGHT // 2 - 100))
+    
+    # Draw final score if game was just completed
+    if session.feedback:
+        final_score = render_text(normal_font, session.feedback, TEXT_COLOR)
+        surface.blit(final_score, (WIDTH // 2 - final_score.get_width() // 2, HEIGHT // 2 - 50))
+
+# The current screen's static layer: (name, key, draw). The key holds
+# everything the static content depends on.
+def static_layer():
+    if show_instructions:
+        return "instructions", None, draw_instructions
+    if session.active:
+        key = (session.category, session.current_word, word_image(session.current_word), show_definition)
+        return "game", key, draw_question
+    return "menu", (session.category, session.high_score, session.feedback, category_pages.page), draw_menu
+
+# Function to draw the whole frame: the cached static layer, then the
+# widgets and text that change from frame to frame
+def draw_scene():
+    name, key, draw_static = static_layer()
+    if len(particles):
+        # Particles sit between the background and the static content
+        screen.fill(BACKGROUND)
+        particles.draw(screen)
+        draw_static(screen)
+    else:
+        screen.blit(scene_layers.get(name, key, draw_static), (0, 0))
+    
+    if show_instructions:
+        back_button.draw(screen)
+    elif session.active:
+        # Draw option buttons, or the answer field and suggestions when typing
+        if session.typing:
+            answer_box.draw(screen)
+            for button in suggestion_buttons:
+                button.draw(screen)
+        else:
+            for button in option_buttons:
+                button.draw(screen)
+        
+        # Draw score and streak
+        score_text = render_text(normal_font, f"Score: {session.score}/{session.attempts}", TEXT_COLOR)
+        screen.blit(score_text, (WIDTH - 200, 50))
+        
+        if session.streak > 1:
+            streak_text = render_text(normal_font, f"Streak: {session.streak}!", (255, 100, 100))
+            screen.blit(streak_text, (WIDTH - 200, 90))
+        
+        # Draw feedback if any
+        if session.feedback_visible():
+            feedback_surf = render_text(normal_font, session.feedback, TEXT_COLOR)
+            screen.blit(feedback_surf, (WIDTH // 2 - feedback_surf.get_width() // 2, 500))
+        
+        # Draw progress bar
+        draw_progress_bar()
+        
+        # Draw timer
+        draw_timer()
+    else:
+        # Draw category buttons
+        for button in category_buttons:
+            button.draw(screen)
+        if paged():
+            prev_page_button.draw(screen)
+            next_page_button.draw(screen)
+        
+        # Draw start button
+        start_button.draw(screen)
+        instruction_button.draw(screen)
+    
+    # Draw audio button and definition button
+    audio_button.draw(screen)
+    definition_button.draw(screen)
+    difficulty_button.draw(screen)
+    typing_button.draw(screen)
+
+# Draw the frame plus any debug overlay on top
+def draw_frame():
+    draw_scene()
+    if profiler_overlay is not None:
+        profiler_overlay.draw(screen)
+
+# Main game loop. fps=0 runs uncapped; frame_hook(frame) is called at the start
+# of every frame (benchmarks use it to post scripted input) and stops the loop
+# by returning False. fixed_dt steps the game by a constant instead of the
+# measured frame time, and idle=False keeps drawing frames while nothing moves.
+async def main(fps=60, frame_hook=None, fixed_dt=None, idle=IDLE_MODE,
+               record=RECORD_PATH, replay=REPLAY_PATH, replay_realtime=REPLAY_REALTIME):
+    global show_instructions, audio_enabled, show_definition, first_frame_time
+    
+    if screen is None:
+        init_display()
+    if session is None:
+        init_game()
+    if os.environ.get("ENGLISH_GAME_PROFILE") == "1":
+        toggle_profiler_overlay()
+    pending_steps = startup_steps()
     
     clock = pygame.time.Clock()
+    game_clock = GameClock(fixed_dt=fixed_dt)
+    woken = []
     running = True
+    frame = 0
+    mouse_pos = pygame.mouse.get_pos()
+    
+    recorder = replayer = None
+    if record or replay:
+        recorder, replayer, mouse_pos = start_record_replay(record, replay, mouse_pos)
+    if replayer is not None:
+        # Replays don't touch the answer log, and never wait for input
+        pending_steps.remove(init_progress)
+        idle = False
+        replay_started = time.perf_counter()
     
     while running:
-        current_time = pygame.time.get_ticks()
-        mouse_pos = pygame.mouse.get_pos()
-        
-        # Update timer if active
-        if timer_active and game_active:
-            time_left -= 1/60
-            if time_left <= 0:
-                time_left = 0
-                # Time's up - count as wrong answer
-                if game_active and attempts < max_attempts:
-                    streak = 0
-                    feedback = f"Time's up! It's {current_word}"
-                    feedback_time = pygame.time.get_ticks()
-                    attempts += 1
-                    pygame.time.set_timer(pygame.USEREVENT, 1500)
+        if frame_hook is not None and frame_hook(frame) is False:
+            break
+        frame += 1
+        profiler.begin_frame()
+        
+        # Advance the game (question timer, delay before the next word) by the
+        # time the last frame took, or by the recorded time when replaying
+        if replayer is not None:
+            replayed = replayer.frame(frame - 1)
+            if replayed is None:
+                break
+            dt, replayed_events = replayed
+        else:
+            dt = game_clock.tick()
+            if recorder is not None:
+                dt = recorder.step(dt)
+        session.tick(dt)
+        apply_session_events()
         
         # Update particles
-        particles = [p for p in particles if p.update()]
+        particles.update(dt)
         
-        for event in pygame.event.get():
+        # Idle work once the first frame is up: finish starting up one step
+        # per frame, then pre-render one queued definition per frame. Queued
+        # definitions don't keep frames coming; they wait for ones that run.
+        if pending_steps and frame > 1:
+            pending_steps.pop(0)()
+        elif definition_cache.pending:
+            definition_cache.step(1)
+        if bundle_loader is not None and frame > 1:
+            load_bundle_step()
+        
+        # Take in finished image loads; repaint the word image if its artwork arrived
+        if image_cache is not None and (session.category, session.current_word) in image_cache.poll():
+            dirty_regions.add(word_image_rect())
+        # Keep the next block of speech queued
+        if speech is not None:
+            speech.update()
+        profiler.mark("update")
+        
+        events = woken + pygame.event.get()
+        woken = []
+        if replayer is not None:
+            # Only closing the window still works while replaying
+            events = replayed_events + [event for event in events if event.type == pygame.QUIT]
+        elif recorder is not None:
+            recorder.input(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
                 
-            if event.type == pygame.USEREVENT:
-                pygame.time.set_timer(pygame.USEREVENT, 0)
-                if attempts < max_attempts:
-                    next_word()
-                else:
-                    game_active = False
-                    feedback = f"Game Over! Score: {score}/{max_attempts}"
-                
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                if not game_active and not show_instructions and start_button.is_clicked(mouse_pos, event):
-                    start_new_game()
-                
-                if not game_active and not show_instructions and instruction_button.is_clicked(mouse_pos, event):
-                    show_instructions = True
-                    
-                if show_instructions and back_button.is_clicked(mouse_pos, event):
-                    show_instructions = False
-                
-                if audio_button.is_clicked(mouse_pos, event):
-                    audio_enabled = audio_button.state
+            if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN):
+                mouse_pos = event.pos
                 
-                if definition_button.is_clicked(mouse_pos, event):
-                    show_definition = definition_button.state
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                toggle_profiler_overlay()
                 
-                if difficulty_button.is_clicked(mouse_pos, event):
-                    difficulties = ["Easy", "Normal", "Hard"]
-                    current_index = difficulties.index(difficulty)
-                    difficulty = difficulties[(current_index + 1) % len(difficulties)]
-                    difficulty_button.text = f"Diff: {difficulty}"
+            if event.type == pygame.KEYDOWN and session.active and session.typing and session.awaiting_answer:
+                if event.key == pygame.K_TAB and suggestion_buttons:
+                    answer_box.text = suggestion_buttons[0].text
+                elif answer_box.handle_key(event):
+                    session.check_answer(answer_box.text)
+                update_suggestions()
+                apply_session_events()
                 
-                if game_active:
-                    for button in option_buttons:
-                        if button.is_clicked(mouse_pos, event):
-                            check_answer(button.text)
+            # Page through the categories with the wheel or the arrow keys
+            if not session.active and not show_instructions:
+                if event.type == pygame.MOUSEWHEEL and event.y:
+                    turn_category_page(-1 if event.y > 0 else 1)
+                elif event.type == pygame.KEYDOWN and event.key in (pygame.K_PAGEUP, pygame.K_LEFT):
+                    turn_category_page(-1)
+                elif event.type == pygame.KEYDOWN and event.key in (pygame.K_PAGEDOWN, pygame.K_RIGHT):
+                    turn_category_page(1)
                 
-                for button in category_buttons:
-                    if button.is_clicked(mouse_pos, event):
-                        current_category = button.text
-                        if game_active:
-                            next_word()
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                # Only the widget under the click gets it
+                refresh_hit_grid()
+                widget = hit_grid.at(mouse_pos)
+                if widget is not None and widget.is_clicked(mouse_pos, event):
+                    click_widget(widget)
+                apply_session_events()
+        profiler.mark("events")
         
         # Update button hover states
-        if not game_active and not show_instructions:
-            start_button.check_hover(mouse_pos)
-            instruction_button.check_hover(mouse_pos)
-        
-        if show_instructions:
-            back_button.check_hover(mouse_pos)
-        
-        audio_button.check_hover(mouse_pos)
-        definition_button.check_hover(mouse_pos)
-        difficulty_button.check_hover(mouse_pos)
+        refresh_hit_grid()
+        update_hover(mouse_pos)
         
-        for button in category_buttons:
-            button.check_hover(mouse_pos)
-        
-        for button in option_buttons:
-            button.check_hover(mouse_pos)
+        profiler.mark("hover")
         
-        # Draw everything
-        screen.fill(BACKGROUND)
+        # Draw everything, or only the regions that changed in dirty-rect mode
+        if DIRTY_RECTS:
+            collect_dirty_regions()
+            rects = dirty_regions.redraw(screen, draw_frame)
+            profiler.mark("draw")
+            dirty_regions.push(rects)
+        else:
+            draw_frame()
+            profiler.mark("draw")
+            pygame.display.flip()
+        profiler.mark("flip")
         
-        # Draw particles
-        for particle in particles:
-            particle.draw(screen)
+        if first_frame_time is None:
+            first_frame_time = time.perf_counter() - IMPORT_STARTED
+            if first_frame_time > STARTUP_BUDGET:
+                print(f"First frame took {first_frame_time * 1000:.0f} ms (budget {STARTUP_BUDGET * 1000:.0f} ms)")
         
-        if show_instructions:
-            draw_instructions()
-        elif game_active:
-            # Draw the current word's image with a border
-            image_rect = pygame.Rect(WIDTH // 2 - 75, 270, 150, 150)
-            pygame.draw.rect(screen, (100, 100, 100), image_rect, 2)
-            
-            if current_word in word_images:
-                screen.blit(word_images[current_word], (WIDTH // 2 - 75, 270))
-            else:
-                # Fallback if image didn't load
-                placeholder = pygame.Surface((150, 150))
-                placeholder.fill((200, 200, 200))
-                screen.blit(placeholder, (WIDTH // 2 - 75, 270))
-                
-                # Add text to the placeholder
-                text = normal_font.render(current_word, True, (0, 0, 0))
-                text_rect = text.get_rect(center=(WIDTH // 2, 270 + 75))
-                screen.blit(text, text_rect)
-            
-            # Draw word definition if enabled
-            if show_definition and current_word in categories[current_category]["definitions"]:
-                definition = categories[current_category]["definitions"][current_word]
-                # Split definition into multiple lines if too long
-                words = definition.split()
-                lines = []
-                current_line = ""
-                
-                for word in words:
-                    test_line = current_line + word + " "
-                    if instruction_font.size(test_line)[0] < 600:
-                        current_line = test_line
-                    else:
-                        lines.append(current_line)
-                        current_line = word + " "
-                
-                if current_line:
-                    lines.append(current_line)
-                
-                for i, line in enumerate(lines):
-                    def_text = instruction_font.render(line, True, INSTRUCTION_COLOR)
-                    screen.blit(def_text, (WIDTH // 2 - def_text.get_width() // 2, 270 + 170 + i * 25))
-            
-            # Draw option buttons
-            for button in option_buttons:
-                button.draw(screen)
-            
-            # Draw score and streak
-            score_text = normal_font.render(f"Score: {score}/{attempts}", True, TEXT_COLOR)
-            screen.blit(score_text, (WIDTH - 200, 50))
-            
-            if streak > 1:
-                streak_text = normal_font.render(f"Streak: {streak}!", True, (255, 100, 100))
-                screen.blit(streak_text, (WIDTH - 200, 90))
-            
-            # Draw feedback if any
-            if feedback and current_time - feedback_time < 1000:
-                feedback_surf = normal_font.render(feedback, True, TEXT_COLOR)
-                screen.blit(feedback_surf, (WIDTH // 2 - feedback_surf.get_width() // 2, 500))
-            
-            # Draw progress bar
-            draw_progress_bar()
-            
-            # Draw timer
-            draw_timer()
+        if recorder is not None:
+            recorder.check(game_state())
+        if replayer is not None:
+            replayer.check(game_state())
+            if replay_realtime:
+                delay = replay_started + replayer.elapsed(frame) - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        # With nothing on screen changing, block until input (or the timeout)
+        elif idle and not pending_steps and not animating() and not pygame.event.peek():
+            event = pygame.event.wait(IDLE_TIMEOUT_MS)
+            if event.type != pygame.NOEVENT:
+                woken.append(event)
+            game_clock.resume()
         else:
-            # Draw title
-            title_text = title_font.render("Fun English Learning", True, TEXT_COLOR)
-            screen.blit(title_text, (WIDTH // 2 - title_text.get_width() // 2, 50))
-            
-            # Draw category buttons
-            for button in category_buttons:
-                button.draw(screen)
-            
-            # Draw current category
-            category_text = normal_font.render(f"Category: {current_category}", True, TEXT_COLOR)
-            screen.blit(category_text, (WIDTH // 2 - category_text.get_width() // 2, 230))
-            
-            # Draw high score
-            high_score_text = normal_font.render(f"High Score: {high_score}", True, TEXT_COLOR)
-            screen.blit(high_score_text, (WIDTH // 2 - high_score_text.get_width() // 2, HEIGHT // 2 - 100))
-            
-            # Draw start button
-            start_button.draw(screen)
-            instruction_button.draw(screen)
-            
-            # Draw final score if game was just completed
-            if feedback:
-                final_score = normal_font.render(feedback, True, TEXT_COLOR)
-                screen.blit(final_score, (WIDTH // 2 - final_score.get_width() // 2, HEIGHT // 2 - 50))
-        
-        # Draw audio button and definition button
-        audio_button.draw(screen)
-        definition_button.draw(screen)
-        difficulty_button.draw(screen)
-        
-        pygame.display.flip()
-        clock.tick(60)
+            clock.tick(fps)
         await asyncio.sleep(0)
+        profiler.mark("wait")
+        profiler.end_frame()
 
+    exit_code = 0
+    if recorder is not None:
+        recorder.save(game_state())
+        print(f"Recorded {len(recorder.steps)} frames to {record}")
+    if replayer is not None:
+        if replayer.finish(game_state()):
+            print(f"Replayed {len(replayer)} frames of {replay}: game state matches")
+        else:
+            frame_index, diff = replayer.mismatches[0]
+            print(f"Replay of {replay} diverged at frame {frame_index}: {diff}")
+            exit_code = 1
+    
+    save_progress()
+    if image_cache is not None:
+        image_cache.close()
+    if speech is not None:
+        speech.close()
+    if bundle is not None:
+        bundle.close()
+    if progress is not None:
+        progress.close()
+        if progress.error is not None:
+            print(f"Could not save answers: {progress.error}")
+    
+    if PROFILE_TRACE:
+        frames = profiler.dump(PROFILE_TRACE)
+        print(f"Wrote {frames} frames of profiling data to {PROFILE_TRACE}")
+    
     pygame.quit()
-    sys.exit()
+    sys.exit(exit_code)
 
 # Run the game
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+import time
+
+
+# Measures the real time between frames so timers and particles run at the
+# same speed whatever the frame rate. Steps are clamped so a stall (window
+# drag, slow disk, breakpoint) can't skip a whole question in one frame.
+# fixed_dt replaces the measurement for reproducible runs.
+class GameClock:
+    def __init__(self, max_dt=0.25, fixed_dt=None, now=time.perf_counter):
+        self.max_dt = max_dt
+        self.fixed_dt = fixed_dt
+        self.now = now
+        self.last = None
+        self.elapsed = 0.0
+
+    # Seconds since the previous call (0 on the first one)
+    def tick(self):
+        if self.fixed_dt is not None:
+            dt = self.fixed_dt
+        else:
+            now = self.now()
+            dt = 0.0 if self.last is None else min(now - self.last, self.max_dt)
+            self.last = now
+        self.elapsed += dt
+        return dt
+
+    # Start measuring again from now, e.g. after sleeping in idle mode
+    def resume(self):
+        if self.fixed_dt is None:
+            self.last = self.now()
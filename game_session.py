@@ -0,0 +1,213 @@
+import random
+import uuid
+
+from distractors import DistractorIndex
+from scheduler import RandomSelector
+from word_index import WordIndex
+
+DIFFICULTIES = ["Easy", "Normal", "Hard"]
+
+# Timings in seconds
+QUESTION_TIME = 10
+FEEDBACK_TIME = 1.0
+NEXT_WORD_DELAY = 1.5
+GAME_OVER_DELAY = 2.0
+
+
+# One quiz round's rules and state, with no pygame dependency.
+# Which word comes next is up to the selector (see scheduler.py); it is told
+# every answer so strategies like spaced repetition can adapt.
+# The UI (or a server, or a test) drives it with next_word/check_answer/tick
+# and reacts to the events it queues: ("question", word), ("correct", word),
+# ("wrong", word), ("timeout", word), ("answer", record) and ("game_over", score).
+# An answer record is a dict with the game id, category, word, difficulty,
+# whether it was correct and the response time, ready to be logged.
+# With typing on, answers are typed rather than picked from the options and
+# small spelling mistakes are forgiven (see word_index.py).
+class GameSession:
+    # distractor_indexes and word_indexes may be dicts shared between sessions
+    # over the same vocabulary (a classroom server) so each category's
+    # indexes are built once
+    def __init__(self, vocabulary, category=None, difficulty="Normal", max_attempts=10, rng=None, selector=None,
+                 distractor_indexes=None, word_indexes=None):
+        self.vocabulary = vocabulary
+        self.selector = selector if selector is not None else RandomSelector()
+        self.category = category if category is not None else vocabulary.categories()[0]
+        self.difficulty = difficulty
+        self.max_attempts = max_attempts
+        self.rng = rng if rng is not None else random.Random()
+        self.typing = False
+
+        self.clock = 0.0
+        self.active = False
+        self.current_word = ""
+        self.options = []
+        self.score = 0
+        self.attempts = 0
+        self.streak = 0
+        self.high_score = 0
+        self.game_id = None
+        self.feedback = ""
+        self.feedback_time = 0.0
+        self.timer_active = False
+        self.time_left = 0
+        self.awaiting_answer = False
+        self.asked_at = 0.0
+        self.advance_at = None
+        self.events = []
+        self.distractor_indexes = distractor_indexes if distractor_indexes is not None else {}
+        self.word_indexes = word_indexes if word_indexes is not None else {}
+
+    def words(self):
+        return self.vocabulary.words(self.category)
+
+    # Built the first time a category is played, then reused
+    def distractors(self):
+        index = self.distractor_indexes.get(self.category)
+        if index is None:
+            index = self.distractor_indexes[self.category] = DistractorIndex(self.words())
+        return index
+
+    def word_index(self):
+        index = self.word_indexes.get(self.category)
+        if index is None:
+            index = self.word_indexes[self.category] = WordIndex(self.words())
+        return index
+
+    # Words to offer for a partly typed answer
+    def suggest(self, text):
+        return self.word_index().suggest(text)
+
+    def definition(self, word=None):
+        word = self.current_word if word is None else word
+        return self.vocabulary.definition(self.category, word)
+
+    def start(self):
+        self.active = True
+        self.game_id = uuid.uuid4().hex
+        self.score = 0
+        self.attempts = 0
+        self.streak = 0
+        self.feedback = ""
+        self.advance_at = None
+        self.timer_active = self.difficulty == "Hard"
+        self.next_word()
+
+    def next_word(self):
+        words = self.words()
+        self.current_word = self.selector.next_word(self.category, words, self.rng)
+
+        # Create options (correct answer + 3 wrong answers; similar-looking
+        # words on Hard)
+        index = self.distractors()
+        if self.difficulty == "Hard":
+            wrong = index.sample_hard(self.current_word, 3, self.rng)
+        else:
+            wrong = index.sample(self.current_word, 3, self.rng)
+        options = [self.current_word] + wrong
+        self.rng.shuffle(options)
+        self.options = options
+
+        # Set timer for hard difficulty
+        if self.timer_active:
+            self.time_left = QUESTION_TIME
+
+        self.awaiting_answer = True
+        self.asked_at = self.clock
+        self.advance_at = None
+        self.events.append(("question", self.current_word))
+
+    # Returns True for a correct answer; answers outside a question are ignored
+    def check_answer(self, selected_word):
+        if not self.active or not self.awaiting_answer:
+            return False
+
+        self.attempts += 1
+        correct = selected_word == self.current_word
+        close = False
+        if self.typing and not correct and isinstance(selected_word, str):
+            # Case and spacing don't matter; a near miss still counts
+            distance = self.word_index().accepts(self.current_word, selected_word)
+            correct = distance is not None
+            close = bool(distance)
+        self.selector.record(self.category, self.current_word, correct, self.clock - self.asked_at)
+        self.log_answer(correct)
+        if correct:
+            self.score += 1
+            self.streak += 1
+            self.feedback = f"Almost! It's spelled {self.current_word}" if close else "Correct! Good job!"
+            self.events.append(("correct", self.current_word))
+        else:
+            self.streak = 0
+            self.feedback = f"Oops! It's {self.current_word}"
+            self.events.append(("wrong", self.current_word))
+        self.finish_question()
+        return correct
+
+    def log_answer(self, correct):
+        self.events.append(("answer", {
+            "game_id": self.game_id,
+            "category": self.category,
+            "word": self.current_word,
+            "difficulty": self.difficulty,
+            "correct": correct,
+            "response_time": self.clock - self.asked_at,
+        }))
+
+    # Show feedback for a while, then move on to the next word or end the game
+    def finish_question(self):
+        self.awaiting_answer = False
+        self.feedback_time = self.clock
+        delay = NEXT_WORD_DELAY if self.attempts < self.max_attempts else GAME_OVER_DELAY
+        self.advance_at = self.clock + delay
+
+    def set_category(self, category):
+        self.category = category
+        if self.active:
+            self.next_word()
+
+    def cycle_difficulty(self):
+        index = DIFFICULTIES.index(self.difficulty)
+        self.difficulty = DIFFICULTIES[(index + 1) % len(DIFFICULTIES)]
+        return self.difficulty
+
+    def feedback_visible(self):
+        return bool(self.feedback) and self.clock - self.feedback_time < FEEDBACK_TIME
+
+    # True while time matters: a countdown, visible feedback or a pending next word
+    def busy(self):
+        return ((self.active and self.timer_active and self.awaiting_answer)
+                or self.advance_at is not None or self.feedback_visible())
+
+    # Advance the session by dt seconds
+    def tick(self, dt):
+        self.clock += dt
+
+        # Count down while a hard-mode question is open
+        if self.active and self.timer_active and self.awaiting_answer:
+            self.time_left = max(0, self.time_left - dt)
+            if self.time_left <= 0:
+                # Time's up - count as wrong answer
+                self.attempts += 1
+                self.streak = 0
+                self.feedback = f"Time's up! It's {self.current_word}"
+                # No response time: the scheduler rates a timeout below a wrong answer
+                self.selector.record(self.category, self.current_word, False)
+                self.log_answer(False)
+                self.events.append(("timeout", self.current_word))
+                self.finish_question()
+
+        if self.advance_at is not None and self.clock >= self.advance_at:
+            self.advance_at = None
+            if self.attempts < self.max_attempts:
+                self.next_word()
+            else:
+                self.active = False
+                self.high_score = max(self.high_score, self.score)
+                self.feedback = f"Game Over! Score: {self.score}/{self.max_attempts}"
+                self.events.append(("game_over", self.score))
+
+    def drain_events(self):
+        events = self.events
+        self.events = []
+        return events
@@ -0,0 +1,31 @@
+# Screen widgets bucketed by the grid cells their rects overlap, so finding
+# the one under a point checks the few rects in one cell instead of every
+# widget. update() is called with the widgets on screen and re-buckets only
+# when that list changed.
+class HitGrid:
+    def __init__(self, cell_size=100):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.ids = None
+
+    def update(self, widgets):
+        ids = [id(widget) for widget in widgets]
+        if ids == self.ids:
+            return False
+        self.ids = ids
+        self.cells = {}
+        size = self.cell_size
+        for widget in widgets:
+            rect = widget.rect
+            for x in range(rect.left // size, (rect.right - 1) // size + 1):
+                for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    self.cells.setdefault((x, y), []).append(widget)
+        return True
+
+    # The widget at pos; where widgets overlap, the one listed last (drawn on top)
+    def at(self, pos):
+        size = self.cell_size
+        for widget in reversed(self.cells.get((pos[0] // size, pos[1] // size), ())):
+            if widget.rect.collidepoint(pos):
+                return widget
+        return None
@@ -0,0 +1,148 @@
+import numpy as np
+import pygame
+
+
+# Particles stored as parallel NumPy arrays with a fixed capacity. Live
+# particles are packed at the front; update and culling are whole-array
+# passes and drawing is one Surface.blits call over pre-rendered sprites.
+# Every pass writes into preallocated scratch arrays, so steady frames
+# allocate no new arrays.
+class ParticleSystem:
+    MAX_RADIUS = 6
+    SHRINK = 0.1
+    # Velocities, life and shrink are per frame at this rate
+    FRAME_RATE = 60
+
+    def __init__(self, capacity=4096, palette_size=64, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.size = np.zeros(capacity, dtype=np.float64)
+        self.life = np.zeros(capacity, dtype=np.float64)
+        self.color = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Scratch space for update, bounds and draw
+        self.scratch = np.zeros(capacity, dtype=np.float64)
+        self.scratch_int = np.zeros(capacity, dtype=np.int32)
+        self.left = np.zeros(capacity, dtype=np.int32)
+        self.top = np.zeros(capacity, dtype=np.int32)
+        self.radius = np.zeros(capacity, dtype=np.int32)
+
+        # Bright random colors, like the per-particle colors they replace
+        self.palette = [tuple(int(c) for c in rgb) for rgb in self.rng.integers(100, 256, size=(palette_size, 3))]
+        self.sprites = None
+
+    # Sprites need pygame to be initialized, so they are built on first use
+    def prepare(self):
+        if self.sprites is None:
+            self.sprites = self.build_sprites()
+
+    # One colorkeyed circle per (palette color, radius); radius 0 draws nothing
+    def build_sprites(self):
+        sprites = []
+        for color in self.palette:
+            sprites.append(None)
+            for radius in range(1, self.MAX_RADIUS + 1):
+                sprite = pygame.Surface((2 * radius, 2 * radius))
+                sprite.fill((0, 0, 0))
+                sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+                pygame.draw.circle(sprite, color, (radius, radius), radius)
+                sprites.append(sprite)
+        return sprites
+
+    def reseed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.count
+
+    # Add up to count particles at (x, y); extra ones beyond capacity are dropped
+    def emit(self, x, y, count):
+        start = self.count
+        end = min(self.capacity, start + count)
+        n = end - start
+        if n <= 0:
+            return 0
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = self.rng.uniform(-3, 3, n)
+        self.vy[start:end] = self.rng.uniform(-3, 3, n)
+        self.size[start:end] = self.rng.integers(2, 7, n)
+        self.life[start:end] = self.rng.integers(20, 41, n)
+        self.color[start:end] = self.rng.integers(0, len(self.palette), n)
+        self.count = end
+        return n
+
+    # Advance by dt seconds and drop particles whose life ran out
+    def update(self, dt=1 / 60):
+        n = self.count
+        if n == 0:
+            return
+        steps = dt * self.FRAME_RATE
+        x, y, size, life = self.x[:n], self.y[:n], self.size[:n], self.life[:n]
+        delta = self.scratch[:n]
+        np.multiply(self.vx[:n], steps, out=delta)
+        x += delta
+        np.multiply(self.vy[:n], steps, out=delta)
+        y += delta
+        life -= steps
+        size -= self.SHRINK * steps
+        np.maximum(size, 0, out=size)
+
+        alive = self.alive[:n]
+        np.greater(life, 0, out=alive)
+        k = int(np.count_nonzero(alive))
+        if k == n:
+            return
+        # Compact the survivors to the front through the scratch arrays; only
+        # happens on frames where some die
+        for array in (self.x, self.y, self.vx, self.vy, self.size, self.life, self.color):
+            scratch = self.scratch if array.dtype == self.scratch.dtype else self.scratch_int
+            np.compress(alive, array[:n], out=scratch[:k])
+            array[:k] = scratch[:k]
+        self.count = k
+
+    def clear(self):
+        self.count = 0
+
+    # Screen area the live particles are drawn in, or None when there are none
+    def bounds(self):
+        n = self.count
+        if n == 0:
+            return None
+        r = self.radii(n)
+        edge = self.scratch_int[:n]
+        np.copyto(edge, self.x[:n], casting="unsafe")
+        left = int(np.subtract(edge, r, out=self.left[:n]).min())
+        right = int(np.add(edge, r, out=self.left[:n]).max())
+        np.copyto(edge, self.y[:n], casting="unsafe")
+        top = int(np.subtract(edge, r, out=self.top[:n]).min())
+        bottom = int(np.add(edge, r, out=self.top[:n]).max())
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    # Whole-pixel radii of the first n particles (truncated like int())
+    def radii(self, n):
+        radius = self.radius[:n]
+        np.copyto(radius, self.size[:n], casting="unsafe")
+        return radius
+
+    def draw(self, surface):
+        n = self.count
+        if n == 0:
+            return
+        radius = self.radii(n)
+        left, top, index = self.left[:n], self.top[:n], self.scratch_int[:n]
+        np.copyto(left, self.x[:n], casting="unsafe")
+        left -= radius
+        np.copyto(top, self.y[:n], casting="unsafe")
+        top -= radius
+        np.multiply(self.color[:n], self.MAX_RADIUS + 1, out=index)
+        index += radius
+        self.prepare()
+        sprites = self.sprites
+        surface.blits(((sprites[i], (lx, ty)) for i, lx, ty in zip(index, left, top) if sprites[i] is not None), False)
@@ -0,0 +1,144 @@
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+PHASES = ("events", "update", "hover", "draw", "flip", "wait")
+PHASE_COLORS = [(90, 160, 255), (120, 220, 120), (255, 200, 80), (230, 110, 200), (255, 120, 120), (170, 170, 170)]
+
+
+def _noop(phase):
+    pass
+
+
+# Per-phase frame timer. While disabled, mark() is a no-op function and
+# begin_frame/end_frame return immediately, so instrumentation in the main
+# loop costs a few attribute lookups per frame.
+class FrameProfiler:
+    def __init__(self, history=240, enabled=False, record=False):
+        self.history = history
+        self.times = np.zeros((history, len(PHASES)), dtype=np.float64)
+        self.index = 0
+        self.frames = 0
+        self.current = [0.0] * len(PHASES)
+        self.phase_index = {name: i for i, name in enumerate(PHASES)}
+        self.last = 0.0
+        self.record = record
+        self.trace = []
+        self.enabled = False
+        self.mark = _noop
+        self.set_enabled(enabled or record)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.mark = self._mark if enabled else _noop
+
+    def begin_frame(self):
+        if self.enabled:
+            self.current = [0.0] * len(PHASES)
+            self.last = time.perf_counter()
+
+    # Charge the time since the previous mark to phase
+    def _mark(self, phase):
+        now = time.perf_counter()
+        self.current[self.phase_index[phase]] += now - self.last
+        self.last = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        self.times[self.index] = self.current
+        self.index = (self.index + 1) % self.history
+        self.frames += 1
+        if self.record:
+            self.trace.append(self.current)
+
+    # Rolling history in milliseconds, oldest frame first
+    def recent_ms(self):
+        count = min(self.frames, self.history)
+        rows = np.roll(self.times, -self.index, axis=0)[self.history - count:]
+        return rows * 1000.0
+
+    def averages_ms(self):
+        rows = self.recent_ms()
+        if len(rows) == 0:
+            return dict.fromkeys(PHASES, 0.0)
+        return dict(zip(PHASES, rows.mean(axis=0).tolist()))
+
+    # Write the recorded frames as CSV or JSON, picked by file extension
+    def dump(self, path):
+        rows = [[round(t * 1000.0, 4) for t in frame] for frame in self.trace]
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"phases": list(PHASES), "unit": "ms", "frames": rows}, f)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + list(PHASES))
+                for i, row in enumerate(rows):
+                    writer.writerow([i] + row)
+        return len(rows)
+
+
+# Stacked per-phase frame-time graph with the rolling averages beside it
+class ProfilerOverlay:
+    GRAPH_HEIGHT = 80
+    BUDGET_MS = 1000 / 60
+
+    def __init__(self, profiler, font, topleft=(10, 460)):
+        self.profiler = profiler
+        self.font = font
+        self.visible = False
+        width = profiler.history + 150
+        self.rect = pygame.Rect(topleft, (width, self.GRAPH_HEIGHT + 20))
+        self.graph = pygame.Surface((profiler.history, self.GRAPH_HEIGHT))
+        self.labels = []
+        self.colors = np.array(PHASE_COLORS, dtype=np.uint8)
+        self.rows = np.arange(self.GRAPH_HEIGHT)[np.newaxis, :]
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.profiler.set_enabled(self.visible or self.profiler.record)
+        return self.visible
+
+    def render_graph(self):
+        ms = self.profiler.recent_ms()
+        pixels = np.full((self.profiler.history, self.GRAPH_HEIGHT, 3), 30, dtype=np.uint8)
+        if len(ms):
+            scale = self.GRAPH_HEIGHT / (2 * self.BUDGET_MS)
+            tops = np.cumsum(ms, axis=1) * scale
+            bottoms = tops - ms * scale
+            columns = pixels[self.profiler.history - len(ms):]
+            # Rows counted from the bottom of the graph
+            height = self.GRAPH_HEIGHT - 1 - self.rows
+            for phase in range(len(PHASES)):
+                mask = (height >= bottoms[:, phase:phase + 1]) & (height < tops[:, phase:phase + 1])
+                columns[mask] = self.colors[phase]
+            # 60 FPS budget line
+            budget_row = self.GRAPH_HEIGHT - 1 - int(self.BUDGET_MS * scale)
+            pixels[:, budget_row] = (255, 255, 255)
+        pygame.surfarray.blit_array(self.graph, pixels)
+
+    def render_labels(self):
+        averages = self.profiler.averages_ms()
+        self.labels = [
+            self.font.render(f"{name} {averages[name]:.2f} ms", True, color)
+            for name, color in zip(PHASES, PHASE_COLORS)
+        ]
+        total = sum(averages.values())
+        self.labels.append(self.font.render(f"frame {total:.2f} ms", True, (255, 255, 255)))
+
+    def draw(self, surface):
+        if not self.visible:
+            return
+        self.render_graph()
+        # Text changes every frame; refreshing it twice a second keeps it readable
+        if not self.labels or self.profiler.frames % 30 == 0:
+            self.render_labels()
+        pygame.draw.rect(surface, (20, 20, 20), self.rect)
+        surface.blit(self.graph, (self.rect.x + 5, self.rect.y + 10))
+        line_height = self.rect.height // len(self.labels)
+        for i, label in enumerate(self.labels):
+            surface.blit(label, (self.rect.x + self.profiler.history + 12, self.rect.y + 2 + i * line_height))
@@ -0,0 +1,193 @@
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_DB_PATH = os.path.join(
+    os.environ.get("ENGLISH_GAME_DATA", os.path.join(os.path.expanduser("~"), ".local", "share", "english_game")),
+    "progress.sqlite3",
+)
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    at REAL NOT NULL,
+    game_id TEXT,
+    category TEXT NOT NULL,
+    word TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    response_time REAL
+);
+CREATE TABLE IF NOT EXISTS games (
+    id TEXT PRIMARY KEY,
+    finished_at REAL NOT NULL,
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    max_attempts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS answers_by_word ON answers (category, word, correct);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (score);
+CREATE INDEX IF NOT EXISTS games_by_category ON games (category, difficulty, score);
+"""
+
+# Marks the end of the write queue
+STOP = object()
+
+
+# Answers and finished games in a local SQLite database (WAL mode).
+# record_* calls only queue a row; a writer thread commits whatever has
+# queued up in one transaction, so the game loop never waits on the disk.
+# Queries run on the calling thread through a separate connection; WAL lets
+# them read while the writer commits. Without threads (pygbag) rows are
+# written straight away instead. call() queues other slow writes (analytics
+# chunks) behind the rows.
+class ProgressStore:
+    MAX_BATCH = 500
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.queue = queue.Queue()
+        self.error = None
+        self.reader = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.writer = self.connect()
+        self.writer.executescript(SCHEMA)
+        self.writer.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.writer.commit()
+
+        self.thread = None
+        if sys.platform != "emscripten":
+            # The writer connection now belongs to the worker thread
+            self.thread = threading.Thread(target=self.run, name="progress-writer", daemon=True)
+            self.thread.start()
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    # answer is the dict from a session's ("answer", ...) event
+    def record_answer(self, answer, at=None):
+        self.put(("answer", (
+            time.time() if at is None else at, answer["game_id"], answer["category"], answer["word"],
+            answer["difficulty"], int(answer["correct"]), answer["response_time"],
+        )))
+
+    def record_game(self, session, at=None):
+        self.put(("game", (
+            session.game_id, time.time() if at is None else at, session.category, session.difficulty,
+            session.score, session.attempts, session.max_attempts,
+        )))
+
+    # Run func(*args) on the writer thread once the rows queued before it
+    # are committed
+    def call(self, func, *args):
+        self.put(("call", (func, args)))
+
+    def put(self, item):
+        if self.thread is None:
+            self.write([item])
+        else:
+            self.queue.put(item)
+
+    # Worker thread: block for the first row, then take everything else queued
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not STOP and len(batch) < self.MAX_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is STOP
+            if stop:
+                batch.pop()
+            if batch:
+                self.write(batch)
+            for _ in range(len(batch) + stop):
+                self.queue.task_done()
+            if stop:
+                self.writer.close()
+                return
+
+    def write(self, batch):
+        answers = [row for kind, row in batch if kind == "answer"]
+        games = [row for kind, row in batch if kind == "game"]
+        try:
+            with self.writer:
+                if answers:
+                    self.writer.executemany(
+                        "INSERT INTO answers (at, game_id, category, word, difficulty, correct, response_time)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)", answers)
+                if games:
+                    self.writer.executemany(
+                        "INSERT OR REPLACE INTO games (id, finished_at, category, difficulty, score, attempts, max_attempts)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?)", games)
+        except sqlite3.Error as e:
+            # Keep playing; the caller can check error when closing
+            if self.error is None:
+                self.error = e
+        for func, args in (row for kind, row in batch if kind == "call"):
+            # Whatever goes wrong, the thread has to keep draining the queue
+            # or flush() and close() would wait forever
+            try:
+                func(*args)
+            except Exception as e:
+                if self.error is None:
+                    self.error = e
+
+    # Wait until everything recorded so far is committed
+    def flush(self):
+        if self.thread is not None:
+            self.queue.join()
+
+    def close(self):
+        if self.thread is not None:
+            self.queue.put(STOP)
+            self.thread.join()
+            self.thread = None
+        else:
+            self.writer.close()
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def query(self, sql, params=()):
+        if self.reader is None:
+            self.reader = self.connect()
+        return self.reader.execute(sql, params).fetchall()
+
+    # (category, word, attempts, correct) rows, least accurate first
+    def word_accuracy(self, category=None, min_attempts=1):
+        sql = ("SELECT category, word, COUNT(*) AS n, SUM(correct) AS ok FROM answers"
+               + (" WHERE category = ?" if category is not None else "")
+               + " GROUP BY category, word HAVING n >= ?"
+               " ORDER BY CAST(ok AS REAL) / n, n DESC, category, word")
+        params = (category, min_attempts) if category is not None else (min_attempts,)
+        return self.query(sql, params)
+
+    # Best score overall, or for one category and/or difficulty; 0 if none
+    def best_score(self, category=None, difficulty=None):
+        where, params = [], []
+        if category is not None:
+            where.append("category = ?")
+            params.append(category)
+        if difficulty is not None:
+            where.append("difficulty = ?")
+            params.append(difficulty)
+        sql = "SELECT MAX(score) FROM games" + (" WHERE " + " AND ".join(where) if where else "")
+        return self.query(sql, params)[0][0] or 0
+
+    # (score, max_attempts, category, difficulty, finished_at) of the top games
+    def best_games(self, limit=10):
+        return self.query(
+            "SELECT score, max_attempts, category, difficulty, finished_at FROM games"
+            " ORDER BY score DESC, finished_at LIMIT ?", (limit,))
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+
+import pygame
+
+
+# Pre-rendered text surfaces keyed by (font, text, color), converted to the
+# display pixel format and evicted least-recently-used past max_entries
+class TextCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color):
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        # convert_alpha() needs a display mode; without one keep the raw surface
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def __len__(self):
+        return len(self.surfaces)
+
+
+# Word-wrapped definitions rendered once into a single surface, keyed by
+# (text, font, width): the same word can have different definitions in
+# different categories. Lines are centered within the block like the old
+# per-frame layout, so blitting at center_x - width // 2 matches it exactly.
+class DefinitionLayoutCache:
+    def __init__(self, color, line_height=25, max_entries=128):
+        self.color = color
+        self.line_height = line_height
+        self.max_entries = max_entries
+        self.blocks = OrderedDict()
+        self.pending = OrderedDict()
+
+    # Split text into lines narrower than width, measuring each candidate line
+    @staticmethod
+    def wrap(text, font, width):
+        lines = []
+        current_line = ""
+        for word in text.split():
+            test_line = current_line + word + " "
+            if font.size(test_line)[0] < width:
+                current_line = test_line
+            else:
+                lines.append(current_line)
+                current_line = word + " "
+        if current_line:
+            lines.append(current_line)
+        return lines
+
+    def render_block(self, text, font, width):
+        surfaces = [font.render(line, True, self.color) for line in self.wrap(text, font, width)]
+        block_width = max([width] + [surface.get_width() for surface in surfaces])
+        height = self.line_height * max(0, len(surfaces) - 1) + font.get_linesize()
+        block = pygame.Surface((block_width, height), pygame.SRCALPHA)
+        # Transparent pixels carry the text color so antialiased edges blend the same
+        block.fill((*self.color, 0))
+        for i, surface in enumerate(surfaces):
+            block.blit(surface, (block_width // 2 - surface.get_width() // 2, i * self.line_height))
+        if pygame.display.get_surface() is not None:
+            block = block.convert_alpha()
+        return block
+
+    def get(self, text, font, width):
+        key = (text, font, width)
+        block = self.blocks.get(key)
+        if block is not None:
+            self.blocks.move_to_end(key)
+            return block
+        block = self.render_block(text, font, width)
+        self.blocks[key] = block
+        if len(self.blocks) > self.max_entries:
+            self.blocks.popitem(last=False)
+        return block
+
+    # Replace the queue of definition texts to lay out later, a few at a
+    # time, via step(), most likely first. Repeats and texts already laid out
+    # are skipped, and only as many are queued as the cache holds so none is
+    # evicted before it can be shown.
+    def prewarm(self, texts, font, width):
+        self.pending = OrderedDict()
+        for text in texts:
+            if len(self.pending) >= self.max_entries:
+                break
+            key = (text, font, width)
+            if key not in self.blocks:
+                self.pending[key] = None
+
+    # Lay out up to count queued definitions; returns how many are still queued
+    def step(self, count=1):
+        for _ in range(min(count, len(self.pending))):
+            self.get(*self.pending.popitem(last=False)[0])
+        return len(self.pending)
+
+
+# Full-screen layers holding a screen's static content, one per screen name.
+# A layer is redrawn only when its key (whatever the content depends on)
+# changes, so steady frames start with a single opaque blit.
+class LayerCache:
+    def __init__(self, size, background):
+        self.size = size
+        self.background = background
+        self.layers = {}
+        self.builds = 0
+
+    def get(self, name, key, draw):
+        entry = self.layers.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        if entry is not None:
+            layer = entry[1]
+        else:
+            layer = pygame.Surface(self.size)
+            if pygame.display.get_surface() is not None:
+                layer = layer.convert()
+        layer.fill(self.background)
+        draw(layer)
+        self.layers[name] = (key, layer)
+        self.builds += 1
+        return layer
+
+    def clear(self):
+        self.layers.clear()
@@ -0,0 +1,136 @@
+import json
+import os
+
+import numpy as np
+import pygame
+
+FORMAT_VERSION = 1
+
+# Input events worth recording, by a stable name (pygame's numbers can change)
+EVENT_TYPES = {
+    "quit": pygame.QUIT,
+    "motion": pygame.MOUSEMOTION,
+    "down": pygame.MOUSEBUTTONDOWN,
+    "up": pygame.MOUSEBUTTONUP,
+    "key": pygame.KEYDOWN,
+    "wheel": pygame.MOUSEWHEEL,
+}
+EVENT_NAMES = {value: name for name, value in EVENT_TYPES.items()}
+EVENT_ATTRS = ("pos", "button", "key", "mod", "unicode", "x", "y")
+
+# Frame times are stored (and, while recording, played) in whole microseconds
+# so a replay steps the game by exactly the same floats
+TIME_UNIT = 1e-6
+
+
+def encode_event(event):
+    attrs = {}
+    for name in EVENT_ATTRS:
+        value = getattr(event, name, None)
+        if value is not None:
+            attrs[name] = list(value) if isinstance(value, tuple) else value
+    return [EVENT_NAMES[event.type], attrs]
+
+
+def decode_event(name, attrs):
+    attrs = {key: tuple(value) if isinstance(value, list) else value for key, value in attrs.items()}
+    if name == "motion":
+        attrs.setdefault("rel", (0, 0))
+        attrs.setdefault("buttons", (0, 0, 0))
+    return pygame.event.Event(EVENT_TYPES[name], **attrs)
+
+
+# Captures one run of main(): the seed and scheduler state it started from,
+# every frame's time step and the input events handled in each frame, plus
+# periodic snapshots of the game state to check a replay against. Saved as
+# a compressed .npz: frame times as an int32 array, the rest as JSON.
+class Recorder:
+    CHECKPOINT_EVERY = 60
+
+    def __init__(self, path, header):
+        self.path = path
+        self.header = dict(header, version=FORMAT_VERSION)
+        self.steps = []
+        self.events = []
+        self.checkpoints = []
+
+    # Start a frame; returns dt rounded the way a replay will see it
+    def step(self, dt):
+        step = round(dt / TIME_UNIT)
+        self.steps.append(step)
+        return step * TIME_UNIT
+
+    # The input events handled in the current frame
+    def input(self, events):
+        frame = len(self.steps) - 1
+        for event in events:
+            if event.type in EVENT_NAMES:
+                self.events.append([frame] + encode_event(event))
+
+    # Called at the end of every frame with the game state
+    def check(self, state):
+        frame = len(self.steps) - 1
+        if frame % self.CHECKPOINT_EVERY == 0:
+            self.checkpoints.append([frame, state])
+
+    def save(self, final_state):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        meta = dict(self.header, events=self.events, checkpoints=self.checkpoints, final=final_state)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, steps=np.array(self.steps, dtype=np.int32), meta=np.array(json.dumps(meta)))
+        os.replace(tmp_path, self.path)
+
+
+# Feeds a recording back in: frame(i) gives frame i's time step and events
+# (None after the last frame), and check/finish compare the game state with
+# what was recorded. Mismatches are collected, not raised, so a run reports
+# the first frame where it diverged.
+class Replay:
+    def __init__(self, path):
+        with np.load(path) as data:
+            self.steps = data["steps"]
+            meta = json.loads(str(data["meta"]))
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"{path}: unsupported recording version {meta.get('version')}")
+        self.header = meta
+        self.times = np.cumsum(self.steps, dtype=np.int64)
+        self.events = {}
+        for frame, name, attrs in meta["events"]:
+            self.events.setdefault(frame, []).append((name, attrs))
+        self.checkpoints = {frame: state for frame, state in meta["checkpoints"]}
+        self.final = meta["final"]
+        self.mismatches = []
+        self.position = -1
+
+    def __len__(self):
+        return len(self.steps)
+
+    def frame(self, index):
+        if index >= len(self.steps):
+            return None
+        self.position = index
+        events = [decode_event(name, attrs) for name, attrs in self.events.get(index, ())]
+        return int(self.steps[index]) * TIME_UNIT, events
+
+    # Seconds of recorded time from the start to the start of frame index
+    def elapsed(self, index):
+        index = min(index, len(self.times) - 1)
+        return int(self.times[index]) * TIME_UNIT if index >= 0 else 0.0
+
+    def check(self, state):
+        expected = self.checkpoints.get(self.position)
+        if expected is not None:
+            self.compare(self.position, expected, state)
+
+    def finish(self, state):
+        self.compare("end", self.final, state)
+        return not self.mismatches
+
+    def compare(self, frame, expected, state):
+        # JSON turns tuples into lists; compare in that form
+        state = json.loads(json.dumps(state))
+        if state != expected:
+            diff = {key: (expected.get(key), state.get(key)) for key in expected if expected.get(key) != state.get(key)}
+            self.mismatches.append((frame, diff))
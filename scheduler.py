@@ -0,0 +1,198 @@
+import heapq
+import itertools
+import json
+import os
+import time
+
+DEFAULT_STATE_PATH = os.path.join(
+    os.environ.get("ENGLISH_GAME_DATA", os.path.join(os.path.expanduser("~"), ".local", "share", "english_game")),
+    "scheduler.json",
+)
+
+
+# Default strategy: any word of the category, uniformly
+class RandomSelector:
+    def next_word(self, category, words, rng):
+        return rng.choice(words)
+
+    def record(self, category, word, correct, response_time=None):
+        pass
+
+    def save(self):
+        pass
+
+    def state(self):
+        return None
+
+    def load_state(self, data):
+        pass
+
+
+# Per-word review state (SM-2 style)
+class Card:
+    __slots__ = ("ease", "interval", "repetitions", "due", "version")
+
+    def __init__(self, ease=2.5, interval=0.0, repetitions=0, due=0.0):
+        self.ease = ease
+        self.interval = interval
+        self.repetitions = repetitions
+        self.due = due
+        self.version = 0
+
+
+# Spaced repetition: every word has a due time and an ease factor that
+# check_answer results move. Each category keeps a min-heap on due time, so
+# picking the next word is O(log n); stale heap entries are skipped lazily,
+# and dropped all at once when they outnumber the live ones (a classroom
+# server runs for days).
+# Intervals are in seconds, scaled down from SM-2's days to suit short games.
+class SpacedRepetitionScheduler:
+    FIRST_INTERVAL = 60.0
+    SECOND_INTERVAL = 6 * 60.0
+    RELEARN_DELAY = 20.0
+    FAST_ANSWER = 3.0
+
+    def __init__(self, path=DEFAULT_STATE_PATH, now=time.time):
+        self.path = path
+        self.now = now
+        self.cards = {}
+        self.heaps = {}
+        # Live entries (one per word) in each category's heap
+        self.live = {}
+        # Tie-breaks for re-pushed words; initial heaps use ranks below this
+        self.counter = itertools.count(1 << 32)
+        self.last_word = {}
+        self.load()
+
+    def load(self):
+        if not self.path:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.load_state(data)
+
+    def save(self):
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state(), f)
+        os.replace(tmp_path, self.path)
+
+    # The saved form of the cards (a recording embeds it to replay the same picks)
+    def state(self):
+        cards = {
+            f"{category}\t{word}": [card.ease, card.interval, card.repetitions, card.due]
+            for (category, word), card in self.cards.items()
+            if card.repetitions or card.due
+        }
+        return {"version": 1, "cards": cards}
+
+    def load_state(self, data):
+        self.cards = {}
+        self.heaps = {}
+        self.live = {}
+        self.last_word = {}
+        for key, (ease, interval, repetitions, due) in data.get("cards", {}).items():
+            category, _, word = key.partition("\t")
+            self.cards[category, word] = Card(ease, interval, repetitions, due)
+
+    # Heap of (due, tie-break, version, word), built the first time a category
+    # is played. Unseen words are due now in a random order.
+    def heap(self, category, words, rng):
+        heap = self.heaps.get(category)
+        if heap is None:
+            heap = []
+            ranks = list(range(len(words)))
+            rng.shuffle(ranks)
+            for word, rank in zip(words, ranks):
+                card = self.cards.get((category, word))
+                if card is None:
+                    card = self.cards[category, word] = Card()
+                heap.append((card.due, rank, card.version, word))
+            heapq.heapify(heap)
+            self.heaps[category] = heap
+            self.live[category] = len(heap)
+        return heap
+
+    def pop_valid(self, category, heap):
+        while heap:
+            due, _, version, word = heapq.heappop(heap)
+            if self.cards[category, word].version == version:
+                return due, word
+        return None
+
+    def push(self, category, word):
+        heap = self.heaps.get(category)
+        if heap is not None:
+            card = self.cards[category, word]
+            heapq.heappush(heap, (card.due, next(self.counter), card.version, word))
+            if len(heap) > 2 * self.live[category] + 16:
+                self.compact(category, heap)
+
+    # Drop the entries of rescheduled words, keeping each word's latest
+    def compact(self, category, heap):
+        heap[:] = [entry for entry in heap if self.cards[category, entry[3]].version == entry[2]]
+        heapq.heapify(heap)
+        self.live[category] = len(heap)
+
+    def next_word(self, category, words, rng):
+        heap = self.heap(category, words, rng)
+        first = self.pop_valid(category, heap)
+        if first is None:
+            return rng.choice(words)
+        due, word = first
+        # Don't ask the same word twice in a row if anything else is available
+        if word == self.last_word.get(category):
+            second = self.pop_valid(category, heap)
+            if second is not None:
+                self.push(category, word)
+                due, word = second
+        self.push(category, word)
+        self.last_word[category] = word
+        return word
+
+    # Answer quality on SM-2's 0-5 scale. A timeout (no response time) is a
+    # 0, SM-2's "complete blackout": the learner couldn't pick anything. A
+    # wrong pick is a 1, an incorrect response, and lowers the ease a little
+    # less.
+    def quality(self, correct, response_time):
+        if not correct:
+            return 0 if response_time is None else 1
+        if response_time is not None and response_time <= self.FAST_ANSWER:
+            return 5
+        return 4
+
+    def record(self, category, word, correct, response_time=None):
+        card = self.cards.get((category, word))
+        if card is None:
+            card = self.cards[category, word] = Card()
+        q = self.quality(correct, response_time)
+        if q >= 3:
+            card.repetitions += 1
+            if card.repetitions == 1:
+                card.interval = self.FIRST_INTERVAL
+            elif card.repetitions == 2:
+                card.interval = self.SECOND_INTERVAL
+            else:
+                card.interval *= card.ease
+            card.due = self.now() + card.interval
+        else:
+            card.repetitions = 0
+            card.interval = 0.0
+            card.due = self.now() + self.RELEARN_DELAY
+        card.ease = max(1.3, card.ease + 0.1 - (5 - q) * (0.08 + (5 - q) * 0.02))
+        card.version += 1
+        self.push(category, word)
+
+
+def make_selector(name, path=DEFAULT_STATE_PATH):
+    if name == "random":
+        return RandomSelector()
+    if name == "srs":
+        return SpacedRepetitionScheduler(path)
+    raise ValueError(f"Unknown word selector: {name}")
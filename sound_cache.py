@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import struct
+
+import numpy as np
+
+from sound_synth import SAMPLE_RATE, render, to_stereo
+
+# Bump when the file layout or the synthesis code changes output
+BANK_VERSION = 1
+MAGIC = b"EGSBANK1"
+HEADER = struct.Struct("<8sI")
+ALIGN = 16
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "ENGLISH_GAME_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "english_game"),
+)
+
+
+# Hash of everything the synthesized output depends on
+def bank_key(specs, sample_rate=SAMPLE_RATE):
+    payload = json.dumps(
+        {"version": BANK_VERSION, "sample_rate": sample_rate, "specs": specs},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def bank_path(key, cache_dir=DEFAULT_CACHE_DIR):
+    return os.path.join(cache_dir, f"sounds-{key[:16]}.bank")
+
+
+# Write every sound as contiguous stereo int16 after a JSON index
+def write_bank(path, key, specs):
+    buffers = {}
+    entries = {}
+    offset = 0
+    for name, spec in specs.items():
+        mono = render(spec)
+        buffers[name] = mono
+        entries[name] = [offset, len(mono)]
+        offset += len(mono)
+
+    index = {"key": key, "version": BANK_VERSION, "frames": offset, "entries": entries}
+    index = json.dumps(index).encode("utf-8")
+    index += b" " * (-(HEADER.size + len(index)) % ALIGN)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(index)))
+        f.write(index)
+        for mono in buffers.values():
+            f.write(np.ascontiguousarray(to_stereo(mono)).tobytes())
+    os.replace(tmp_path, path)
+
+
+# A bank file's JSON index and the offset of its samples, or (None, 0) if it
+# can't be read
+def read_index(path):
+    try:
+        with open(path, "rb") as f:
+            magic, index_size = HEADER.unpack(f.read(HEADER.size))
+            index = json.loads(f.read(index_size))
+    except (OSError, struct.error, ValueError):
+        return None, 0
+    if magic != MAGIC or not isinstance(index, dict):
+        return None, 0
+    return index, HEADER.size + index_size
+
+
+# Map a bank file and return {name: (samples, 2) int16 view}, or None if it
+# is missing, damaged or was built for different parameters
+def read_bank(path, key):
+    index, offset = read_index(path)
+    if index is None or index.get("key") != key:
+        return None
+
+    frames = index["frames"]
+    if os.path.getsize(path) != offset + frames * 4:
+        return None
+    if frames == 0:
+        return {}
+
+    data = np.memmap(path, dtype=np.int16, mode="r", offset=offset, shape=(frames, 2))
+    return {name: data[start:start + length] for name, (start, length) in index["entries"].items()}
+
+
+# Remove banks written by an older BANK_VERSION, which no game reads any more.
+# Banks of the current version stay even when they aren't this vocabulary's:
+# another checkout or word list may share the cache directory. (Banks from
+# before versions were recorded count as version 1.)
+def prune_banks(keep_path, cache_dir=DEFAULT_CACHE_DIR):
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(cache_dir, name)
+        if not (name.startswith("sounds-") and name.endswith(".bank")) or path == keep_path:
+            continue
+        index, _ = read_index(path)
+        if index is not None and index.get("version", 1) < BANK_VERSION:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# Load the bank for these specs from disk, synthesizing and saving it on a miss.
+# specs maps sound names to descriptions understood by sound_synth.render.
+def load_sound_bank(specs, cache_dir=DEFAULT_CACHE_DIR):
+    key = bank_key(specs)
+    path = bank_path(key, cache_dir)
+
+    bank = read_bank(path, key)
+    if bank is not None:
+        return bank
+
+    try:
+        write_bank(path, key, specs)
+        prune_banks(path, cache_dir)
+    except OSError as e:
+        # Read-only or missing cache directory: synthesize in memory instead
+        print(f"Could not write sound cache: {e}")
+        return {name: to_stereo(render(spec)) for name, spec in specs.items()}
+
+    bank = read_bank(path, key)
+    if bank is None:
+        return {name: to_stereo(render(spec)) for name, spec in specs.items()}
+    return bank
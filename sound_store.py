@@ -0,0 +1,79 @@
+from collections import OrderedDict
+
+from sound_synth import render, to_stereo
+
+# Default cap on the bytes held by materialized word sounds
+DEFAULT_BUDGET_BYTES = 4 * 1024 * 1024
+
+
+# Stable name for a sound description, shared by every word that uses it
+def spec_key(spec):
+    return ":".join(str(part) for part in spec)
+
+
+# Word sounds that are built on first use and share one buffer per unique tone.
+# Materialized Sound objects are kept in an LRU bounded by budget_bytes.
+class WordSoundStore:
+    def __init__(self, word_specs, make_sound, bank=None, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.make_sound = make_sound
+        self.bank = bank if bank is not None else {}
+        self.budget_bytes = budget_bytes
+        self.word_keys = {}
+        self.specs = {}
+        for word, spec in word_specs.items():
+            key = spec_key(spec)
+            self.word_keys[word] = key
+            self.specs[key] = spec
+        self.sounds = OrderedDict()
+        self.sizes = {}
+        self.used_bytes = 0
+
+    def __contains__(self, word):
+        return word in self.word_keys
+
+    def __len__(self):
+        return len(self.word_keys)
+
+    # Unique specs that every word maps to; these are what the bank stores
+    def unique_specs(self):
+        return dict(self.specs)
+
+    def buffer(self, key):
+        stereo = self.bank.get(key)
+        if stereo is None:
+            stereo = to_stereo(render(self.specs[key]))
+            self.bank[key] = stereo
+        return stereo
+
+    def get(self, word):
+        key = self.word_keys.get(word)
+        if key is None:
+            return None
+
+        sound = self.sounds.get(key)
+        if sound is not None:
+            self.sounds.move_to_end(key)
+            return sound
+
+        stereo = self.buffer(key)
+        sound = self.make_sound(stereo)
+        size = stereo.shape[0] * stereo.shape[1] * stereo.itemsize
+        self.sounds[key] = sound
+        self.sizes[key] = size
+        self.used_bytes += size
+        self.evict()
+        return sound
+
+    # Drop least recently used sounds until we are back under budget,
+    # always keeping the one that was just requested
+    def evict(self):
+        while self.used_bytes > self.budget_bytes and len(self.sounds) > 1:
+            key, _ = self.sounds.popitem(last=False)
+            self.used_bytes -= self.sizes.pop(key)
+
+    def play(self, word):
+        sound = self.get(word)
+        if sound is None:
+            return False
+        sound.play()
+        return True
@@ -0,0 +1,49 @@
+import math
+import numpy as np
+
+# Synthesis parameters shared by every generated sound
+SAMPLE_RATE = 44100
+AMPLITUDE = 32767
+
+
+# Sample positions 0..samples-1 as floats, the "i" of the old per-sample loops
+def sample_index(samples):
+    return np.arange(samples, dtype=np.float64)
+
+
+# Sine wave for a constant frequency
+def tone(freq, samples, sample_rate=SAMPLE_RATE):
+    i = sample_index(samples)
+    # Same operation order as the scalar code so the result is bit-identical
+    return np.sin(2.0 * math.pi * freq * i / sample_rate)
+
+
+# Sine wave whose frequency slides linearly from start_freq towards end_freq
+def chirp(start_freq, end_freq, samples, sample_rate=SAMPLE_RATE):
+    i = sample_index(samples)
+    if end_freq >= start_freq:
+        freq = start_freq + (i / samples) * (end_freq - start_freq)
+    else:
+        freq = start_freq - (i / samples) * (start_freq - end_freq)
+    return np.sin(2.0 * math.pi * freq * i / sample_rate)
+
+
+# Scale a [-1, 1] wave to 16-bit PCM, truncating towards zero like int()
+def to_pcm(wave, amplitude=AMPLITUDE):
+    return (amplitude * wave).astype(np.int16)
+
+
+# Stereo (samples, 2) view of a mono buffer; both channels share memory
+def to_stereo(mono):
+    return np.broadcast_to(mono[:, np.newaxis], (len(mono), 2))
+
+
+# Render a sound description such as ("chirp", 440, 880, samples) or
+# ("tone", 330, samples) to a mono PCM buffer
+def render(spec):
+    kind = spec[0]
+    if kind == "chirp":
+        return to_pcm(chirp(*spec[1:]))
+    if kind == "tone":
+        return to_pcm(tone(*spec[1:]))
+    raise ValueError(f"Unknown sound kind: {kind}")
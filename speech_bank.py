@@ -0,0 +1,286 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from sound_synth import to_stereo
+
+DEFAULT_SPEECH_BANK = os.environ.get(
+    "ENGLISH_GAME_SPEECH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "speech.bank"),
+)
+
+# File layout: MAGIC, then every entry's compressed blocks back to back, then
+# a JSON index and a footer pointing at it. The index maps each spoken text to
+# [offset, frames, block sizes...]; each block is BLOCK_FRAMES mono samples
+# (fewer in the last one), mu-law companded to 8 bits and zlib compressed, so
+# a player can decode one block at a time.
+MAGIC = b"EGSPEAK1"
+FOOTER = struct.Struct("<QI8s")
+BLOCK_FRAMES = 8192
+MU = 255.0
+
+# 8-bit code -> int16 sample
+MU_LAW_TABLE = (
+    np.sign(np.linspace(-1.0, 1.0, 256))
+    * ((1.0 + MU) ** np.abs(np.linspace(-1.0, 1.0, 256)) - 1.0) / MU * 32767
+).astype(np.int16)
+
+
+def mu_law_encode(wave):
+    wave = np.clip(wave, -1.0, 1.0)
+    companded = np.sign(wave) * np.log1p(MU * np.abs(wave)) / np.log1p(MU)
+    return np.rint((companded + 1.0) * 127.5).astype(np.uint8)
+
+
+def decode_block(data):
+    return MU_LAW_TABLE[np.frombuffer(zlib.decompress(data), dtype=np.uint8)]
+
+
+# Synthesize one text and compress it into blocks. Runs in the worker processes.
+def encode_text(text):
+    from speech_synth import synthesize
+
+    codes = mu_law_encode(synthesize(text))
+    blocks = [zlib.compress(codes[start:start + BLOCK_FRAMES].tobytes(), 6)
+              for start in range(0, len(codes), BLOCK_FRAMES)]
+    return text, len(codes), blocks
+
+
+def bank_header():
+    from speech_synth import SPEECH_RATE, SYNTH_VERSION
+
+    return {"version": SYNTH_VERSION, "sample_rate": SPEECH_RATE, "block_frames": BLOCK_FRAMES}
+
+
+# Read-only view of a bank file. Only the index is held in memory; blocks are
+# read and decoded as a player asks for them.
+class SpeechBank:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            if self.file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: not a speech bank")
+            self.file.seek(-FOOTER.size, os.SEEK_END)
+            index_offset, index_size, magic = FOOTER.unpack(self.file.read(FOOTER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path}: truncated speech bank")
+            self.file.seek(index_offset)
+            index = json.loads(self.file.read(index_size))
+        except (OSError, struct.error, ValueError):
+            self.file.close()
+            raise
+        self.header = {key: index[key] for key in ("version", "sample_rate", "block_frames")}
+        self.sample_rate = index["sample_rate"]
+        self.entries = index["entries"]
+
+    def __contains__(self, text):
+        return text in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def frames(self, text):
+        return self.entries[text][1]
+
+    # The compressed bytes of one entry, for copying into a rebuilt bank
+    def raw(self, text):
+        offset, _, *sizes = self.entries[text]
+        self.file.seek(offset)
+        return self.file.read(sum(sizes))
+
+    # Decoded int16 mono blocks of one entry, read one at a time
+    def blocks(self, text):
+        offset, _, *sizes = self.entries[text]
+        for size in sizes:
+            self.file.seek(offset)
+            data = self.file.read(size)
+            offset += size
+            yield decode_block(data)
+
+    def close(self):
+        self.file.close()
+
+
+# The bank at path, or None when there is none or it can't be read
+def open_speech_bank(path=DEFAULT_SPEECH_BANK):
+    if not os.path.exists(path):
+        return None
+    try:
+        return SpeechBank(path)
+    except (OSError, struct.error, ValueError) as e:
+        print(f"Could not open speech bank: {e}")
+        return None
+
+
+# Write a bank holding every text. Entries already in the bank at path (built
+# by the same synthesizer version) are copied over as they are; the rest are
+# synthesized across a pool of jobs processes and written as they finish.
+# Returns (reused, synthesized) counts.
+def build_speech_bank(texts, path=DEFAULT_SPEECH_BANK, jobs=None, progress=None):
+    texts = list(dict.fromkeys(text for text in texts if text))
+    header = bank_header()
+    old = open_speech_bank(path)
+    if old is not None and old.header != header:
+        old.close()
+        old = None
+
+    entries = {}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    todo = []
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            for text in texts:
+                if old is not None and text in old:
+                    _, frames, *sizes = old.entries[text]
+                    entries[text] = [f.tell(), frames] + sizes
+                    f.write(old.raw(text))
+                else:
+                    todo.append(text)
+            if old is not None:
+                old.close()
+
+            def write(results):
+                for done, (text, frames, blocks) in enumerate(results, 1):
+                    entries[text] = [f.tell(), frames] + [len(block) for block in blocks]
+                    f.writelines(blocks)
+                    if progress is not None:
+                        progress(done, len(todo))
+
+            jobs = jobs or os.cpu_count() or 1
+            if jobs > 1 and len(todo) > 1:
+                with ProcessPoolExecutor(jobs) as pool:
+                    write(pool.map(encode_text, todo, chunksize=max(1, min(16, len(todo) // (jobs * 4)))))
+            else:
+                write(map(encode_text, todo))
+
+            index = json.dumps(dict(header, entries=entries), separators=(",", ":")).encode("utf-8")
+            index_offset = f.tell()
+            f.write(index)
+            f.write(FOOTER.pack(index_offset, len(index), MAGIC))
+        os.replace(tmp_path, path)
+    finally:
+        if old is not None:
+            old.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return len(texts) - len(todo), len(todo)
+
+
+# Plays bank entries on one mixer channel, decoding a block at a time: the
+# first block starts playing at once and update() (called every frame) keeps
+# the next one queued behind it. make_sound turns a (samples, 2) int16 buffer
+# at the mixer's rate into a Sound.
+class SpeechPlayer:
+    def __init__(self, bank, make_sound, channel, mixer_rate):
+        self.bank = bank
+        self.make_sound = make_sound
+        self.channel = channel
+        self.mixer_rate = mixer_rate
+        self.stream = None
+        # Short silence between the texts of one play() call
+        self.gap = np.zeros(bank.sample_rate // 4, dtype=np.int16)
+
+    def __contains__(self, text):
+        return text in self.bank
+
+    def sound(self, block):
+        rate = self.bank.sample_rate
+        if self.mixer_rate % rate == 0:
+            block = np.repeat(block, self.mixer_rate // rate)
+        elif self.mixer_rate != rate:
+            positions = np.arange(len(block) * self.mixer_rate // rate) * (rate / self.mixer_rate)
+            block = np.interp(positions, np.arange(len(block)), block).astype(np.int16)
+        return self.make_sound(to_stereo(block))
+
+    def chain(self, texts):
+        for i, text in enumerate(texts):
+            if i:
+                yield self.gap
+            yield from self.bank.blocks(text)
+
+    # Say texts one after another, cutting off whatever was playing
+    def play(self, *texts):
+        self.channel.stop()
+        self.stream = self.chain([text for text in texts if text in self.bank])
+        block = next(self.stream, None)
+        if block is None:
+            self.stream = None
+            return False
+        self.channel.play(self.sound(block))
+        self.update()
+        return True
+
+    def update(self):
+        if self.stream is None or self.channel.get_queue() is not None:
+            return
+        block = next(self.stream, None)
+        if block is None:
+            self.stream = None
+        elif self.channel.get_busy():
+            self.channel.queue(self.sound(block))
+        else:
+            # Fell behind (a long frame): start again from this block
+            self.channel.play(self.sound(block))
+
+    def busy(self):
+        return self.stream is not None
+
+    def stop(self):
+        self.channel.stop()
+        self.stream = None
+
+    def close(self):
+        self.stop()
+        self.bank.close()
+
+
+# Every word and definition in a vocabulary, in category order
+def vocabulary_texts(vocabulary, definitions=True):
+    for category in vocabulary.categories():
+        for word in vocabulary.words(category):
+            yield word
+            if definitions:
+                definition = vocabulary.definition(category, word)
+                if definition:
+                    yield definition
+
+
+def main(argv):
+    from vocabulary import load_vocabulary
+
+    parser = argparse.ArgumentParser(description="Build the spoken word and definition bank")
+    parser.add_argument("--vocab", default=os.environ.get("ENGLISH_GAME_VOCAB"), help="a .vocab file to speak")
+    parser.add_argument("--out", default=DEFAULT_SPEECH_BANK, help="bank to write (reused for unchanged texts)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--words-only", action="store_true", help="skip definitions")
+    args = parser.parse_args(argv)
+
+    texts = list(vocabulary_texts(load_vocabulary(args.vocab), not args.words_only))
+    started = time.perf_counter()
+    step = max(1, len(texts) // 20)
+
+    def progress(done, total):
+        if done % step == 0 or done == total:
+            print(f"  synthesized {done}/{total}", flush=True)
+
+    reused, synthesized = build_speech_bank(texts, args.out, args.jobs, progress)
+    elapsed = time.perf_counter() - started
+    size = os.path.getsize(args.out)
+    print(f"Wrote {args.out}: {reused + synthesized} entries ({reused} reused, {synthesized} synthesized) "
+          f"in {elapsed:.1f}s, {size / 1e6:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
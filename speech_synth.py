@@ -0,0 +1,297 @@
+import math
+import re
+import zlib
+
+import numpy as np
+
+# A small rule-based formant synthesizer: spelling -> phonemes -> per-sample
+# formant tracks -> a glottal pulse train through three cascaded resonators,
+# plus band-limited noise for fricatives and bursts. Much too slow to run
+# while the game starts (see speech_bank.py, which builds everything ahead
+# of time), but fully offline and deterministic.
+
+# Bump when the output for a given text changes; banks built by an older
+# version are rebuilt from scratch
+SYNTH_VERSION = 1
+SPEECH_RATE = 22050
+
+# Formant bandwidths in Hz
+BANDWIDTHS = (60.0, 90.0, 150.0)
+
+# name: (kind, (F1, F2, F3), duration ms, [glide target formants])
+# Kinds: vowel, glide (voiced, no noise), nasal, fricative, plosive, affricate, aspirate
+PHONEMES = {
+    "AA": ("vowel", (730, 1090, 2440), 150),
+    "AE": ("vowel", (660, 1720, 2410), 140),
+    "AH": ("vowel", (520, 1190, 2390), 100),
+    "AO": ("vowel", (570, 840, 2410), 150),
+    "AX": ("vowel", (500, 1500, 2500), 60),
+    "EH": ("vowel", (530, 1840, 2480), 110),
+    "ER": ("vowel", (490, 1350, 1690), 140),
+    "IH": ("vowel", (390, 1990, 2550), 90),
+    "IY": ("vowel", (270, 2290, 3010), 140),
+    "UH": ("vowel", (440, 1020, 2240), 100),
+    "UW": ("vowel", (300, 870, 2240), 140),
+    "EY": ("vowel", (530, 1840, 2480), 190, (270, 2290, 3010)),
+    "AY": ("vowel", (730, 1090, 2440), 210, (270, 2290, 3010)),
+    "OW": ("vowel", (570, 840, 2410), 190, (300, 870, 2240)),
+    "AW": ("vowel", (730, 1090, 2440), 210, (300, 870, 2240)),
+    "OY": ("vowel", (570, 840, 2410), 210, (270, 2290, 3010)),
+    "L": ("glide", (360, 1300, 2700), 70),
+    "R": ("glide", (420, 1300, 1600), 70),
+    "W": ("glide", (300, 610, 2200), 60),
+    "Y": ("glide", (260, 2070, 3020), 60),
+    "M": ("nasal", (280, 1000, 2200), 70),
+    "N": ("nasal", (280, 1700, 2600), 70),
+    "NG": ("nasal", (280, 2300, 2750), 80),
+    "F": ("fricative", (340, 1100, 2080), 100),
+    "V": ("fricative", (220, 1100, 2080), 70),
+    "TH": ("fricative", (320, 1290, 2540), 100),
+    "DH": ("fricative", (270, 1290, 2540), 50),
+    "S": ("fricative", (320, 1390, 2530), 110),
+    "Z": ("fricative", (240, 1390, 2530), 80),
+    "SH": ("fricative", (300, 1840, 2750), 110),
+    "ZH": ("fricative", (300, 1840, 2750), 80),
+    "HH": ("aspirate", (500, 1500, 2500), 60),
+    "P": ("plosive", (400, 1100, 2150), 90),
+    "B": ("plosive", (200, 1100, 2150), 70),
+    "T": ("plosive", (400, 1600, 2600), 90),
+    "D": ("plosive", (200, 1600, 2600), 70),
+    "K": ("plosive", (300, 1990, 2850), 90),
+    "G": ("plosive", (200, 1990, 2850), 70),
+    "CH": ("affricate", (350, 1800, 2820), 120),
+    "JH": ("affricate", (260, 1800, 2820), 100),
+}
+VOICED = {"V", "DH", "Z", "ZH", "B", "D", "G", "JH"}
+# Noise band (centre Hz, width Hz, level) for fricatives, bursts and affricates
+NOISE = {
+    "F": (5000, 4000, 0.15), "V": (5000, 4000, 0.08),
+    "TH": (4500, 4000, 0.12), "DH": (4500, 4000, 0.06),
+    "S": (6000, 2500, 0.5), "Z": (6000, 2500, 0.3),
+    "SH": (3000, 2000, 0.5), "ZH": (3000, 2000, 0.3),
+    "P": (1000, 1500, 0.4), "B": (1000, 1500, 0.3),
+    "T": (4000, 3000, 0.5), "D": (4000, 3000, 0.35),
+    "K": (2000, 1500, 0.5), "G": (2000, 1500, 0.35),
+    "CH": (3000, 2000, 0.5), "JH": (3000, 2000, 0.35),
+    "HH": (1500, 2500, 0.2),
+}
+VOICE_LEVEL = {"vowel": 1.0, "glide": 0.75, "nasal": 0.5}
+
+# Pauses in ms for the gaps between words and at punctuation
+WORD_GAP = 30
+PAUSES = {",": 150, ";": 200, ":": 200, ".": 280, "!": 280, "?": 280}
+
+# Spelling rules, tried longest first at each position of a word
+RULES = {
+    "tion": "SH AX N", "sion": "ZH AX N", "ough": "AO", "augh": "AO", "eigh": "EY",
+    "igh": "AY", "tch": "CH", "dge": "JH", "sch": "S K", "air": "EH R", "ear": "IY R",
+    "ph": "F", "sh": "SH", "ch": "CH", "th": "TH", "wh": "W", "ck": "K", "ng": "NG",
+    "qu": "K W", "gh": "", "ee": "IY", "ea": "IY", "oo": "UW", "ou": "AW", "ow": "OW",
+    "oa": "OW", "ai": "EY", "ay": "EY", "oi": "OY", "oy": "OY", "au": "AO", "aw": "AO",
+    "ew": "UW", "ue": "UW", "er": "ER", "ir": "ER", "ur": "ER", "ar": "AA R", "or": "AO R",
+    "a": "AE", "b": "B", "c": "K", "d": "D", "e": "EH", "f": "F", "g": "G", "h": "HH",
+    "i": "IH", "j": "JH", "k": "K", "l": "L", "m": "M", "n": "N", "o": "AA", "p": "P",
+    "q": "K", "r": "R", "s": "S", "t": "T", "u": "AH", "v": "V", "w": "W", "x": "K S",
+    "y": "IH", "z": "Z",
+}
+RULE_LENGTHS = sorted({len(rule) for rule in RULES}, reverse=True)
+# Vowel letters made long by a silent final e ("cake", "kite", "home", "cute")
+LONG_VOWELS = {"a": "EY", "e": "IY", "i": "AY", "o": "OW", "u": "UW"}
+# Whole words the rules get wrong and that turn up in simple definitions
+EXCEPTIONS = {
+    "a": "AX", "the": "DH AX", "of": "AH V", "to": "T UW", "is": "IH Z", "as": "AE Z",
+    "was": "W AH Z", "has": "HH AE Z", "his": "HH IH Z", "are": "AA R", "you": "Y UW",
+    "one": "W AH N", "two": "T UW", "do": "D UW", "does": "D AH Z", "what": "W AH T",
+    "be": "B IY", "he": "HH IY", "she": "SH IY", "we": "W IY", "me": "M IY",
+    "some": "S AH M", "come": "K AH M", "have": "HH AE V", "give": "G IH V",
+    "live": "L IH V", "many": "M EH N IY", "any": "EH N IY", "very": "V EH R IY",
+    "said": "S EH D", "or": "AO R", "for": "F AO R", "from": "F R AH M",
+    "eye": "AY", "by": "B AY", "my": "M AY", "fly": "F L AY", "sky": "S K AY",
+    "heart": "HH AA R T", "orange": "AO R IH N JH", "purple": "P ER P AX L",
+    "shape": "SH EY P", "water": "W AO T ER", "animal": "AE N IH M AX L",
+}
+TOKEN = re.compile(r"[a-z']+|[,;:.!?]")
+VOWEL_LETTERS = set("aeiouy")
+
+
+# Phoneme names for one lowercase word
+def word_phonemes(word):
+    word = word.replace("'", "")
+    if word in EXCEPTIONS:
+        return EXCEPTIONS[word].split()
+    if not word:
+        return []
+
+    # Silent final e: drop it and lengthen the vowel before the last consonant
+    long_at = None
+    if len(word) > 2 and word.endswith("e") and word[-2] not in VOWEL_LETTERS and word[-3] in LONG_VOWELS:
+        long_at = len(word) - 3
+        word = word[:-1]
+
+    phonemes = []
+    i = 0
+    while i < len(word):
+        if i == long_at:
+            phonemes.append(LONG_VOWELS[word[i]])
+            i += 1
+            continue
+        for length in RULE_LENGTHS:
+            part = word[i:i + length]
+            if len(part) == length and part in RULES:
+                break
+        rest = word[i + length:]
+        if part == "c" and rest[:1] in ("e", "i", "y"):
+            sounds = "S"
+        elif part == "g" and rest[:1] in ("e", "i", "y") and i > 0:
+            sounds = "JH"
+        elif part == "y" and i == 0:
+            sounds = "Y"
+        elif part == "y" and not rest:
+            sounds = "IY"
+        elif part == "s" and not rest and phonemes and phonemes[-1] not in ("P", "T", "K", "F", "TH"):
+            sounds = "Z"
+        elif part == "e" and not rest and len(word) > 2:
+            sounds = ""
+        elif length == 1 and rest[:1] == part and part not in VOWEL_LETTERS:
+            # Double consonants are one sound
+            sounds = ""
+        else:
+            sounds = RULES[part]
+        phonemes.extend(sounds.split())
+        i += length
+    return phonemes
+
+
+# (phoneme or None for a pause, duration ms) for a whole text
+def text_phonemes(text):
+    sequence = []
+    for token in TOKEN.findall(text.lower()):
+        if token in PAUSES:
+            sequence.append((None, PAUSES[token]))
+            continue
+        if sequence and sequence[-1][0] is not None:
+            sequence.append((None, WORD_GAP))
+        sequence.extend((name, PHONEMES[name][2]) for name in word_phonemes(token))
+    # A final word is drawn out a little, as when it is said on its own
+    for i in range(len(sequence) - 1, -1, -1):
+        name = sequence[i][0]
+        if name is not None and PHONEMES[name][0] == "vowel":
+            sequence[i] = (name, int(sequence[i][1] * 1.4))
+            break
+    return sequence
+
+
+# Second-order resonator coefficients (Klatt) for frequency and bandwidth arrays
+def resonator(freq, bandwidth, rate):
+    c = np.full(len(freq), -math.exp(-2.0 * math.pi * bandwidth / rate))
+    b = 2.0 * np.exp(-math.pi * bandwidth / rate) * np.cos(2.0 * math.pi * freq / rate)
+    return 1.0 - b - c, b, c
+
+
+# Run a glottal source through three cascaded time-varying resonators
+def cascade(source, formants, rate):
+    coefficients = []
+    for k in range(3):
+        a, b, c = resonator(formants[k], BANDWIDTHS[k], rate)
+        coefficients.extend((a.tolist(), b.tolist(), c.tolist()))
+    a1, b1, c1, a2, b2, c2, a3, b3, c3 = coefficients
+    x = source.tolist()
+    out = [0.0] * len(x)
+    p1 = q1 = p2 = q2 = p3 = q3 = 0.0
+    for n in range(len(x)):
+        y1 = a1[n] * x[n] + b1[n] * p1 + c1[n] * q1
+        q1, p1 = p1, y1
+        y2 = a2[n] * y1 + b2[n] * p2 + c2[n] * q2
+        q2, p2 = p2, y2
+        y3 = a3[n] * y2 + b3[n] * p3 + c3[n] * q3
+        q3, p3 = p3, y3
+        out[n] = y3
+    return np.array(out)
+
+
+# White noise band-passed around centre (Hz) in the frequency domain
+def noise_band(rng, samples, centre, width, rate):
+    spectrum = np.fft.rfft(rng.standard_normal(samples))
+    freqs = np.fft.rfftfreq(samples, 1.0 / rate)
+    spectrum *= np.exp(-0.5 * ((freqs - centre) / (width / 2.0)) ** 2)
+    band = np.fft.irfft(spectrum, samples)
+    rms = np.sqrt(np.mean(band ** 2)) or 1.0
+    return band / rms
+
+
+# Render text to a float wave in [-1, 1] at SPEECH_RATE. Output depends only
+# on the text (the noise is seeded from it), so rebuilds are reproducible.
+def synthesize(text, rate=SPEECH_RATE):
+    sequence = text_phonemes(text)
+    if not sequence:
+        return np.zeros(0)
+    ms = rate / 1000.0
+    bounds = np.cumsum([0] + [int(duration * ms) for _, duration in sequence])
+    samples = int(bounds[-1]) + int(0.05 * rate)
+    rng = np.random.default_rng(zlib.crc32(text.encode("utf-8")))
+
+    # Formant targets at phoneme midpoints; pauses hold the neighbouring values
+    points = []
+    targets = []
+    voice = np.zeros(samples)
+    noise = np.zeros(samples)
+    for i, (name, _) in enumerate(sequence):
+        start, end = int(bounds[i]), int(bounds[i + 1])
+        if name is None:
+            continue
+        entry = PHONEMES[name]
+        kind, formants = entry[0], entry[1]
+        if len(entry) > 3:
+            # Diphthong: glide from the first target to the second
+            points.extend((start + (end - start) * 0.25, start + (end - start) * 0.85))
+            targets.extend((formants, entry[3]))
+        else:
+            points.append((start + end) / 2.0)
+            targets.append(formants)
+
+        ramp = min(int(15 * ms), (end - start) // 2)
+        level = np.ones(end - start)
+        if ramp:
+            level[:ramp] = np.linspace(0.0, 1.0, ramp)
+            level[-ramp:] = np.linspace(1.0, 0.0, ramp)
+        if kind in VOICE_LEVEL:
+            voice[start:end] = np.maximum(voice[start:end], VOICE_LEVEL[kind] * level)
+        elif name in VOICED:
+            voice[start:end] = np.maximum(voice[start:end], 0.25 * level)
+
+        if name in NOISE:
+            centre, width, gain = NOISE[name]
+            if kind == "plosive":
+                # Closure, then a short burst (and aspiration when voiceless)
+                burst_start = start + int((end - start) * 0.6)
+                burst = np.exp(-np.arange(end - burst_start) / (8 * ms))
+                if name not in VOICED:
+                    burst = np.maximum(burst, 0.4 * (np.arange(end - burst_start) < 30 * ms))
+                voice[start:burst_start] *= 0.3 if name in VOICED else 0.0
+                noise[burst_start:end] += gain * burst * noise_band(rng, end - burst_start, centre, width, rate)
+            elif kind == "affricate":
+                release = start + int((end - start) * 0.35)
+                voice[start:release] *= 0.3 if name in VOICED else 0.0
+                hiss = level[release - start:] * noise_band(rng, end - release, centre, width, rate)
+                noise[release:end] += gain * hiss
+            else:
+                noise[start:end] += gain * level * noise_band(rng, end - start, centre, width, rate)
+
+    if not points:
+        return np.zeros(0)
+    positions = np.arange(samples)
+    formants = [np.interp(positions, points, [target[k] for target in targets]) for k in range(3)]
+
+    # Glottal pulses: pitch falls from 135 to 95 Hz over the utterance
+    f0 = np.linspace(135.0, 95.0, samples)
+    phase = np.cumsum(f0 / rate) % 1.0
+    open_phase = 0.6
+    pulse = np.where(phase < open_phase, 0.5 * (1.0 - np.cos(2.0 * math.pi * phase / open_phase)), 0.0)
+    # Differentiate for lip radiation
+    source = np.diff(pulse, prepend=0.0) * voice * 20.0
+
+    wave = cascade(source, formants, rate) + noise * 0.25
+    peak = np.max(np.abs(wave))
+    if peak > 0:
+        wave *= 0.9 / peak
+    return wave
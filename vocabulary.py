@@ -0,0 +1,305 @@
+import csv
+import hashlib
+import io
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+import numpy as np
+
+# The game's built-in categories and words with definitions
+BUILTIN_CATEGORIES = {
+    "Animals": {
+        "words": ["cat", "dog", "lion", "fish", "bird", "elephant", "monkey"],
+        "definitions": {
+            "cat": "A small domesticated carnivorous mammal with soft fur.",
+            "dog": "A domesticated carnivorous mammal that typically has a long snout.",
+            "lion": "A large, powerful cat that lives in parts of Africa and India.",
+            "fish": "A limbless cold-blooded vertebrate animal with gills and fins.",
+            "bird": "A warm-blooded egg-laying vertebrate with feathers and wings.",
+            "elephant": "A very large plant-eating mammal with a prehensile trunk.",
+            "monkey": "A primate, often with a long tail, typically living in trees."
+        }
+    },
+    "Fruits": {
+        "words": ["apple", "banana", "orange", "grape", "mango", "strawberry"],
+        "definitions": {
+            "apple": "A round fruit with red, green, or yellow skin and crisp flesh.",
+            "banana": "A long curved fruit with a yellow skin and soft sweet flesh.",
+            "orange": "A round juicy citrus fruit with a tough bright reddish-yellow rind.",
+            "grape": "A small round fruit that grows in clusters on a vine.",
+            "mango": "A tropical fruit with smooth yellow or red skin and sweet yellow flesh.",
+            "strawberry": "A sweet soft red fruit with a seed-studded surface."
+        }
+    },
+    "Colors": {
+        "words": ["red", "blue", "green", "yellow", "purple", "pink"],
+        "definitions": {
+            "red": "The color of blood, rubies, or strawberries.",
+            "blue": "The color of the sky or the sea on a sunny day.",
+            "green": "The color of grass, leaves, or emeralds.",
+            "yellow": "The color of lemons, butter, or ripe corn.",
+            "purple": "A color intermediate between red and blue.",
+            "pink": "A pale red color, named after the flower of the same name."
+        }
+    },
+    "Shapes": {
+        "words": ["circle", "square", "triangle", "star", "heart", "rectangle"],
+        "definitions": {
+            "circle": "A round plane figure whose boundary consists of points equidistant from the center.",
+            "square": "A plane figure with four equal straight sides and four right angles.",
+            "triangle": "A plane figure with three straight sides and three angles.",
+            "star": "A shape that represents a star, typically having five or more points.",
+            "heart": "A shape representing the human heart, often symbolizing love.",
+            "rectangle": "A plane figure with four straight sides and four right angles."
+        }
+    }
+}
+
+
+# File layout: fixed header, then 8-byte aligned sections
+#   category ranges      uint32 (categories, 2)  [first word id, end word id)
+#   category names       uint32 offsets (categories + 1) + UTF-8 blob
+#   word strings         uint32 string id per word
+#   string table         uint32 offsets (strings + 1) + UTF-8 blob, each word stored once
+#   definitions          uint64 start + uint32 length per word + UTF-8 blob
+MAGIC = b"EGVOCAB1"
+VERSION = 1
+HEADER = struct.Struct("<8sIIII11Q")
+SECTIONS = ("ranges", "name_offsets", "name_blob", "word_strings", "string_offsets",
+            "string_blob", "def_starts", "def_lengths", "def_blob", "end", "reserved")
+
+
+def _align(f):
+    pad = -f.tell() % 8
+    if pad:
+        f.write(b"\0" * pad)
+    return f.tell()
+
+
+# Stream (category, word, definition) entries from word packs.
+# .csv: category,word,definition rows (a header row is skipped if present)
+# .jsonl: one {"category", "word", "definition"} object per line
+# .json: the game's {category: {"words": [...], "definitions": {...}}} layout
+def read_pack(path):
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.reader(f):
+                if len(row) < 2 or row[:2] == ["category", "word"]:
+                    continue
+                yield row[0], row[1], row[2] if len(row) > 2 else ""
+    elif path.endswith(".jsonl"):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry["category"], entry["word"], entry.get("definition", "")
+    else:
+        with open(path, encoding="utf-8") as f:
+            yield from iter_categories(json.load(f))
+
+
+def iter_categories(categories):
+    for category, data in categories.items():
+        definitions = data.get("definitions", {})
+        for word in data["words"]:
+            yield category, word, definitions.get(word, "")
+
+
+# Build a vocabulary file from an iterable of entries. Definitions are spooled
+# to disk as they arrive; only the word index is held in memory.
+def build_vocabulary(entries, path):
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with tempfile.TemporaryFile(dir=directory) as definitions, open(tmp_path, "wb") as f:
+            write_vocabulary(entries, f, definitions)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# Write a vocabulary to the empty binary file f, collecting definitions in
+# the scratch file definitions until the index is known
+def write_vocabulary(entries, f, definitions):
+    category_index = {}
+    category_words = []
+    seen = []
+    string_ids = {}
+
+    for category, word, definition in entries:
+        index = category_index.get(category)
+        if index is None:
+            index = category_index[category] = len(category_words)
+            category_words.append([])
+            seen.append(set())
+        if word in seen[index]:
+            continue
+        seen[index].add(word)
+        string_id = string_ids.setdefault(word, len(string_ids))
+        data = definition.encode("utf-8")
+        category_words[index].append((string_id, definitions.tell(), len(data)))
+        definitions.write(data)
+
+    words = [entry for group in category_words for entry in group]
+    ranges = np.zeros((len(category_words), 2), dtype=np.uint32)
+    start = 0
+    for i, group in enumerate(category_words):
+        ranges[i] = (start, start + len(group))
+        start += len(group)
+
+    names = [name.encode("utf-8") for name in category_index]
+    strings = [word.encode("utf-8") for word in string_ids]
+    offsets = {}
+
+    f.write(b"\0" * HEADER.size)
+    offsets["ranges"] = _align(f)
+    f.write(ranges.tobytes())
+    offsets["name_offsets"] = _align(f)
+    f.write(np.cumsum([0] + [len(n) for n in names], dtype=np.uint32).tobytes())
+    offsets["name_blob"] = _align(f)
+    f.write(b"".join(names))
+    offsets["word_strings"] = _align(f)
+    f.write(np.array([w[0] for w in words], dtype=np.uint32).tobytes())
+    offsets["string_offsets"] = _align(f)
+    f.write(np.cumsum([0] + [len(s) for s in strings], dtype=np.uint32).tobytes())
+    offsets["string_blob"] = _align(f)
+    f.write(b"".join(strings))
+    offsets["def_starts"] = _align(f)
+    f.write(np.array([w[1] for w in words], dtype=np.uint64).tobytes())
+    offsets["def_lengths"] = _align(f)
+    f.write(np.array([w[2] for w in words], dtype=np.uint32).tobytes())
+    offsets["def_blob"] = _align(f)
+    definitions.seek(0)
+    shutil.copyfileobj(definitions, f)
+    offsets["end"] = f.tell()
+    offsets["reserved"] = 0
+
+    f.seek(0)
+    f.write(HEADER.pack(MAGIC, VERSION, len(names), len(words), len(strings),
+                        *(offsets[name] for name in SECTIONS)))
+
+
+# Read-only view of a vocabulary file. Index arrays are views into the mapped
+# file; words are decoded per category when first asked for and definitions
+# are read straight from the mapping on demand.
+class Vocabulary:
+    def __init__(self, buffer):
+        self.buffer = buffer
+        magic, version, n_categories, n_words, n_strings, *offsets = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a vocabulary file")
+        sections = dict(zip(SECTIONS, offsets))
+        self.sections = sections
+        self.word_count = n_words
+
+        def array(name, dtype, count):
+            return np.frombuffer(buffer, dtype=dtype, count=count, offset=sections[name])
+
+        self.ranges = array("ranges", np.uint32, n_categories * 2).reshape(n_categories, 2)
+        self.word_strings = array("word_strings", np.uint32, n_words)
+        self.string_offsets = array("string_offsets", np.uint32, n_strings + 1)
+        self.def_starts = array("def_starts", np.uint64, n_words)
+        self.def_lengths = array("def_lengths", np.uint32, n_words)
+
+        name_offsets = array("name_offsets", np.uint32, n_categories + 1).tolist()
+        base = sections["name_blob"]
+        self.names = [bytes(buffer[base + a:base + b]).decode("utf-8")
+                      for a, b in zip(name_offsets, name_offsets[1:])]
+        self.category_index = {name: i for i, name in enumerate(self.names)}
+        self.word_lists = {}
+        self.word_ids = {}
+
+    @classmethod
+    def open(cls, path):
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    # In-memory vocabulary from the game's nested categories dict, laid out
+    # in a byte buffer exactly as build_vocabulary would write it
+    @classmethod
+    def from_dict(cls, categories):
+        f = io.BytesIO()
+        write_vocabulary(iter_categories(categories), f, io.BytesIO())
+        return cls(f.getbuffer())
+
+    def categories(self):
+        return list(self.names)
+
+    def __contains__(self, category):
+        return category in self.category_index
+
+    def __len__(self):
+        return self.word_count
+
+    # SHA-256 of the file's bytes: the same for the same words and definitions
+    def digest(self):
+        return hashlib.sha256(self.buffer).hexdigest()
+
+    def string(self, string_id):
+        start = self.sections["string_blob"]
+        a, b = int(self.string_offsets[string_id]), int(self.string_offsets[string_id + 1])
+        return bytes(self.buffer[start + a:start + b]).decode("utf-8")
+
+    def word_range(self, category):
+        first, end = self.ranges[self.category_index[category]]
+        return int(first), int(end)
+
+    # Words of a category in pack order; decoded and interned once per category
+    def words(self, category):
+        words = self.word_lists.get(category)
+        if words is None:
+            first, end = self.word_range(category)
+            words = [sys.intern(self.string(int(i))) for i in self.word_strings[first:end]]
+            self.word_lists[category] = words
+            self.word_ids[category] = {word: first + i for i, word in enumerate(words)}
+        return words
+
+    def word_id(self, category, word):
+        self.words(category)
+        return self.word_ids[category].get(word)
+
+    def definition_by_id(self, word_id):
+        start = self.sections["def_blob"] + int(self.def_starts[word_id])
+        return bytes(self.buffer[start:start + int(self.def_lengths[word_id])]).decode("utf-8")
+
+    # Definition text, or None when the word has none
+    def definition(self, category, word):
+        word_id = self.word_id(category, word)
+        if word_id is None:
+            return None
+        return self.definition_by_id(word_id) or None
+
+
+# The word list to play: a .vocab file, or the built-in categories
+def load_vocabulary(path=None):
+    if path:
+        return Vocabulary.open(path)
+    return Vocabulary.from_dict(BUILTIN_CATEGORIES)
+
+
+def main(argv):
+    if len(argv) >= 3 and argv[0] == "build":
+        out, packs = argv[1], argv[2:]
+        build_vocabulary((entry for pack in packs for entry in read_pack(pack)), out)
+        vocabulary = Vocabulary.open(out)
+        print(f"Wrote {out}: {len(vocabulary.categories())} categories, {len(vocabulary)} words")
+    elif len(argv) == 2 and argv[0] == "info":
+        vocabulary = Vocabulary.open(argv[1])
+        for category in vocabulary.categories():
+            first, end = vocabulary.word_range(category)
+            print(f"{category}: {end - first} words")
+    else:
+        print("usage: python vocabulary.py build OUT.vocab PACK [PACK ...]\n"
+              "       python vocabulary.py info FILE.vocab")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
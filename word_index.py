@@ -0,0 +1,181 @@
+import heapq
+
+from distractors import edit_distance
+
+
+# How many typing mistakes still count as knowing a word: none for short
+# words, where one change usually makes a different word. Swapped letters
+# are two edits, so longer words allow two.
+def tolerance(word):
+    if len(word) <= 3:
+        return 0
+    if len(word) <= 5:
+        return 1
+    return 2
+
+
+# Prefix trie whose nodes keep their first few completions, shortest first,
+# so a lookup costs one step per typed letter however many words share it.
+# fuzzy() walks it with one Levenshtein row per node, pruning branches that
+# are already too far from the typed prefix.
+class PrefixTrie:
+    def __init__(self, keys, limit=8):
+        self.limit = limit
+        # node: [children by letter, ids of the best completions]
+        self.root = [{}, []]
+        for i in sorted(range(len(keys)), key=lambda i: (len(keys[i]), keys[i])):
+            node = self.root
+            for letter in keys[i]:
+                node = node[0].setdefault(letter, [{}, []])
+                if len(node[1]) < limit:
+                    node[1].append(i)
+
+    def complete(self, prefix):
+        node = self.root
+        for letter in prefix:
+            node = node[0].get(letter)
+            if node is None:
+                return []
+        return node[1]
+
+    # Completion ids of the paths within max_distance edits of prefix, until
+    # limit are found. Like most spelling checkers it trusts the first
+    # letter, and only the band of each row within max_distance of the
+    # diagonal can stay under the limit, so only that band is computed.
+    def fuzzy(self, prefix, max_distance, limit):
+        found = []
+        start = self.root[0].get(prefix[:1])
+        if start is None:
+            return found
+        size = len(prefix)
+        far = max_distance + 1
+        first = [min(abs(j - 1), far) for j in range(size + 1)]
+        stack = [(child, letter, 2, first) for letter, child in reversed(start[0].items())]
+        while stack:
+            node, letter, depth, previous = stack.pop()
+            row = [far] * (size + 1)
+            low = max(0, depth - max_distance)
+            if low == 0:
+                row[0] = depth
+                low = 1
+            best = row[0]
+            for j in range(low, min(size, depth + max_distance) + 1):
+                cell = min(row[j - 1] + 1, previous[j] + 1, previous[j - 1] + (prefix[j - 1] != letter), far)
+                row[j] = cell
+                if cell < best:
+                    best = cell
+            if row[size] <= max_distance:
+                # The node's own completions are the best its subtree has
+                for i in node[1]:
+                    if i not in found:
+                        found.append(i)
+                        if len(found) == limit:
+                            return found
+            elif best <= max_distance:
+                stack.extend((child, letter, depth + 1, row) for letter, child in reversed(node[0].items()))
+        return found
+
+
+# Burkhard-Keller tree over edit distance: a search only descends into
+# children whose distance to their parent is within max_distance of the
+# query's, which skips most of the words for small distances
+class BKTree:
+    def __init__(self, keys):
+        self.keys = keys
+        # node: [key id, {distance: child}]
+        self.root = None
+        for i, key in enumerate(keys):
+            if self.root is None:
+                self.root = [i, {}]
+                continue
+            node = self.root
+            while True:
+                distance = edit_distance(key, keys[node[0]])
+                if distance == 0:
+                    break
+                child = node[1].get(distance)
+                if child is None:
+                    node[1][distance] = [i, {}]
+                    break
+                node = child
+
+    # (distance, key id) for every key within max_distance of text
+    def search(self, text, max_distance):
+        found = []
+        if self.root is None:
+            return found
+        stack = [self.root]
+        while stack:
+            i, children = stack.pop()
+            distance = edit_distance(text, self.keys[i])
+            if distance <= max_distance:
+                found.append((distance, i))
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+        return found
+
+
+# Spelling lookups for one category, built once: prefix completions for
+# suggestions while the learner types, fuzzy matches for typos, and the
+# check for whether a typed answer is close enough to count
+class WordIndex:
+    def __init__(self, words, suggestions=4):
+        self.words = list(words)
+        self.keys = [normalize(word) for word in self.words]
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.suggestions = suggestions
+        self.trie = PrefixTrie(self.keys, suggestions)
+        self.tree = BKTree(self.keys)
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, text):
+        return normalize(text) in self.positions
+
+    def complete(self, prefix, limit=None):
+        limit = self.suggestions if limit is None else limit
+        return [self.words[i] for i in self.trie.complete(normalize(prefix))[:limit]]
+
+    # Words within max_distance edits of text, closest first
+    def closest(self, text, max_distance, limit=None):
+        limit = self.suggestions if limit is None else limit
+        text = normalize(text)
+        found = self.tree.search(text, max_distance)
+        best = heapq.nsmallest(limit, found, key=lambda item: (item[0], abs(len(self.keys[item[1]]) - len(text)), item[1]))
+        return [self.words[i] for _, i in best]
+
+    # Suggestions for a partly typed word: its completions or, when it
+    # starts no word (a typo), completions of prefixes a typo or two away
+    def suggest(self, text, limit=None):
+        limit = self.suggestions if limit is None else limit
+        text = normalize(text)
+        if not text:
+            return []
+        found = self.trie.complete(text)
+        # One typo is the likely case; look further only when that finds nothing
+        distance = 1
+        while not found and distance <= tolerance(text):
+            found = self.trie.fuzzy(text, distance, limit)
+            distance += 1
+        return [self.words[i] for i in found[:limit]]
+
+    # Whether typed counts as answer, ignoring case and spacing: exact, or
+    # within the answer's typo tolerance without being (or being closer to)
+    # some other word. Returns the edit distance (0 when exact), or None.
+    def accepts(self, answer, typed):
+        answer, typed = normalize(answer), normalize(typed)
+        if typed == answer:
+            return 0
+        if typed in self.positions:
+            return None
+        distance = edit_distance(typed, answer)
+        if distance > tolerance(answer) or self.tree.search(typed, distance - 1):
+            return None
+        return distance
+
+
+def normalize(text):
+    return " ".join(text.lower().split())